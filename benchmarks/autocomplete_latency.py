@@ -0,0 +1,149 @@
+"""Measures p50/p99 latency of autocomplete prefix search: the in-memory index, Autocomplete.search and the view.
+
+Streets are inserted into the benchmark database (benchmarks.settings) in one transaction rolled
+back at the end (use --keep to commit). Autocomplete.search is measured with the lazy index build
+of the first search of every scope, with built indexes and with cached results, the view adds
+request handling and JSON encoding on top of it:
+
+    python benchmarks/autocomplete_latency.py --migrate --streets 1000000
+    BENCHMARK_DATABASE=postgresql python benchmarks/autocomplete_latency.py --migrate --localities 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import NoReverseMatch, reverse  # noqa: E402
+
+import swapper  # noqa: E402
+
+from django_address.autocomplete import Autocomplete, PrefixIndex, get_autocomplete  # noqa: E402
+from django_address.normalization import get_normalizer  # noqa: E402
+from django_address.service import Address as AddressService  # noqa: E402
+
+Locality = swapper.load_model("django_address", "Locality")
+Street = swapper.load_model("django_address", "Street")
+
+WORDS = ("shevchenka", "franka", "lesi ukrainky", "sadova", "soborna", "hrushevskoho", "kyivska", "lvivska")
+BATCH_SIZE = 5000
+
+
+def street_names(streets, rng):
+    return ["{word} {pk} street".format(word=rng.choice(WORDS).title(), pk=pk) for pk in range(streets)]
+
+
+def generate(names, localities):
+    """Inserts localities of one region and names spread over them as streets, returns locality pks."""
+    region = AddressService(country="Benchmark", region="Benchmark").get_or_create_region()
+    normalizer = get_normalizer()
+    Locality.objects.bulk_create(
+        [
+            Locality(name=name, normalized_name=normalizer(name), slug="benchmark-{0}".format(index), region=region)
+            for index, name in enumerate("Benchmark {0}".format(index) for index in range(localities))
+        ]
+    )
+    locality_pks = list(Locality.objects.filter(region=region).order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(names), BATCH_SIZE):
+        Street.objects.bulk_create(
+            [
+                Street(name=name, normalized_name=normalizer(name), locality_id=locality_pks[index % localities])
+                for index, name in enumerate(names[start : start + BATCH_SIZE], start)
+            ]
+        )
+    return locality_pks
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    print(
+        "{name:<34} p50 {p50:9.4f} ms  p99 {p99:9.4f} ms  max {max:9.4f} ms".format(
+            name=name,
+            p50=timings[len(timings) // 2],
+            p99=timings[max(int(len(timings) * 0.99) - 1, 0)],
+            max=timings[-1],
+        )
+    )
+
+
+def bench_index(names, prefixes):
+    started = time.monotonic()
+    index = PrefixIndex(("", pk, name) for pk, name in enumerate(names))
+    print("Built index of {0} streets in {1:.1f}s".format(len(index), time.monotonic() - started))
+    report("PrefixIndex.search", [timed(index.search, prefix) for prefix in prefixes])
+
+
+def bench_search(locality_pks, prefixes):
+    scopes = [{"locality": pk} for pk in locality_pks]
+    autocomplete = Autocomplete(max_scopes=len(scopes) + 1)
+    report("search, unscoped index build", [timed(autocomplete.search, "street", prefixes[0])])
+    report(
+        "search, scoped index build",
+        [timed(autocomplete.search, "street", prefixes[0], scope) for scope in scopes[: len(prefixes)]],
+    )
+    # no result cache, every search walks a built index
+    uncached = Autocomplete(max_scopes=len(scopes) + 1, cache_size=0)
+    uncached.search("street", prefixes[0])
+    report("search, built index", [timed(uncached.search, "street", prefix) for prefix in prefixes])
+    for prefix in prefixes:
+        autocomplete.search("street", prefix)
+    report("search, cached results", [timed(autocomplete.search, "street", prefix) for prefix in prefixes])
+
+
+def bench_view(prefixes):
+    try:
+        url = reverse("django_address:autocomplete", args=["street"])
+    except NoReverseMatch:
+        print("view: django_address.urls is not in ROOT_URLCONF, skipped")
+        return
+    client = Client()
+    get_autocomplete().clear()
+    report("view, first request (index build)", [timed(client.get, url, {"q": prefixes[0]})])
+    report("view", [timed(client.get, url, {"q": prefix}) for prefix in prefixes])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streets", type=int, default=1000000)
+    parser.add_argument("--localities", type=int, default=100, help="Localities the streets are spread over.")
+    parser.add_argument("--searches", type=int, default=10000)
+    parser.add_argument("--migrate", action="store_true", help="Migrate the database first.")
+    parser.add_argument("--keep", action="store_true", help="Commit generated streets instead of rolling them back.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = street_names(args.streets, rng)
+    prefixes = [rng.choice(WORDS)[: rng.randint(1, 6)] for _ in range(args.searches)]
+    bench_index(names, prefixes)
+
+    setup_test_environment()
+    if args.migrate:
+        call_command("migrate", verbosity=0)
+    with transaction.atomic():
+        started = time.monotonic()
+        locality_pks = generate(names, args.localities)
+        print("Inserted {0} streets in {1:.1f}s, {2}".format(len(names), time.monotonic() - started, connection.vendor))
+        bench_search(locality_pks, prefixes)
+        bench_view(prefixes)
+        transaction.set_rollback(not args.keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compares geohash pruned nearest/bbox queries with a brute-force scan over synthetic points.
+
+    BENCHMARK_DATABASE=postgresql python benchmarks/geo_latency.py --migrate --points 1000000
+
+Points are inserted into the benchmark database (benchmarks.settings) in one transaction rolled
+back at the end, use --keep to commit them and --skip-generate to measure them again.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import transaction  # noqa: E402
+
+import swapper  # noqa: E402
+
+from django_address.geo import haversine  # noqa: E402
+from django_address.service import Address as AddressService  # noqa: E402
+
+Address = swapper.load_model("django_address", "Address")
+
+BATCH_SIZE = 5000
+
+
+def generate(points, rng):
+    street = AddressService(country="Benchmark", region="Benchmark", locality="Benchmark", street="Benchmark")
+    street = street.get_or_create_street()
+    started = time.monotonic()
+    for start in range(0, points, BATCH_SIZE):
+        batch = []
+        for index in range(start, min(start + BATCH_SIZE, points)):
+            address = Address(
+                locality_id=street.locality_id,
+                street=street,
+                route=street.name,
+                street_number=str(index),
+                latitude=rng.uniform(44, 52),
+                longitude=rng.uniform(22, 40),
+            )
+            address.address_hash = address.build_address_hash()
+            address.geohash = address.build_geohash()
+            batch.append(address)
+        with transaction.atomic():
+            Address.objects.bulk_create(batch)
+    print("Generated {0} points in {1:.1f}s".format(points, time.monotonic() - started))
+
+
+def brute_force_nearest(latitude, longitude, k):
+    distances = sorted(
+        (haversine(latitude, longitude, lat, lon), pk)
+        for pk, lat, lon in Address.objects.exclude(geohash="").values_list("pk", "latitude", "longitude").iterator()
+    )
+    return distances[:k]
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    print(
+        "{name:<24} p50 {p50:10.3f} ms  max {max:10.3f} ms".format(
+            name=name, p50=statistics.median(timings), max=timings[-1]
+        )
+    )
+
+
+def run(args):
+    rng = random.Random(0)
+    if not args.skip_generate:
+        generate(args.points, rng)
+
+    queries = [(rng.uniform(45, 51), rng.uniform(23, 39)) for _ in range(args.repeat)]
+    nearest = [timed(Address.objects.nearest, lat, lon, 10) for lat, lon in queries]
+    report("nearest k=10", [timing for timing, _ in nearest])
+    bbox = [
+        timed(lambda lat, lon: list(Address.objects.within_bbox(lat, lon, lat + 0.05, lon + 0.05)), lat, lon)
+        for lat, lon in queries
+    ]
+    report("within_bbox 0.05 deg", [timing for timing, _ in bbox])
+
+    brute = [timed(brute_force_nearest, lat, lon, 10) for lat, lon in queries[: args.brute_force_repeat]]
+    report("brute-force nearest", [timing for timing, _ in brute])
+    for (_, fast), (_, slow) in zip(nearest, brute):
+        assert [address.pk for address in fast] == [pk for _, pk in slow], "nearest() differs from brute force"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--brute-force-repeat", type=int, default=3)
+    parser.add_argument("--skip-generate", action="store_true")
+    parser.add_argument("--migrate", action="store_true", help="Migrate the database first.")
+    parser.add_argument("--keep", action="store_true", help="Commit generated points instead of rolling them back.")
+    args = parser.parse_args()
+    if args.migrate:
+        call_command("migrate", verbosity=0)
+    with transaction.atomic():
+        run(args)
+        transaction.set_rollback(not args.keep)
+
+
+if __name__ == "__main__":
+    main()
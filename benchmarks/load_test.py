@@ -0,0 +1,169 @@
+"""Concurrency load test: workers create orders with overlapping new address dicts at the same time.
+
+Every run uses a fresh name prefix, so all workers race to create the same new countries,
+regions, localities and streets. Reports throughput, latency percentiles, IntegrityError,
+deadlock and lock timeout counts and duplicate hierarchy rows, and exits with status 1 when
+duplicates exist or errors exceed --max-errors, so it can be used as a regression gate:
+
+    python benchmarks/load_test.py --migrate --workers 8 --orders 200
+    BENCHMARK_DATABASE=postgresql python benchmarks/load_test.py --mode process --workers 16
+
+Rows of the run are deleted afterwards unless --keep is given.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from random import Random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import IntegrityError, OperationalError, connection, connections, transaction  # noqa: E402
+from django.db.models import Count  # noqa: E402
+
+import swapper  # noqa: E402
+
+from benchmarks.synthetic import HierarchySpec, generate_addresses  # noqa: E402
+
+# natural keys the service looks levels up by, more than one row per key is a duplicate
+NATURAL_KEYS = (
+    ("Country", "name", ("normalized_name", "code")),
+    ("Region", "name", ("country", "normalized_name", "code")),
+    ("Locality", "name", ("region", "district", "normalized_name", "postal_code")),
+    ("Street", "name", ("locality", "normalized_name")),
+    ("Address", "route", ("fingerprint",)),
+)
+
+
+def classify(error):
+    """Returns error category of an exception or of the database error it was raised from."""
+    while error is not None:
+        if isinstance(error, IntegrityError):
+            return "integrity"
+        if isinstance(error, OperationalError):
+            message = str(error).lower()
+            if "deadlock" in message or getattr(getattr(error, "__cause__", None), "pgcode", None) == "40P01":
+                return "deadlock"
+            if "locked" in message or "timeout" in message:
+                return "lock timeout"
+            return "operational"
+        error = error.__cause__ or error.__context__
+    return "other"
+
+
+def run_worker(worker, options):
+    """Creates options["orders"] orders picking address dicts from the shared pool, returns latencies and errors."""
+    order_model = apps.get_model("order", "Order")
+    pool = list(generate_addresses(HierarchySpec(**options["spec"]), prefix=options["prefix"]))
+    rng = Random(options["spec"]["seed"] + worker)
+    latencies = []
+    errors = Counter()
+    time.sleep(max(0.0, options["start_at"] - time.time()))
+    try:
+        for _ in range(options["orders"]):
+            value = dict(rng.choice(pool))
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    order_model.objects.create(price=1, delivery_address=value)
+            except Exception as error:
+                errors[classify(error)] += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+    finally:
+        connections.close_all()
+    return latencies, errors
+
+
+def duplicate_rows(prefix):
+    """Returns {model name: rows beyond the first one of every natural key} of the run."""
+    duplicates = {}
+    for model_name, name_field, key in NATURAL_KEYS:
+        model = swapper.load_model("django_address", model_name, required=True)
+        groups = (
+            model.objects.filter(**{"{0}__startswith".format(name_field): prefix})
+            .values(*key)
+            .annotate(rows=Count("pk"))
+            .filter(rows__gt=1)
+        )
+        duplicates[model_name] = sum(group["rows"] - 1 for group in groups)
+    return duplicates
+
+
+def cleanup(prefix):
+    """Deletes orders and hierarchy rows of the run, lowest level first (countries are protected)."""
+    order_model = apps.get_model("order", "Order")
+    with transaction.atomic():
+        order_model.objects.filter(delivery_address__route__startswith=prefix).delete()
+        for model_name, name_field, _ in reversed(NATURAL_KEYS):
+            model = swapper.load_model("django_address", model_name, required=True)
+            model.objects.filter(**{"{0}__startswith".format(name_field): prefix}).delete()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--orders", type=int, default=100, help="Orders created by every worker.")
+    parser.add_argument("--distinct", type=int, default=50, help="Distinct address dicts the workers pick from.")
+    parser.add_argument("--localities", type=int, default=3)
+    parser.add_argument("--streets", type=int, default=5, help="Streets per locality.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-errors", type=int, default=0, help="Errors tolerated before exiting with status 1.")
+    parser.add_argument("--migrate", action="store_true", help="Migrate the database first.")
+    parser.add_argument("--keep", action="store_true", help="Keep rows created by the run.")
+    args = parser.parse_args()
+
+    if args.migrate:
+        call_command("migrate", verbosity=0)
+    spec = HierarchySpec(1, 1, args.localities, args.streets, args.distinct, args.seed)
+    prefix = "load {0}-{1} ".format(os.getpid(), int(time.time()))
+    options = {"spec": vars(spec), "prefix": prefix, "orders": args.orders, "start_at": time.time() + 1}
+    # connections must not be shared with forked workers
+    connections.close_all()
+    executor_class = ThreadPoolExecutor if args.mode == "thread" else ProcessPoolExecutor
+    with executor_class(max_workers=args.workers) as executor:
+        results = list(executor.map(run_worker, range(args.workers), [options] * args.workers))
+    # workers start together at start_at
+    elapsed = time.time() - options["start_at"]
+
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    errors = sum((worker_errors for _, worker_errors in results), Counter())
+    duplicates = duplicate_rows(prefix)
+    print(
+        "{vendor}, {workers} {mode} workers, {orders} orders, {distinct} distinct addresses".format(
+            vendor=connection.vendor,
+            workers=args.workers,
+            mode=args.mode,
+            orders=args.workers * args.orders,
+            distinct=args.distinct,
+        )
+    )
+    print("{0:<20} {1:10.1f} orders/s".format("throughput", len(latencies) / elapsed if elapsed > 0 else 0.0))
+    for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print("{0:<20} {1:10.2f} ms".format("latency " + name, percentile(latencies, fraction) * 1000))
+    for category in ("integrity", "deadlock", "lock timeout", "operational", "other"):
+        print("{0:<20} {1:10d}".format(category + " errors", errors[category]))
+    for model_name, count in duplicates.items():
+        print("{0:<20} {1:10d}".format("duplicate " + model_name.lower(), count))
+    if not args.keep:
+        cleanup(prefix)
+    failed = sum(duplicates.values()) > 0 or sum(errors.values()) > args.max_errors
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Measures latency of the lookups the service and the admin run, on a synthetic hierarchy.
+
+Generates the data into the benchmark database (benchmarks.settings) and prints per access path
+latency percentiles. Everything runs in one transaction rolled back at the end, use --keep to
+commit the data and --skip-generate to measure it again. The sizes from the indexing work:
+
+    BENCHMARK_DATABASE=postgresql python benchmarks/lookup_latency.py --migrate \
+        --localities 1000000 --addresses 10000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+
+import swapper  # noqa: E402
+
+from django_address.normalization import address_fingerprint  # noqa: E402
+from django_address.service import Address as AddressService  # noqa: E402
+
+Country = swapper.load_model("django_address", "Country")
+Region = swapper.load_model("django_address", "Region")
+Locality = swapper.load_model("django_address", "Locality")
+Street = swapper.load_model("django_address", "Street")
+Address = swapper.load_model("django_address", "Address")
+
+COUNTRIES = 5
+REGIONS_PER_COUNTRY = 20
+STREETS_PER_LOCALITY = 4
+BATCH_SIZE = 5000
+
+
+def batches(objects, size=BATCH_SIZE):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_insert(model, objects):
+    count = 0
+    for batch in batches(objects):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def generate_regions():
+    """Returns regions of COUNTRIES countries, created unless they exist."""
+    for index in range(COUNTRIES):
+        Country.objects.get_or_create(name="Country {0}".format(index), defaults={"code": "C{0}".format(index)})
+    for country in Country.objects.order_by("pk")[:COUNTRIES]:
+        for index in range(REGIONS_PER_COUNTRY):
+            Region.objects.get_or_create(name="Region {0}".format(index), country=country)
+    return list(Region.objects.order_by("pk"))
+
+
+def locality_rows(localities, regions):
+    for index in range(localities):
+        name = "Locality {0}".format(index)
+        yield Locality(
+            name=name,
+            normalized_name=name.lower(),
+            slug="locality-{0}".format(index),
+            region=regions[index % len(regions)],
+        )
+
+
+def street_rows(locality_pks):
+    for locality_pk in locality_pks:
+        for index in range(STREETS_PER_LOCALITY):
+            name = "Street {0}".format(index)
+            yield Street(name=name, normalized_name=name.lower(), locality_id=locality_pk)
+
+
+def address_row(street_pk, locality_pk, name, number):
+    address = Address(
+        locality_id=locality_pk,
+        street_id=street_pk,
+        route=name,
+        street_number=number,
+        formatted_address="{0}, {1}, Locality {2}".format(name, number, locality_pk),
+    )
+    address.address_hash = address.build_address_hash()
+    address.fingerprint = address_fingerprint(locality_pk, street_pk, number, "")
+    return address
+
+
+def address_rows(addresses, streets, locality_count):
+    """Yields addresses numbered street by street, streets are iterated again until there are enough."""
+    count = 0
+    while count < addresses:
+        for street_pk, locality_pk, name in streets.iterator(chunk_size=BATCH_SIZE):
+            yield address_row(street_pk, locality_pk, name, str(count // locality_count + 1))
+            count += 1
+            if count == addresses:
+                return
+
+
+def generate(localities, addresses):
+    """Inserts the hierarchy with bulk_create, derived columns are computed here instead of save()."""
+    regions = generate_regions()
+    start = time.monotonic()
+    bulk_insert(Locality, locality_rows(localities, regions))
+    locality_pks = list(Locality.objects.order_by("pk").values_list("pk", flat=True))
+    bulk_insert(Street, street_rows(locality_pks))
+    streets = Street.objects.order_by("pk").values_list("pk", "locality_id", "name")
+    bulk_insert(Address, address_rows(addresses, streets, len(locality_pks)))
+    print("Generated in {0:.1f}s".format(time.monotonic() - start))
+
+
+def measure(name, queries, repeat):
+    timings = []
+    for query in queries[:repeat]:
+        started = time.perf_counter()
+        query()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(
+        "{name:<28} p50 {p50:8.3f} ms  p95 {p95:8.3f} ms  max {max:8.3f} ms".format(
+            name=name, p50=statistics.median(timings), p95=timings[int(len(timings) * 0.95) - 1], max=timings[-1],
+        )
+    )
+
+
+def run(repeat):
+    sample = list(
+        Address.objects.select_related("locality", "street", "locality__region__country").order_by("?")[:repeat]
+    )
+    if not sample:
+        print("No addresses, run without --skip-generate first.")
+        return
+    localities = Locality.objects.count()
+    print("{0} localities, {1} addresses, {2}".format(localities, Address.objects.count(), connection.vendor))
+    measure(
+        "locality by natural key",
+        [
+            lambda address=address: Locality.objects.filter(
+                region_id=address.locality.region_id,
+                normalized_name=address.locality.normalized_name,
+                postal_code=address.locality.postal_code,
+            ).first()
+            for address in sample
+        ],
+        repeat,
+    )
+    measure(
+        "street by natural key",
+        [
+            lambda address=address: Street.objects.filter(
+                locality_id=address.locality_id, normalized_name=address.street.normalized_name
+            ).first()
+            for address in sample
+        ],
+        repeat,
+    )
+    measure(
+        "address by hash",
+        [
+            lambda address=address: Address.objects.filter(address_hash=address.address_hash).first()
+            for address in sample
+        ],
+        repeat,
+    )
+    measure(
+        "admin search (istartswith)",
+        [
+            lambda address=address: list(Address.objects.filter(formatted_address__istartswith=address.route)[:100])
+            for address in sample
+        ],
+        repeat,
+    )
+    measure(
+        "service save (existing)",
+        [
+            lambda address=address: AddressService(
+                country=address.locality.region.country.name,
+                country_code=address.locality.region.country.code,
+                region=address.locality.region.name,
+                locality=address.locality.name,
+                street=address.street.name,
+                street_number=address.street_number,
+                formatted_address=address.formatted_address,
+            ).save()
+            for address in sample
+        ],
+        repeat,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--localities", type=int, default=10000)
+    parser.add_argument("--addresses", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=200, help="Lookups measured per access path.")
+    parser.add_argument("--skip-generate", action="store_true")
+    parser.add_argument("--migrate", action="store_true", help="Migrate the database first.")
+    parser.add_argument("--keep", action="store_true", help="Commit generated data instead of rolling it back.")
+    args = parser.parse_args()
+    if args.migrate:
+        call_command("migrate", verbosity=0)
+    with transaction.atomic():
+        if not args.skip_generate:
+            generate(args.localities, args.addresses)
+        run(args.repeat)
+        transaction.set_rollback(not args.keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Settings of the benchmark suite: the test settings on SQLite, or PostgreSQL with BENCHMARK_DATABASE=postgresql.
+
+    BENCHMARK_DATABASE=postgresql POSTGRES_DB=address_bench python benchmarks/suite.py --migrate
+"""
+import os
+import tempfile
+
+import django
+
+from tests.settings import *  # noqa: F401, F403
+
+ALLOWED_HOSTS = ["testserver"]
+
+SQLITE_NAME = os.path.join(tempfile.gettempdir(), "django_address_benchmark.sqlite3")
+
+if os.environ.get("BENCHMARK_DATABASE") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "django_address_benchmark"),
+            "USER": os.environ.get("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_NAME", SQLITE_NAME),
+            # concurrent writers of the load test wait for the lock instead of failing at once
+            "OPTIONS": {"timeout": 30},
+        }
+    }
+    if django.VERSION >= (5, 1):
+        # deferred transactions upgrading to writes fail with "database is locked" without waiting
+        DATABASES["default"]["OPTIONS"]["transaction_mode"] = "IMMEDIATE"
@@ -0,0 +1,189 @@
+"""Benchmark suite of the address service, AddressField, serialization and admin paths.
+
+Prints wall time and query count of every scenario on a synthetic hierarchy. Everything runs
+in one transaction rolled back at the end (use --keep to commit), so runs are repeatable:
+
+    python benchmarks/suite.py --migrate
+    BENCHMARK_DATABASE=postgresql python benchmarks/suite.py --migrate --addresses 20000
+    python benchmarks/suite.py --only save bulk_save
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import NoReverseMatch, reverse  # noqa: E402
+
+import swapper  # noqa: E402
+
+from benchmarks.synthetic import HierarchySpec, generate_addresses  # noqa: E402
+from django_address.serializers import serialize_addresses  # noqa: E402
+from django_address.service import get_service_class  # noqa: E402
+
+Address = swapper.load_model("django_address", "Address")
+
+
+class QueryCounter:
+    """execute_wrapper counting queries without keeping their SQL."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(name, operations, function):
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+    print(
+        "{name:<32} {operations:>7} ops {total:10.1f} ms {per_op:10.1f} us/op {queries:>7} queries".format(
+            name=name,
+            operations=operations,
+            total=elapsed * 1000,
+            per_op=elapsed * 1e6 / max(operations, 1),
+            queries=counter.count,
+        )
+    )
+
+
+def bench_save(spec, args):
+    service_class = get_service_class()
+    values = list(generate_addresses(HierarchySpec(**dict(vars(spec), addresses=args.saves)), prefix="save "))
+
+    def save_all():
+        for value in values:
+            service_class(**value).save()
+
+    measure("save cold", len(values), save_all)
+    measure("save warm", len(values), save_all)
+
+
+def bench_bulk_save(spec, args):
+    service_class = get_service_class()
+    values = list(generate_addresses(spec, prefix="bulk "))
+    measure("bulk_save cold", len(values), lambda: service_class.bulk_save(values))
+    measure("bulk_save warm", len(values), lambda: service_class.bulk_save(values))
+
+
+def bench_field(spec, args):
+    try:
+        order_model = apps.get_model("order", "Order")
+    except LookupError:
+        print("field: example.order is not installed, skipped")
+        return
+    values = list(generate_addresses(HierarchySpec(**dict(vars(spec), addresses=args.saves)), prefix="field "))
+    orders = []
+    measure(
+        "AddressField assignment",
+        len(values),
+        lambda: orders.extend(order_model(price=1, delivery_address=value) for value in values),
+    )
+
+    def save_all():
+        for order in orders:
+            order.save()
+
+    measure("model save with AddressField", len(orders), save_all)
+    values = list(generate_addresses(spec, prefix="field bulk "))
+    measure(
+        "bulk_create with AddressField",
+        len(values),
+        lambda: order_model.objects.bulk_create([order_model(price=1, delivery_address=value) for value in values]),
+    )
+
+
+def bench_serialization(spec, args):
+    queryset = Address.objects.with_hierarchy().order_by("pk")[: spec.addresses]
+    count = queryset.count()
+    if not count:
+        list(get_service_class().bulk_save(generate_addresses(spec, prefix="serialize ")))
+        count = queryset.count()
+    measure("to_dict", count, lambda: [address.to_dict() for address in queryset.all()])
+    measure("to_json", count, lambda: [address.to_json() for address in queryset.all()])
+    measure("serialize_addresses ndjson", count, lambda: sum(1 for _ in serialize_addresses(queryset, fmt="ndjson")))
+
+
+def admin_requests():
+    """Returns [(scenario name, query params)] of changelist requests, filtered by an existing address."""
+    address = Address.objects.select_related("locality").first()
+    requests = [("admin changelist", {})]
+    if address is not None:
+        requests.append(("admin changelist search", {"q": address.route}))
+        requests.append(("admin changelist locality", {"locality": address.locality.name}))
+    return requests
+
+
+def bench_admin(spec, args):
+    try:
+        url = reverse("admin:{0}_{1}_changelist".format(Address._meta.app_label, Address._meta.model_name))
+    except NoReverseMatch:
+        print("admin: address admin is not in ROOT_URLCONF, skipped")
+        return
+    user = get_user_model().objects.create_superuser("benchmark", "benchmark@example.com", "benchmark")
+    client = Client()
+    client.force_login(user)
+
+    def render(params):
+        for _ in range(args.repeat):
+            response = client.get(url, params)
+            assert response.status_code == 200, response.status_code
+
+    for name, params in admin_requests():
+        measure(name, args.repeat, lambda params=params: render(params))
+
+
+SCENARIOS = {
+    "save": bench_save,
+    "bulk_save": bench_bulk_save,
+    "field": bench_field,
+    "serialization": bench_serialization,
+    "admin": bench_admin,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--countries", type=int, default=2)
+    parser.add_argument("--regions", type=int, default=5, help="Regions per country.")
+    parser.add_argument("--localities", type=int, default=10, help="Localities per region.")
+    parser.add_argument("--streets", type=int, default=10, help="Streets per locality.")
+    parser.add_argument("--addresses", type=int, default=5000, help="Addresses of bulk and serialization scenarios.")
+    parser.add_argument("--saves", type=int, default=200, help="Addresses saved one by one.")
+    parser.add_argument("--repeat", type=int, default=5, help="Admin requests per scenario.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), help="Scenarios to run, all by default.")
+    parser.add_argument("--migrate", action="store_true", help="Migrate the database first.")
+    parser.add_argument("--keep", action="store_true", help="Commit generated data instead of rolling it back.")
+    args = parser.parse_args()
+    spec = HierarchySpec(args.countries, args.regions, args.localities, args.streets, args.addresses, args.seed)
+
+    setup_test_environment()
+    if args.migrate:
+        call_command("migrate", verbosity=0)
+    print("{0}, {1} streets, {2} addresses".format(connection.vendor, spec.street_count, spec.addresses))
+    with transaction.atomic():
+        for name in args.only or SCENARIOS:
+            SCENARIOS[name](spec, args)
+        transaction.set_rollback(not args.keep)
+
+
+if __name__ == "__main__":
+    main()
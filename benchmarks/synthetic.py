@@ -0,0 +1,56 @@
+"""Deterministic synthetic address hierarchy for the benchmarks."""
+import random
+from dataclasses import dataclass
+
+STREET_KINDS = ("street", "avenue", "lane", "boulevard")
+
+
+@dataclass
+class HierarchySpec:
+    """Size of the generated hierarchy, every level count is per parent."""
+
+    countries: int = 2
+    regions: int = 5
+    localities: int = 10
+    streets: int = 10
+    addresses: int = 1000
+    seed: int = 0
+
+    @property
+    def street_count(self):
+        return self.countries * self.regions * self.localities * self.streets
+
+
+def generate_addresses(spec, prefix=""):
+    """Yields spec.addresses service dicts spread over the hierarchy, equal spec and prefix give equal dicts.
+
+    ``prefix`` makes names distinct from an earlier run so the hierarchy has to be created again.
+    """
+    rng = random.Random(spec.seed)
+    for index in range(spec.addresses):
+        street = index % spec.street_count
+        locality, street = divmod(street, spec.streets)
+        region, locality = divmod(locality, spec.localities)
+        country, region = divmod(region, spec.regions)
+        street_name = "{prefix}Street {street} {kind}".format(
+            prefix=prefix, street=street, kind=STREET_KINDS[street % len(STREET_KINDS)]
+        )
+        locality_name = "{prefix}Locality {country}-{region}-{locality}".format(
+            prefix=prefix, country=country, region=region, locality=locality
+        )
+        number = str(index // spec.street_count + 1)
+        yield {
+            "raw": "{street}, {number}, {locality}".format(street=street_name, number=number, locality=locality_name),
+            "country": "{prefix}Country {country}".format(prefix=prefix, country=country),
+            "country_code": "C{country}".format(country=country),
+            "region": "{prefix}Region {country}-{region}".format(prefix=prefix, country=country, region=region),
+            "locality": locality_name,
+            "postal_code": "{0:05d}".format(country * 10000 + region * 100 + locality),
+            "street": street_name,
+            "street_number": number,
+            "formatted_address": "{street}, {number}, {locality}".format(
+                street=street_name, number=number, locality=locality_name
+            ),
+            "latitude": round(rng.uniform(44, 52), 6),
+            "longitude": round(rng.uniform(22, 40), 6),
+        }
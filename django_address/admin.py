@@ -1,6 +1,100 @@
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
 
 from django_address.models import Address, Country, District, Locality, Region, Street
+from django_address.normalization import normalize
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator taking the row count of unfiltered PostgreSQL tables from planner statistics.
+
+    COUNT(*) of a table with millions of rows scans it, pg_class.reltuples is read instantly.
+    Estimates below ``estimate_threshold`` and filtered querysets are counted exactly.
+    """
+
+    estimate_threshold = 100000
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate > self.estimate_threshold:
+            return estimate
+        return super().count
+
+
+def estimated_count(queryset):
+    """Returns planner estimate of unfiltered queryset rows on PostgreSQL, None otherwise."""
+    query = getattr(queryset, "query", None)
+    connection = connections[getattr(queryset, "db", "default")]
+    if query is None or connection.vendor != "postgresql" or query.where or query.distinct or query.is_sliced:
+        return None
+    with connection.cursor() as cursor:
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+        cursor.execute(sql, [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class LocalityFilter(admin.ListFilter):
+    """Filters by locality pk or name typed in, instead of listing every locality in the sidebar."""
+
+    title = _("Locality")
+    parameter_name = "locality"
+    template = "django_address/admin/locality_filter.html"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        value = params.pop(self.parameter_name, None)
+        if isinstance(value, list):
+            value = value[-1]
+        self.value = value or None
+        self.hidden_params = []
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.parameter_name]
+
+    def queryset(self, request, queryset):
+        if not self.value:
+            return queryset
+        try:
+            pk = Locality._meta.pk.to_python(self.value)
+        except ValidationError:
+            pk = None
+        if pk is not None and str(pk) == self.value:
+            return queryset.filter(locality_id=pk)
+        return queryset.filter(locality__normalized_name=normalize(Locality, self.value))
+
+    def choices(self, changelist):
+        self.hidden_params = []
+        for name, values in changelist.get_filters_params().items():
+            if name != self.parameter_name:
+                values = values if isinstance(values, list) else [values]
+                self.hidden_params.extend((name, value) for value in values)
+        yield {
+            "selected": self.value is None,
+            "query_string": changelist.get_query_string(remove=[self.parameter_name]),
+            "display": _("All"),
+        }
+        if self.value is not None:
+            yield {
+                "selected": True,
+                "query_string": changelist.get_query_string({self.parameter_name: self.value}),
+                "display": self.value,
+            }
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Admin of tables with millions of rows: estimated counts, no second full count query."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Country)
@@ -10,27 +104,40 @@ class CountryAdmin(admin.ModelAdmin):
 
 @admin.register(Region)
 class RegionAdmin(admin.ModelAdmin):
+    list_display = ("name", "code", "country")
+    list_select_related = ("country",)
     search_fields = ("name", "code")
+    autocomplete_fields = ("country",)
 
 
 @admin.register(District)
 class DistrictAdmin(admin.ModelAdmin):
+    list_display = ("name", "code", "region")
+    list_select_related = ("region__country",)
     search_fields = ("name", "code")
+    autocomplete_fields = ("region",)
 
 
 @admin.register(Locality)
-class LocalityAdmin(admin.ModelAdmin):
+class LocalityAdmin(LargeTableAdmin):
+    list_display = ("name", "postal_code", "region", "district")
+    list_select_related = ("region__country", "district__region__country")
     search_fields = ("name", "postal_code")
     prepopulated_fields = {"slug": ("name",)}
+    autocomplete_fields = ("region", "district")
 
 
 @admin.register(Street)
-class StreetAdmin(admin.ModelAdmin):
+class StreetAdmin(LargeTableAdmin):
     list_display = ("name", "locality")
+    list_select_related = ("locality__district__region__country",)
     search_fields = ("name",)
+    autocomplete_fields = ("locality",)
 
 
 @admin.register(Address)
-class AddressAdmin(admin.ModelAdmin):
+class AddressAdmin(LargeTableAdmin):
+    list_display = ("__str__", "street_number", "apartment")
     search_fields = ("route", "formatted_address")
-    list_filter = ["locality"]
+    list_filter = [LocalityFilter]
+    autocomplete_fields = ("locality", "street")
@@ -7,3 +7,11 @@ class AddressConfig(AppConfig):
 
     name = "django_address"
     verbose_name = _("Address")
+
+    def ready(self):
+        from django_address.service import get_models, get_service_class  # noqa: WPS433
+        from django_address.signals import connect_signals  # noqa: WPS433
+
+        get_models()
+        get_service_class()
+        connect_signals()
@@ -0,0 +1,179 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+
+import swapper
+
+from django_address.normalization import get_normalizer
+
+_autocomplete = None
+_autocomplete_lock = threading.Lock()
+
+SCOPE_LOOKUPS = {
+    "locality": {"country": "region__country", "region": "region"},
+    "street": {"country": "locality__region__country", "region": "locality__region", "locality": "locality"},
+}
+
+AUTOCOMPLETE_LEVELS = tuple(SCOPE_LOOKUPS)
+
+
+class PrefixIndex:
+    """Names of one scope sorted by normalized name, prefixes are found with binary search.
+
+    Keeps three parallel sequences instead of model instances, pks are packed into an array
+    when they are integers.
+    """
+
+    def __init__(self, rows):
+        normalizer = get_normalizer()
+        rows = sorted((normalized or normalizer(name), pk, name) for normalized, pk, name in rows)
+        self.keys = [key for key, _, _ in rows]
+        self.names = [name for _, _, name in rows]
+        pks = [pk for _, pk, _ in rows]
+        self.pks = array("q", pks) if all(isinstance(pk, int) for pk in pks) else pks
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, prefix, limit=10):
+        """Returns [(pk, name)] of names starting with normalized prefix, in name order."""
+        results = []
+        index = bisect_left(self.keys, prefix)
+        while index < len(self.keys) and len(results) < limit and self.keys[index].startswith(prefix):
+            results.append((self.pks[index], self.names[index]))
+            index += 1
+        return results
+
+
+class Autocomplete:
+    """Prefix search of localities and streets.
+
+    A PrefixIndex is built lazily for every (level, scope) on first search and kept for ``timeout``
+    seconds, at most ``max_scopes`` of them are kept. Results are cached in a bounded LRU too.
+    Saving or deleting a locality or street drops indexes and results of the scopes it is part of.
+    """
+
+    def __init__(self, max_scopes=64, cache_size=10000, timeout=300):
+        self.max_scopes = max_scopes
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self._indexes = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(self, level, prefix, scope=None, limit=10):
+        """Returns [{"id": pk, "name": name}] of level instances which name starts with prefix.
+
+        Scope is a dict with pks of "country", "region" or (for streets) "locality".
+        """
+        scope = tuple(sorted((scope or {}).items()))
+        prefix = get_normalizer()(prefix)
+        key = (level, scope, prefix, limit)
+        results = self._get(self._results, key)
+        if results is None:
+            index = self._get(self._indexes, (level, scope))
+            if index is None:
+                index = self.build_index(level, dict(scope))
+                self._set(self._indexes, (level, scope), index, self.max_scopes)
+            results = [{"id": pk, "name": name} for pk, name in index.search(prefix, limit)]
+            self._set(self._results, key, results, self.cache_size)
+        return results
+
+    def build_index(self, level, scope):
+        model = swapper.load_model("django_address", level.capitalize(), required=True)
+        lookups = SCOPE_LOOKUPS[level]
+        queryset = model.objects.filter(**{lookups[name]: value for name, value in scope.items()})
+        rows = queryset.order_by().values_list("normalized_name", "pk", "name")
+        return PrefixIndex(rows.iterator(chunk_size=10000))
+
+    def invalidate(self, level, scope=None):
+        """Drops indexes and results of level, of scopes matching scope values only when scope is given."""
+        with self._lock:
+            for entries in (self._indexes, self._results):
+                for key in [key for key in entries if key[0] == level and _in_scope(key[1], scope)]:
+                    del entries[key]
+
+    def invalidate_instances(self, model, instances):
+        """Drops indexes and results of scopes the saved or deleted localities or streets are part of."""
+        level = autocomplete_level(model)
+        if level is None or not self.has_indexes(level):
+            return
+        try:
+            scopes = {tuple(sorted(instance_scope(level, instance).items())) for instance in instances}
+        except ObjectDoesNotExist:
+            # parents deleted along with the instances
+            self.invalidate(level)
+            return
+        for scope in scopes:
+            self.invalidate(level, dict(scope))
+
+    def has_indexes(self, level):
+        with self._lock:
+            return any(key[0] == level for key in self._indexes)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+            self._results.clear()
+
+    def _get(self, entries, key):
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return entry[1]
+
+    def _set(self, entries, key, value, max_size):
+        with self._lock:
+            entries[key] = (time.monotonic() + self.timeout, value)
+            entries.move_to_end(key)
+            while len(entries) > max_size:
+                entries.popitem(last=False)
+
+
+def _in_scope(key_scope, scope):
+    return scope is None or all(scope.get(name) == value for name, value in key_scope)
+
+
+def autocomplete_level(model):
+    """Returns autocomplete level of a locality or street model, None for other models."""
+    for level in AUTOCOMPLETE_LEVELS:
+        if issubclass(model, swapper.load_model("django_address", level.capitalize(), required=True)):
+            return level
+    return None
+
+
+def instance_scope(level, instance):
+    """Returns {scope name: pk} of a locality or street, its indexes are the ones of these scopes and subsets."""
+    if level == "street":
+        return dict(instance_scope("locality", instance.locality), locality=instance.locality_id)
+    return {"country": instance.region.country_id, "region": instance.region_id}
+
+
+def get_autocomplete():
+    """Returns process-wide Autocomplete configured by DJANGO_ADDRESS_AUTOCOMPLETE_* settings."""
+    global _autocomplete  # noqa: WPS420
+    if _autocomplete is None:
+        with _autocomplete_lock:
+            if _autocomplete is None:
+                _autocomplete = Autocomplete(
+                    max_scopes=getattr(settings, "DJANGO_ADDRESS_AUTOCOMPLETE_MAX_SCOPES", 64),
+                    cache_size=getattr(settings, "DJANGO_ADDRESS_AUTOCOMPLETE_CACHE_SIZE", 10000),
+                    timeout=getattr(settings, "DJANGO_ADDRESS_AUTOCOMPLETE_TIMEOUT", 300),
+                )
+    return _autocomplete
+
+
+def reset_autocomplete():
+    global _autocomplete  # noqa: WPS420
+    with _autocomplete_lock:
+        _autocomplete = None
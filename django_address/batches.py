@@ -0,0 +1,31 @@
+def pk_batches(queryset, batch_size=1000, fields=None):
+    """Yields lists of rows of queryset in pk order, batch_size rows per query.
+
+    Batches continue after the last pk instead of using OFFSET, so rows updated while iterating
+    (even out of the filter of queryset) don't shift later batches. ``fields`` are loaded with only().
+    """
+    queryset = queryset.order_by("pk")
+    if fields is not None:
+        queryset = queryset.only("pk", *fields)
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(batch[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1].pk
+
+
+def update_in_batches(queryset, update, update_fields, batch_size=1000, fields=None):
+    """Calls update(row) for rows of queryset in pk ordered batches, saving update_fields with one bulk_update each.
+
+    Returns number of updated rows.
+    """
+    updated = 0
+    for rows in pk_batches(queryset, batch_size, fields):
+        for row in rows:
+            update(row)
+        queryset.model.objects.bulk_update(rows, update_fields)
+        updated += len(rows)
+    return updated
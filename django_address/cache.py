@@ -0,0 +1,188 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+_cache = None
+_shared_cache = None
+_cache_lock = threading.Lock()
+
+
+class LRUCache:
+    """Process-local cache of hierarchy instances keyed by model and natural key.
+
+    Holds at most ``max_size`` entries, least recently used ones are evicted first,
+    entries older than ``timeout`` seconds are treated as missing.
+    """
+
+    def __init__(self, max_size=10000, timeout=300):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._keys_by_pk = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, model, key):
+        """Returns cached instance or None."""
+        cache_key = (model._meta.label_lower, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(cache_key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, model, key, instance):
+        cache_key = (model._meta.label_lower, key)
+        with self._lock:
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            self._entries[cache_key] = (time.monotonic() + self.timeout, instance)
+            self._keys_by_pk[(cache_key[0], instance.pk)].add(cache_key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, model, pk):
+        """Drops every entry pointing to the instance with given pk."""
+        with self._lock:
+            for cache_key in list(self._keys_by_pk.get((model._meta.label_lower, pk), ())):
+                self._remove(cache_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_pk.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+    def _remove(self, cache_key):
+        _, instance = self._entries.pop(cache_key)
+        pk_key = (cache_key[0], instance.pk)
+        keys = self._keys_by_pk.get(pk_key)
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del self._keys_by_pk[pk_key]
+
+
+class SharedCache:
+    """Hierarchy cache stored in a django cache backend shared between worker processes.
+
+    Entries are keyed by the chain of natural keys from country down to the level, so
+    the whole chain of one address is read with a single get_many(). Each entry keeps
+    versions of the models in its chain, bumping a model version makes its entries stale
+    in every process.
+    """
+
+    prefix = "django_address"
+
+    def __init__(self, alias="default", timeout=300):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get_many(self, entries):
+        """Returns ({key: instance}, versions) for entries given as {key: models guarding the entry}."""
+        version_keys = {self.version_key(model) for models in entries.values() for model in models}
+        entry_keys = {self.entry_key(key): key for key in entries}
+        values = self.cache.get_many(list(version_keys) + list(entry_keys))
+        versions = {version_key: values[version_key] for version_key in version_keys if version_key in values}
+        found = {}
+        for entry_key, key in entry_keys.items():
+            entry = values.get(entry_key)
+            expected = self._entry_versions(entries[key], versions)
+            if entry is not None and None not in expected and entry[0] == expected:
+                found[key] = entry[1]
+        return found, versions
+
+    def set_many(self, entries, instances, versions):
+        """Stores instances ({key: instance}) with versions read by get_many()."""
+        missing = {self.version_key(model) for key in instances for model in entries[key]} - set(versions)
+        if missing:
+            versions = dict(versions, **self._init_versions(missing))
+        self.cache.set_many(
+            {
+                self.entry_key(key): (self._entry_versions(entries[key], versions), instance)
+                for key, instance in instances.items()
+            },
+            self.timeout,
+        )
+
+    def invalidate(self, model):
+        """Bumps model version, entries of the model and its descendants become stale."""
+        version_key = self.version_key(model)
+        try:
+            self.cache.incr(version_key)
+        except ValueError:
+            self.cache.set(version_key, time.time_ns(), None)
+
+    def version_key(self, model):
+        return "{prefix}:version:{label}".format(prefix=self.prefix, label=model._meta.label_lower)
+
+    def entry_key(self, key):
+        digest = hashlib.md5(repr(key).encode("utf-8")).hexdigest()  # noqa: S303
+        return "{prefix}:entry:{digest}".format(prefix=self.prefix, digest=digest)
+
+    def _entry_versions(self, models, versions):
+        return tuple(versions.get(self.version_key(model)) for model in models)
+
+    def _init_versions(self, version_keys):
+        initial = time.time_ns()
+        for version_key in version_keys:
+            self.cache.add(version_key, initial, None)
+        return self.cache.get_many(list(version_keys))
+
+
+def get_cache():
+    """Returns cache configured by DJANGO_ADDRESS_CACHE_CLASS or None when caching is disabled."""
+    global _cache  # noqa: WPS420
+    cache_class = getattr(settings, "DJANGO_ADDRESS_CACHE_CLASS", None)
+    if not cache_class:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = import_string(cache_class)(
+                    max_size=getattr(settings, "DJANGO_ADDRESS_CACHE_MAX_SIZE", 10000),
+                    timeout=getattr(settings, "DJANGO_ADDRESS_CACHE_TIMEOUT", 300),
+                )
+    return _cache
+
+
+def get_shared_cache():
+    """Returns cache shared between processes configured by DJANGO_ADDRESS_CACHE_ALIAS or None."""
+    global _shared_cache  # noqa: WPS420
+    alias = getattr(settings, "DJANGO_ADDRESS_CACHE_ALIAS", None)
+    if not alias:
+        return None
+    if _shared_cache is None:
+        with _cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache(alias, timeout=getattr(settings, "DJANGO_ADDRESS_CACHE_TIMEOUT", 300))
+    return _shared_cache
+
+
+def reset_cache():
+    """Forgets configured caches, next calls build them from settings again."""
+    global _cache, _shared_cache  # noqa: WPS420
+    with _cache_lock:
+        _cache = None
+        _shared_cache = None
@@ -0,0 +1,132 @@
+from django.apps import apps
+from django.db import models, transaction
+
+import swapper
+
+from django_address.batches import pk_batches, update_in_batches
+
+
+def address_relations(address_model):
+    """Returns (model, field) of every concrete foreign key pointing to addresses, AddressFields included."""
+    return [
+        (relation.related_model, relation.field)
+        for relation in address_model._meta.related_objects
+        if relation.field.concrete and isinstance(relation.field, models.ForeignKey)
+    ]
+
+
+def refresh_fingerprints(queryset, batch_size=1000):
+    """Recomputes fingerprint of addresses in pk ordered batches, returns number of updated rows."""
+
+    def update(address):
+        address.fingerprint = address.build_fingerprint()
+
+    fields = ("locality", "street", "route", "street_number", "apartment")
+    return update_in_batches(queryset, update, ["fingerprint"], batch_size, fields=fields)
+
+
+def refresh_address_hashes(queryset, batch_size=1000):
+    """Fills address_hash of addresses in pk ordered batches, returns (updated, skipped) numbers of rows.
+
+    Rows which hash is taken by another address are exact duplicates, they are skipped (left without
+    hash) so the unique index holds, dedupe_addresses merges them.
+    """
+    model = queryset.model
+    updated = 0
+    skipped = 0
+    for addresses in pk_batches(queryset, batch_size, fields=("address_hash", *model.HASH_FIELDS)):
+        hashes = {address.pk: address.build_address_hash() for address in addresses}
+        taken = set(model.objects.filter(address_hash__in=set(hashes.values())).values_list("address_hash", flat=True))
+        changed = []
+        for address in addresses:
+            if hashes[address.pk] in taken:
+                skipped += 1
+                continue
+            address.address_hash = hashes[address.pk]
+            taken.add(address.address_hash)
+            changed.append(address)
+        model.objects.bulk_update(changed, ["address_hash"])
+        updated += len(changed)
+    return updated, skipped
+
+
+def duplicate_groups(queryset, batch_size=1000):
+    """Yields lists of {duplicate pk: kept pk} for batch_size fingerprints shared by several addresses.
+
+    The fingerprint is the blocking key, the oldest address of every block is kept.
+    """
+    fingerprints = (
+        queryset.exclude(fingerprint="")
+        .values("fingerprint")
+        .annotate(count=models.Count("pk"))
+        .filter(count__gt=1)
+        .order_by("fingerprint")
+        .values_list("fingerprint", flat=True)
+    )
+    last = None
+    while True:
+        batch = fingerprints if last is None else fingerprints.filter(fingerprint__gt=last)
+        keys = list(batch[:batch_size])
+        if not keys:
+            return
+        kept = {}
+        merged = {}
+        rows = queryset.filter(fingerprint__in=keys).order_by("fingerprint", "pk").values_list("fingerprint", "pk")
+        for fingerprint, pk in rows:
+            if fingerprint in kept:
+                merged[pk] = kept[fingerprint]
+            else:
+                kept[fingerprint] = pk
+        yield merged
+        last = keys[-1]
+
+
+def merge_addresses(merged, batch_size=200):
+    """Repoints references of duplicates to kept addresses and deletes duplicates.
+
+    Every relation is repointed with one UPDATE ... CASE per batch_size duplicates. Hashes of
+    duplicates are kept as MergedAddressHash, so saving a duplicate again returns the kept address.
+    """
+    address_model = swapper.load_model("django_address", "Address", required=True)
+    relations = address_relations(address_model)
+    pks = list(merged)
+    with transaction.atomic():
+        for start in range(0, len(pks), batch_size):
+            chunk = pks[start : start + batch_size]
+            for model, field in relations:
+                repoint(model, field, {pk: merged[pk] for pk in chunk})
+            remember_hashes(address_model, {pk: merged[pk] for pk in chunk})
+            address_model._base_manager.filter(pk__in=chunk).delete()
+    return len(pks)
+
+
+def repoint(model, field, merged):
+    """Updates field of model rows referencing duplicates to the kept addresses with one UPDATE ... CASE."""
+    new_value = models.Case(
+        *[models.When(**{field.attname: pk, "then": models.Value(kept)}) for pk, kept in merged.items()],
+        output_field=field.target_field,
+    )
+    model._base_manager.filter(**{"{name}__in".format(name=field.attname): list(merged)}).update(
+        **{field.attname: new_value}
+    )
+
+
+def remember_hashes(address_model, merged):
+    """Stores address_hash of duplicates pointing to the kept addresses."""
+    merged_hash_model = apps.get_model("django_address", "MergedAddressHash")
+    rows = address_model._base_manager.filter(pk__in=list(merged)).exclude(address_hash=None)
+    merged_hash_model.objects.bulk_create(
+        [
+            merged_hash_model(address_hash=address_hash, address_id=merged[pk])
+            for pk, address_hash in rows.values_list("pk", "address_hash")
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def dedupe_addresses(queryset, batch_size=1000):
+    """Merges addresses sharing a fingerprint, returns number of deleted duplicates."""
+    deleted = 0
+    for merged in duplicate_groups(queryset, batch_size=batch_size):
+        deleted += merge_addresses(merged)
+    return deleted
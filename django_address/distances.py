@@ -0,0 +1,125 @@
+"""Vectorized haversine distances over coordinates loaded into numpy arrays.
+
+numpy is optional (``pip install django-address-app[numpy]``), only ``refine_nearest`` works without it.
+"""
+from collections import namedtuple
+from heapq import nsmallest
+from itertools import islice
+
+from django.core.exceptions import ImproperlyConfigured
+
+from django_address.geo import EARTH_RADIUS_KM, haversine
+
+try:
+    import numpy as np  # noqa: WPS433
+except ImportError:  # pragma: no cover
+    np = None
+
+DEFAULT_CHUNK_SIZE = 10000
+# pairwise distances are computed in row blocks of at most this many cells, temporaries stay bounded
+PAIRWISE_BLOCK_CELLS = 1 << 20
+
+Coordinates = namedtuple("Coordinates", ["pks", "latitudes", "longitudes"])
+
+
+def require_numpy():
+    if np is None:
+        raise ImproperlyConfigured("numpy is required for vectorized distances, install django-address-app[numpy].")
+
+
+def load_coordinates(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Returns Coordinates of the queryset as arrays, rows are read with values_list in chunks.
+
+    Every chunk is packed into arrays before the next one is read, so python objects of at most
+    ``chunk_size`` rows are alive at once. pks are int64 for integer primary keys, objects otherwise.
+    """
+    require_numpy()
+    rows = queryset.order_by().values_list("pk", "latitude", "longitude").iterator(chunk_size=chunk_size)
+    chunks = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        pks, latitudes, longitudes = zip(*chunk)
+        integer_pks = all(isinstance(pk, int) for pk in pks)
+        chunks.append(
+            (
+                np.array(pks, dtype=np.int64 if integer_pks else object),
+                np.array(latitudes, dtype=np.float64),
+                np.array(longitudes, dtype=np.float64),
+            )
+        )
+    if not chunks:
+        return Coordinates(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+    return Coordinates(*(np.concatenate(arrays) for arrays in zip(*chunks)))
+
+
+def haversine_to_many(latitude, longitude, latitudes, longitudes):
+    """Returns array of great-circle distances in kilometres from the point to every point of the arrays."""
+    require_numpy()
+    return _haversine(np.radians(latitude), np.radians(longitude), np.radians(latitudes), np.radians(longitudes))
+
+
+def iter_pairwise_haversine(latitudes1, longitudes1, latitudes2, longitudes2, block_cells=PAIRWISE_BLOCK_CELLS):
+    """Yields (start, block) where block holds distances from rows start.. of the first set to the second set.
+
+    Rows are taken so that a block has at most ``block_cells`` cells, use it when the whole
+    matrix does not fit in memory.
+    """
+    require_numpy()
+    phi1 = np.radians(np.asarray(latitudes1, dtype=np.float64))[:, np.newaxis]
+    lambda1 = np.radians(np.asarray(longitudes1, dtype=np.float64))[:, np.newaxis]
+    phi2 = np.radians(np.asarray(latitudes2, dtype=np.float64))[np.newaxis, :]
+    lambda2 = np.radians(np.asarray(longitudes2, dtype=np.float64))[np.newaxis, :]
+    rows = max(1, block_cells // max(phi2.shape[1], 1))
+    for start in range(0, phi1.shape[0], rows):
+        end = start + rows
+        yield start, _haversine(phi1[start:end], lambda1[start:end], phi2, lambda2)
+
+
+def pairwise_haversine(latitudes1, longitudes1, latitudes2, longitudes2, block_cells=PAIRWISE_BLOCK_CELLS):
+    """Returns (len(first), len(second)) matrix of distances in kilometres."""
+    require_numpy()
+    matrix = np.empty((len(latitudes1), len(latitudes2)), dtype=np.float64)
+    for start, block in iter_pairwise_haversine(latitudes1, longitudes1, latitudes2, longitudes2, block_cells):
+        matrix[start : start + block.shape[0]] = block
+    return matrix
+
+
+def nearest_indices(latitude, longitude, latitudes, longitudes, k, max_distance_km=None):
+    """Returns (indices, distances) of the k points nearest to the point ordered by distance."""
+    distances = haversine_to_many(latitude, longitude, latitudes, longitudes)
+    indices = np.arange(distances.shape[0])
+    if max_distance_km is not None:
+        indices = indices[distances <= max_distance_km]
+    if indices.shape[0] > k:
+        indices = indices[np.argpartition(distances[indices], k - 1)[:k]]
+    indices = indices[np.argsort(distances[indices], kind="stable")]
+    return indices, distances[indices]
+
+
+def refine_nearest(latitude, longitude, queryset, k, max_distance_km=None):
+    """Returns [(distance, pk)] of the k addresses of queryset nearest to the point.
+
+    Vectorized when numpy is installed, computed row by row otherwise.
+    """
+    if np is None:
+        distances = (
+            (haversine(latitude, longitude, lat, lon), pk)
+            for pk, lat, lon in queryset.values_list("pk", "latitude", "longitude")
+        )
+        if max_distance_km is not None:
+            distances = (row for row in distances if row[0] <= max_distance_km)
+        return nsmallest(k, distances)
+    coordinates = load_coordinates(queryset)
+    indices, distances = nearest_indices(
+        latitude, longitude, coordinates.latitudes, coordinates.longitudes, k, max_distance_km
+    )
+    return list(zip(distances.tolist(), coordinates.pks[indices].tolist()))
+
+
+def _haversine(phi1, lambda1, phi2, lambda2):
+    sin_lat = np.sin((phi2 - phi1) / 2)
+    sin_lon = np.sin((lambda2 - lambda1) / 2)
+    value = sin_lat * sin_lat + np.cos(phi1) * np.cos(phi2) * sin_lon * sin_lon
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(value)))
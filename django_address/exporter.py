@@ -0,0 +1,148 @@
+import csv
+import json
+import struct
+import sys
+from array import array
+
+from django.db.models import Q
+
+from django_address.importer import chunked
+
+FORMATS = ("ndjson", "csv", "columnar")
+
+EXPORT_COLUMNS = (
+    ("id", "pk", "int"),
+    ("raw", "raw", "str"),
+    ("street_number", "street_number", "str"),
+    ("apartment", "apartment", "str"),
+    ("route", "route", "str"),
+    ("formatted_address", "formatted_address", "str"),
+    ("latitude", "latitude", "float"),
+    ("longitude", "longitude", "float"),
+    ("street", "street__name", "str"),
+    ("locality", "locality__name", "str"),
+    ("postal_code", "locality__postal_code", "str"),
+    ("district", "locality__district__name", "str"),
+    ("region", "locality__region__name", "str"),
+    ("region_code", "locality__region__code", "str"),
+    ("country", "locality__region__country__name", "str"),
+    ("country_code", "locality__region__country__code", "str"),
+)
+
+COLUMN_NAMES = [name for name, _, _ in EXPORT_COLUMNS]
+
+COLUMNAR_MAGIC = b"DAC1"
+NUMERIC_TYPECODES = {"int": "q", "float": "d"}
+
+
+def detect_format(path):
+    """Guesses output format by file extension, NDJSON is the default."""
+    if path.endswith(".gz"):
+        path = path[:-3]
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".dac", ".columnar")):
+        return "columnar"
+    return "ndjson"
+
+
+def filter_addresses(queryset, country=None, region=None, locality=None):
+    """Narrows queryset by country name or code, region and locality names."""
+    if country:
+        queryset = queryset.filter(
+            Q(locality__region__country__name=country) | Q(locality__region__country__code=country)
+        )
+    if region:
+        queryset = queryset.filter(locality__region__name=region)
+    if locality:
+        queryset = queryset.filter(locality__name=locality)
+    return queryset
+
+
+def export_rows(queryset, chunk_size=2000):
+    """Yields flat tuples of EXPORT_COLUMNS, the hierarchy is joined in the same streamed query."""
+    paths = [path for _, path, _ in EXPORT_COLUMNS]
+    return queryset.order_by("pk").values_list(*paths).iterator(chunk_size=chunk_size)
+
+
+def write_ndjson(rows, stream):
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(dict(zip(COLUMN_NAMES, row))))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(rows, stream):
+    writer = csv.writer(stream)
+    writer.writerow(COLUMN_NAMES)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_columnar(rows, stream, block_size=2000):
+    """Writes rows column by column in blocks.
+
+    Layout: magic, length prefixed JSON header with columns and types, then blocks of
+    ``<I`` row count followed by every column of the block. Numbers are packed little-endian
+    arrays, strings length prefixed JSON lists. A zero row count ends the stream.
+    """
+    header = json.dumps({"columns": [[name, kind] for name, _, kind in EXPORT_COLUMNS]}).encode("utf-8")
+    stream.write(COLUMNAR_MAGIC)
+    stream.write(struct.pack("<I", len(header)))
+    stream.write(header)
+    count = 0
+    for block in chunked(rows, block_size):
+        stream.write(struct.pack("<I", len(block)))
+        for index, (_, _, kind) in enumerate(EXPORT_COLUMNS):
+            stream.write(_pack_column([row[index] for row in block], kind))
+        count += len(block)
+    stream.write(struct.pack("<I", 0))
+    return count
+
+
+def read_columnar(stream):
+    """Yields dicts of a stream written by write_columnar()."""
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar address dump.")
+    header = json.loads(stream.read(_read_uint(stream)))
+    columns = header["columns"]
+    while True:
+        size = _read_uint(stream)
+        if not size:
+            return
+        values = [_unpack_column(stream, kind, size) for _, kind in columns]
+        names = [name for name, _ in columns]
+        for row in zip(*values):
+            yield dict(zip(names, row))
+
+
+WRITERS = {"ndjson": write_ndjson, "csv": write_csv, "columnar": write_columnar}
+
+
+def _pack_column(values, kind):
+    if kind in NUMERIC_TYPECODES:
+        packed = array(NUMERIC_TYPECODES[kind], values)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed.tobytes()
+    encoded = json.dumps(values).encode("utf-8")
+    return struct.pack("<I", len(encoded)) + encoded
+
+
+def _unpack_column(stream, kind, size):
+    if kind in NUMERIC_TYPECODES:
+        packed = array(NUMERIC_TYPECODES[kind])
+        packed.frombytes(stream.read(size * packed.itemsize))
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed.tolist()
+    return json.loads(stream.read(_read_uint(stream)))
+
+
+def _read_uint(stream):
+    return struct.unpack("<I", stream.read(4))[0]
@@ -1,40 +1,79 @@
 from uuid import UUID
 
-from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models.fields.related_descriptors import ForwardManyToOneDescriptor
-from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 
 import swapper
 
-from django_address.service import AddressError
+from django_address.service import AddressError, get_service_class
+
+
+def resolve_pending_addresses(objs):
+    """Saves pending dict values of AddressFields of objs with one bulk_save, equal values share the address."""
+    pending = _pending_addresses(list(objs))
+    if not pending:
+        return
+    values = [obj.__dict__[descriptor.pending_name] for obj, descriptor in pending]
+    try:
+        addresses = get_service_class().bulk_save(values)
+    except AddressError:
+        raise ValidationError("Invalid address value.")
+    for (obj, descriptor), address in zip(pending, addresses):
+        descriptor.__set__(obj, address)
+
+
+def _pending_addresses(objs):
+    """Returns [(obj, descriptor)] of AddressFields of objs keeping a pending dict value."""
+    if not objs:
+        return []
+    descriptors = [
+        getattr(type(objs[0]), field.name) for field in objs[0]._meta.concrete_fields if isinstance(field, AddressField)
+    ]
+    return [(obj, descriptor) for descriptor in descriptors for obj in objs if descriptor.has_pending(obj)]
 
 
 class AddressDescriptor(ForwardManyToOneDescriptor):
+    """Assigning a dict keeps it pending, the address is saved on first access or when the model is saved."""
+
+    @property
+    def pending_name(self):
+        return "_django_address_pending_{name}".format(name=self.field.name)
+
+    def __get__(self, instance, cls=None):
+        if instance is not None and self.pending_name in instance.__dict__:
+            self.resolve(instance)
+        return super().__get__(instance, cls)
+
     def __set__(self, inst, value):
-        self.Address = swapper.load_model("django_address", "Address", required=True)  # noqa
+        inst.__dict__.pop(self.pending_name, None)
+        if isinstance(value, dict):
+            super().__set__(inst, None)
+            inst.__dict__[self.pending_name] = value
+            return
         super().__set__(inst, self.to_python(value))
 
+    def has_pending(self, instance):
+        return self.pending_name in instance.__dict__
+
+    def resolve(self, instance):
+        """Saves pending address values of instance with the service class."""
+        value = instance.__dict__[self.pending_name]
+        try:
+            address = get_service_class()(**value).save()
+        except AddressError:
+            raise ValidationError("Invalid address value.")
+        self.__set__(instance, address)
+
     def to_python(self, value):
 
         if value is None:
             return None
 
-        if isinstance(value, (self.Address, int, UUID)):
+        if isinstance(value, (self.field.related_model, int, UUID)):
             return value
 
-        if isinstance(value, dict):
-            try:
-                address_svc = import_string(
-                    getattr(settings, "DJANGO_ADDRESS_SERVICE_CLASS", "django_address.service.Address")
-                )
-                new_address = address_svc(**value)
-                return new_address.save()
-            except AddressError:
-                raise ValidationError("Invalid address value.")
-
         raise ValidationError("Invalid address value.")
 
 
@@ -51,3 +90,15 @@ class AddressField(models.ForeignKey):
     def contribute_to_class(self, cls, name, virtual_only=False, **kwargs):
         super().contribute_to_class(cls, name, private_only=virtual_only, **kwargs)
         setattr(cls, self.name, AddressDescriptor(self))
+
+    def pre_save(self, model_instance, add):
+        descriptor = getattr(type(model_instance), self.name)
+        if descriptor.has_pending(model_instance):
+            descriptor.resolve(model_instance)
+        return super().pre_save(model_instance, add)
+
+    def validate(self, value, model_instance):
+        # pending values are resolved on save, there is no pk to check yet
+        if value is None and getattr(type(model_instance), self.name).has_pending(model_instance):
+            return
+        super().validate(value, model_instance)
@@ -0,0 +1,121 @@
+import math
+
+from django.db import models
+
+from django_address.batches import update_in_batches
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+# character sorting after every geohash character, [cell, cell + PREFIX_END) is the prefix range
+PREFIX_END = "{"
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Returns geohash of the point, bits of longitude and latitude interleaved starting with longitude."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """Returns (height, width) in degrees of geohash cells of given precision."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def cover_bbox(min_lat, min_lon, max_lat, max_lon, max_cells=32):
+    """Returns geohash prefixes of the finest precision covering the box with at most max_cells cells."""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = _grid_range(min_lat + 90, max_lat + 90, height, 180.0)
+        columns = _grid_range(min_lon + 180, max_lon + 180, width, 360.0)
+        if len(rows) * len(columns) <= max_cells or precision == 1:
+            return sorted(
+                {
+                    encode_geohash((row + 0.5) * height - 90, (column + 0.5) * width - 180, precision)
+                    for row in rows
+                    for column in columns
+                }
+            )
+    return []
+
+
+def bbox_around(latitude, longitude, radius_km):
+    """Returns (min_lat, min_lon, max_lat, max_lon) of a box containing the circle around the point.
+
+    min_lon is greater than max_lon when the box crosses the antimeridian.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat = max(latitude - delta_lat, -90.0)
+    max_lat = min(latitude + delta_lat, 90.0)
+    cos_lat = math.cos(math.radians(latitude))
+    if max_lat >= 90 or min_lat <= -90:
+        return min_lat, -180.0, max_lat, 180.0
+    delta_lon = math.degrees(math.asin(min(1.0, math.sin(math.radians(delta_lat)) / cos_lat)))
+    return min_lat, normalize_longitude(longitude - delta_lon), max_lat, normalize_longitude(longitude + delta_lon)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Returns great-circle distance in kilometres."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    sin_lat = math.sin((phi2 - phi1) / 2)
+    sin_lon = math.sin(math.radians(lon2 - lon1) / 2)
+    value = sin_lat * sin_lat + math.cos(phi1) * math.cos(phi2) * sin_lon * sin_lon
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(value)))
+
+
+def bbox_filter(min_lat, min_lon, max_lat, max_lon, max_cells=32):
+    """Returns Q of addresses inside the box: geohash prefix ranges (indexed) refined by coordinates.
+
+    Boxes crossing the antimeridian (min_lon > max_lon) are split in two.
+    """
+    if min_lon > max_lon:
+        return bbox_filter(min_lat, min_lon, max_lat, 180.0, max_cells) | bbox_filter(
+            min_lat, -180.0, max_lat, max_lon, max_cells
+        )
+    cells = models.Q()
+    for cell in cover_bbox(min_lat, min_lon, max_lat, max_lon, max_cells):
+        cells |= models.Q(geohash__gte=cell, geohash__lt=cell + PREFIX_END)
+    return cells & models.Q(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+
+
+def refresh_geohashes(queryset, batch_size=1000):
+    """Recomputes geohash of addresses in pk ordered batches, returns number of updated rows."""
+
+    def update(address):
+        address.geohash = address.build_geohash()
+
+    return update_in_batches(queryset, update, ["geohash"], batch_size, fields=("latitude", "longitude"))
+
+
+def normalize_longitude(longitude):
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def _grid_range(low, high, step, limit):
+    last = int(limit / step) - 1
+    return range(max(int(low // step), 0), min(int(high // step), last) + 1)
@@ -0,0 +1,95 @@
+from django.db import models
+
+import swapper
+
+from django_address.batches import update_in_batches
+from django_address.dedup import repoint
+
+HIERARCHY_LOOKUPS = (
+    ("Country", "locality__region__country"),
+    ("Region", "locality__region"),
+    ("District", "locality__district"),
+    ("Locality", "locality"),
+    ("Street", "street"),
+)
+
+HIERARCHY_SELECT_RELATED = ("locality__region__country", "locality__district__region__country", "street")
+
+
+def related_addresses(instance):
+    """Returns addresses which hierarchy snapshot includes the instance."""
+    address_model = swapper.load_model("django_address", "Address", required=True)
+    for model_name, lookup in HIERARCHY_LOOKUPS:
+        if isinstance(instance, swapper.load_model("django_address", model_name, required=True)):
+            return address_model.objects.filter(**{lookup: instance})
+    return address_model.objects.none()
+
+
+def refresh_hierarchy(queryset, batch_size=1000):
+    """Rebuilds hierarchy snapshot of addresses in pk ordered batches, returns number of updated rows."""
+
+    def update(address):
+        address.hierarchy = address.build_hierarchy()
+
+    return update_in_batches(queryset.select_related(*HIERARCHY_SELECT_RELATED), update, ["hierarchy"], batch_size)
+
+
+def merge_duplicates(model, key_fields, batch_size=200):
+    """Merges rows of model sharing values of key_fields into the oldest one, returns number of deleted rows.
+
+    Works with historical models, so migrations adding unique constraints can run it first.
+    """
+    merged = {}
+    groups = model._base_manager.values(*key_fields).annotate(rows=models.Count("pk")).filter(rows__gt=1)
+    for group in groups.order_by():
+        key = {name: group[name] for name in key_fields}
+        pks = list(model._base_manager.filter(**key).order_by("pk").values_list("pk", flat=True))
+        merged.update((pk, pks[0]) for pk in pks[1:])
+    return merge_rows(model, merged, batch_size)
+
+
+def merge_rows(model, merged, batch_size=200):
+    """Repoints foreign keys of {duplicate pk: kept pk} rows to kept ones and deletes duplicates.
+
+    Referencing rows colliding with a row of the kept one on their own natural key (e.g. same named
+    streets of merged localities) are merged the same way first.
+    """
+    if not merged:
+        return 0
+    for relation in model._meta.related_objects:
+        field = relation.field
+        if not (field.concrete and isinstance(field, models.ForeignKey)):
+            continue
+        merge_rows(relation.related_model, colliding_rows(relation.related_model, field, merged), batch_size)
+        pks = list(merged)
+        for start in range(0, len(pks), batch_size):
+            repoint(relation.related_model, field, {pk: merged[pk] for pk in pks[start : start + batch_size]})
+    model._base_manager.filter(pk__in=list(merged)).delete()
+    return len(merged)
+
+
+def colliding_rows(model, field, merged):
+    """Returns {pk: kept pk} of model rows which natural key collides once field is repointed by merged."""
+    names = natural_key(model, field)
+    if not names:
+        return {}
+    attnames = [model._meta.get_field(name).attname for name in names if name != field.name]
+    parents = set(merged) | set(merged.values())
+    rows = model._base_manager.filter(**{"{name}__in".format(name=field.attname): parents}).order_by("pk")
+    kept = {}
+    colliding = {}
+    for pk, parent, *values in rows.values_list("pk", field.attname, *attnames):
+        key = (merged.get(parent, parent), *values)
+        if key in kept:
+            colliding[pk] = kept[key]
+        else:
+            kept[key] = pk
+    return colliding
+
+
+def natural_key(model, field):
+    """Returns names of the first unique_together or UniqueConstraint of model including field."""
+    meta = model._meta
+    unique_sets = [*meta.unique_together]
+    unique_sets += [c.fields for c in meta.constraints if isinstance(c, models.UniqueConstraint) and c.fields]
+    return next((names for names in unique_sets if field.name in names), ())
@@ -0,0 +1,308 @@
+import csv
+import dataclasses
+import json
+import multiprocessing
+import os
+import queue
+import random
+import time
+import zlib
+from itertools import islice
+
+import django
+from django.apps import apps
+from django.db import OperationalError, connections
+
+from django_address.normalization import get_normalizer
+from django_address.service import AddressError, get_service_class
+
+FORMATS = ("csv", "ndjson")
+# attempts of a chunk failing because another worker keeps the (SQLite) database locked
+LOCKED_RETRIES = 20
+
+
+def detect_format(path):
+    """Guesses input format by file extension, csv is the default."""
+    if path.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    return "csv"
+
+
+def read_rows(stream, fmt="csv"):
+    """Lazily yields dicts of csv (with header) or NDJSON input."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "ndjson":
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError("Unknown format {fmt}, use one of {formats}.".format(fmt=fmt, formats=", ".join(FORMATS)))
+
+
+def address_values(row, field_types):
+    """Maps input row to service dataclass kwargs, unknown columns and empty values are skipped.
+
+    Malformed numbers (coordinates) raise ValueError.
+    """
+    values = {}
+    for name, value in row.items():
+        if name not in field_types or value is None or value == "":
+            continue
+        values[name] = to_float(name, value) if field_types[name] is float else value
+    return values
+
+
+def to_float(name, value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("malformed {name} {value!r}".format(name=name, value=value)) from None
+
+
+def row_values(row, field_types, number):
+    """address_values() of input row number (1-based), a malformed value raises AddressError naming the row."""
+    try:
+        return address_values(row, field_types)
+    except ValueError as error:
+        raise AddressError("Row {number} has {error}.".format(number=number, error=error)) from None
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as checkpoint:
+        return int(checkpoint.read().strip() or 0)
+
+
+def write_checkpoint(path, offset):
+    """Stores number of committed rows, replacing the file atomically."""
+    tmp_path = "{path}.tmp".format(path=path)
+    with open(tmp_path, "w", encoding="utf-8") as checkpoint:
+        checkpoint.write(str(offset))
+    os.replace(tmp_path, path)
+
+
+class AddressImporter:
+    """Imports address rows in chunks resolved with the service bulk_save().
+
+    Every chunk is committed on its own, the number of committed rows is stored in the
+    checkpoint file so an interrupted import can continue from it.
+    """
+
+    def __init__(self, chunk_size=1000, checkpoint=None, progress=None):
+        self.chunk_size = chunk_size
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.offset = 0
+        self.service_class = get_service_class()
+        self.field_types = {field.name: field.type for field in dataclasses.fields(self.service_class)}
+
+    def run(self, rows, offset=0):
+        """Imports rows after offset, returns number of rows imported by this run."""
+        started = time.monotonic()
+        imported = 0
+        self.offset = offset
+        for chunk in chunked(islice(rows, offset, None), self.chunk_size):
+            first = self.offset + 1
+            values = [row_values(row, self.field_types, number) for number, row in enumerate(chunk, first)]
+            self.service_class.bulk_save(values)
+            imported += len(chunk)
+            self.offset = offset + imported
+            if self.checkpoint:
+                write_checkpoint(self.checkpoint, self.offset)
+            if self.progress:
+                self.progress(self.offset, imported, time.monotonic() - started)
+        return imported
+
+
+def partition(values, workers):
+    """Returns worker index owning country and region of the address values.
+
+    Names are normalized as the service matches them, so "Kyiv City" and "kyiv city " share a worker.
+    """
+    normalizer = get_normalizer()
+    key = "|".join(normalizer(values.get(name) or "") for name in ("country", "region"))
+    return zlib.crc32(key.encode("utf-8")) % workers
+
+
+class ParallelAddressImporter(AddressImporter):
+    """Imports address rows with several worker processes.
+
+    Rows are partitioned by country and region, each partition is always handled by the same
+    worker, so workers don't compete for the same Region/Locality/Street rows. Workers use
+    their own database connections. Countries shared between partitions are resolved by the
+    conflict-ignoring inserts of bulk_save(), same named localities of other regions get keyed
+    slugs. SQLite allows a single writer, chunks failing with "database is locked" are retried.
+    A worker dying without reporting its exit fails the import. Checkpoints are not supported,
+    chunks of different workers are committed out of input order.
+    """
+
+    def __init__(self, workers=2, chunk_size=1000, progress=None, context=None):
+        super().__init__(chunk_size=chunk_size, progress=progress)
+        self.workers = workers
+        self.context = context or multiprocessing.get_context()
+        self.imported = 0
+        self.errors = []
+        self.running = 0
+        self._processes = []
+        self._results = None
+        self._started = None
+
+    def run(self, rows, offset=0):
+        """Imports rows after offset, returns number of rows imported by this run."""
+        connections.close_all()
+        self._started = time.monotonic()
+        self.imported = 0
+        self.errors = []
+        self._results = self.context.Queue()
+        tasks = [self.context.Queue(maxsize=2) for _ in range(self.workers)]
+        self._processes = [self.context.Process(target=import_worker, args=(task, self._results)) for task in tasks]
+        for process in self._processes:
+            process.start()
+        self.running = len(self._processes)
+        self._distribute(islice(rows, offset, None), tasks, offset)
+        self._wait()
+        for process in self._processes:
+            process.join()
+        self.offset = offset + self.imported
+        if self.errors:
+            raise AddressError("; ".join(self.errors))
+        return self.imported
+
+    def _distribute(self, rows, tasks, offset):
+        """Sends rows in chunks to the worker of their partition, then tells every worker to exit.
+
+        A malformed row stops the distribution, chunks sent before it are still imported.
+        """
+        buffers = [[] for _ in tasks]
+        for values in self._row_values(rows, offset):
+            index = partition(values, self.workers)
+            buffers[index].append(values)
+            if len(buffers[index]) >= self.chunk_size:
+                self._put(tasks[index], buffers[index])
+                buffers[index] = []
+        for task, buffer in zip(tasks, buffers):
+            if buffer:
+                self._put(task, buffer)
+            task.put(None)
+
+    def _row_values(self, rows, offset):
+        """Yields address values of rows, stops at a malformed row recording its error."""
+        for number, row in enumerate(rows, offset + 1):
+            try:
+                values = row_values(row, self.field_types, number)
+            except AddressError as error:
+                self.errors.append(str(error))
+                return
+            yield values
+
+    def _put(self, task, chunk):
+        while True:
+            try:
+                task.put(chunk, timeout=0.1)
+            except queue.Full:
+                self._drain()
+                self._check_workers()
+            else:
+                self._drain()
+                return
+
+    def _drain(self):
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self._handle_result(result)
+
+    def _wait(self):
+        """Handles results until every worker reported its exit."""
+        while self.running:
+            try:
+                self._handle_result(self._results.get(timeout=0.1))
+            except queue.Empty:
+                self._check_workers()
+
+    def _check_workers(self):
+        """Fails the import when a worker died (e.g. killed by the OOM killer) without reporting its exit."""
+        dead = [process for process in self._processes if process.exitcode not in (None, 0)]
+        if not dead:
+            return
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        raise AddressError(
+            "Import worker exited with code {code}, the import is incomplete.".format(code=dead[0].exitcode)
+        )
+
+    def _handle_result(self, result):
+        """Merges progress of workers, counts exited workers down."""
+        status, value = result
+        if status == "done":
+            self.imported += value
+            if self.progress:
+                self.progress(self.imported, self.imported, time.monotonic() - self._started)
+        elif status == "error":
+            self.errors.append(value)
+        elif status == "exit":
+            self.running -= 1
+
+
+def is_locked(error):
+    """Returns whether error was raised from a database locked by another connection."""
+    while error is not None:
+        if isinstance(error, OperationalError) and "locked" in str(error):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def save_chunk(service_class, chunk):
+    """bulk_save() of the chunk, retried with jittered backoff while the database is locked.
+
+    The chunk is saved in one transaction, a failed attempt is rolled back as a whole.
+    """
+    for attempt in range(LOCKED_RETRIES):
+        try:
+            return service_class.bulk_save(chunk)
+        except AddressError as error:
+            if attempt == LOCKED_RETRIES - 1 or not is_locked(error):
+                raise
+            time.sleep(random.uniform(0, min(0.01 * 2 ** attempt, 1)))  # noqa: S311
+
+
+def import_worker(tasks, results):
+    """Worker loop of ParallelAddressImporter, resolves chunks until None is received."""
+    if not apps.ready:
+        django.setup()
+    try:
+        import_chunks(get_service_class(), tasks, results)
+    finally:
+        connections.close_all()
+        results.put(("exit", None))
+
+
+def import_chunks(service_class, tasks, results):
+    """Resolves chunks until None is received, chunks after a failed one are only taken off the queue."""
+    failed = False
+    for chunk in iter(tasks.get, None):
+        if failed:
+            continue
+        try:
+            save_chunk(service_class, chunk)
+        except Exception as error:
+            failed = True
+            results.put(("error", repr(error.__cause__ or error)))
+        else:
+            results.put(("done", len(chunk)))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+import swapper
+
+from django_address.geo import refresh_geohashes
+
+
+class Command(BaseCommand):
+    help = "Fills geohash of addresses with coordinates in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Addresses updated per query.")
+
+    def handle(self, *args, **options):
+        address_model = swapper.load_model("django_address", "Address", required=True)
+        queryset = address_model.objects.filter(geohash="").exclude(latitude=0, longitude=0)
+        updated = refresh_geohashes(queryset, batch_size=options["batch_size"])
+        self.stdout.write("Updated {count} addresses.".format(count=updated))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+import swapper
+
+from django_address.dedup import refresh_address_hashes
+
+
+class Command(BaseCommand):
+    help = "Fills address_hash used by the service to look addresses up, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Addresses updated per query.")
+
+    def handle(self, *args, **options):
+        address_model = swapper.load_model("django_address", "Address", required=True)
+        queryset = address_model.objects.filter(address_hash__isnull=True)
+        updated, skipped = refresh_address_hashes(queryset, batch_size=options["batch_size"])
+        self.stdout.write("Updated {count} addresses.".format(count=updated))
+        if skipped:
+            self.stdout.write(
+                "Skipped {count} exact duplicates, merge them with dedupe_addresses.".format(count=skipped)
+            )
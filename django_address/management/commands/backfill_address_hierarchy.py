@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+import swapper
+
+from django_address.hierarchy import refresh_hierarchy
+
+
+class Command(BaseCommand):
+    help = "Fills denormalized hierarchy snapshot of addresses in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Addresses updated per query.")
+        parser.add_argument("--all", action="store_true", help="Rebuild every snapshot, not only empty ones.")
+
+    def handle(self, *args, **options):
+        address_model = swapper.load_model("django_address", "Address", required=True)
+        queryset = address_model.objects.all()
+        if not options["all"]:
+            queryset = queryset.filter(hierarchy={})
+        updated = refresh_hierarchy(queryset, batch_size=options["batch_size"])
+        self.stdout.write("Updated {count} addresses.".format(count=updated))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+import swapper
+
+from django_address.normalization import refresh_normalized_names
+from django_address.signals import HIERARCHY_MODELS
+
+
+class Command(BaseCommand):
+    help = "Fills normalized_name of countries, regions, districts, localities and streets in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows updated per query.")
+        parser.add_argument("--all", action="store_true", help="Recompute every name, not only empty ones.")
+
+    def handle(self, *args, **options):
+        for model_name in HIERARCHY_MODELS:
+            model = swapper.load_model("django_address", model_name, required=True)
+            queryset = model.objects.all()
+            if not options["all"]:
+                queryset = queryset.filter(normalized_name="")
+            updated = refresh_normalized_names(queryset, batch_size=options["batch_size"])
+            self.stdout.write("Updated {count} {name}.".format(count=updated, name=model._meta.verbose_name_plural))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+import swapper
+
+from django_address.dedup import dedupe_addresses, duplicate_groups, refresh_fingerprints
+
+
+class Command(BaseCommand):
+    help = "Merges addresses with the same fingerprint, references of duplicates are repointed to the kept address."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Fingerprints merged per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report number of duplicates.")
+
+    def handle(self, *args, **options):
+        address_model = swapper.load_model("django_address", "Address", required=True)
+        batch_size = options["batch_size"]
+        filled = refresh_fingerprints(address_model.objects.filter(fingerprint=""), batch_size=batch_size)
+        if filled:
+            self.stdout.write("Fingerprinted {count} addresses.".format(count=filled))
+        if options["dry_run"]:
+            duplicates = sum(len(merged) for merged in duplicate_groups(address_model.objects.all(), batch_size))
+            self.stdout.write("Found {count} duplicate addresses.".format(count=duplicates))
+            return
+        deleted = dedupe_addresses(address_model.objects.all(), batch_size=batch_size)
+        self.stdout.write("Merged {count} duplicate addresses.".format(count=deleted))
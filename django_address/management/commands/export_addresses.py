@@ -0,0 +1,51 @@
+import gzip
+import io
+import sys
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand
+
+import swapper
+
+from django_address.exporter import FORMATS, WRITERS, detect_format, export_rows, filter_addresses
+
+
+class Command(BaseCommand):
+    help = "Streams addresses joined with their hierarchy to NDJSON, csv or columnar binary file (or stdout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default="-", help="Output file, '-' writes stdout.")
+        parser.add_argument("--format", choices=FORMATS, help="Output format, guessed by file extension by default.")
+        parser.add_argument("--gzip", action="store_true", help="Compress output, implied by '.gz' extension.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched from the cursor at once.")
+        parser.add_argument("--country", help="Only addresses of the country with this name or code.")
+        parser.add_argument("--region", help="Only addresses of the region with this name.")
+        parser.add_argument("--locality", help="Only addresses of the locality with this name.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        compress = options["gzip"] or path.endswith(".gz")
+        address_model = swapper.load_model("django_address", "Address", required=True)
+        queryset = filter_addresses(
+            address_model.objects.all(),
+            country=options["country"],
+            region=options["region"],
+            locality=options["locality"],
+        )
+        rows = export_rows(queryset, chunk_size=options["chunk_size"])
+
+        with ExitStack() as stack:
+            binary = sys.stdout.buffer if path == "-" else stack.enter_context(open(path, "wb"))  # noqa: WPS515
+            if compress:
+                binary = stack.enter_context(gzip.GzipFile(fileobj=binary, mode="wb"))
+            if fmt == "columnar":
+                count = WRITERS[fmt](rows, binary)
+            else:
+                stream = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+                count = WRITERS[fmt](rows, stream)
+                stream.flush()
+                stream.detach()
+            binary.flush()
+        report = self.stderr if path == "-" else self.stdout
+        report.write("Exported {count} addresses.".format(count=count))
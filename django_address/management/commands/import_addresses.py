@@ -0,0 +1,68 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_address.importer import (
+    FORMATS,
+    AddressImporter,
+    ParallelAddressImporter,
+    detect_format,
+    read_checkpoint,
+    read_rows,
+)
+from django_address.service import AddressError
+
+
+class Command(BaseCommand):
+    help = "Imports addresses from csv or NDJSON file (or stdin) in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default="-", help="Input file, '-' reads stdin.")
+        parser.add_argument("--format", choices=FORMATS, help="Input format, guessed by file extension by default.")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Rows resolved and committed together.")
+        parser.add_argument("--offset", type=int, default=0, help="Number of input rows to skip.")
+        parser.add_argument("--checkpoint", help="File keeping number of committed rows.")
+        parser.add_argument("--resume", action="store_true", help="Continue from the offset stored in checkpoint.")
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Worker processes, rows are partitioned by country and region."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        offset = self.get_offset(options)
+        importer = self.get_importer(options)
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")  # noqa: WPS515
+        try:
+            imported = importer.run(read_rows(stream, fmt), offset=offset)
+        except AddressError as error:
+            message = "Chunk after row {offset} failed: {error!r}".format(
+                offset=importer.offset, error=error.__cause__ or error
+            )
+            raise CommandError(message)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write("Imported {count} addresses.".format(count=imported))
+
+    def get_offset(self, options):
+        if not options["resume"]:
+            return options["offset"]
+        if not options["checkpoint"]:
+            raise CommandError("--resume requires --checkpoint.")
+        return read_checkpoint(options["checkpoint"])
+
+    def get_importer(self, options):
+        if options["workers"] <= 1:
+            return AddressImporter(
+                chunk_size=options["chunk_size"], checkpoint=options["checkpoint"], progress=self.report_progress
+            )
+        if options["checkpoint"]:
+            raise CommandError("--checkpoint is not supported with several workers.")
+        return ParallelAddressImporter(
+            workers=options["workers"], chunk_size=options["chunk_size"], progress=self.report_progress
+        )
+
+    def report_progress(self, offset, imported, elapsed):
+        rate = imported / elapsed if elapsed else 0
+        self.stdout.write("{offset} rows processed, {rate:.0f} rows/s".format(offset=offset, rate=rate))
@@ -0,0 +1,99 @@
+from django.db import models
+
+from django_address.distances import refine_nearest
+from django_address.geo import HALF_CIRCUMFERENCE_KM, bbox_around, bbox_filter
+from django_address.hierarchy import HIERARCHY_SELECT_RELATED
+
+NEAREST_START_RADIUS_KM = 1.0
+
+
+class AddressQuerySet(models.QuerySet):
+    """Address queryset."""
+
+    def get_or_none(self, **kwargs):
+        try:
+            return self.get(**kwargs)
+        except self.model.DoesNotExist:
+            return None
+
+    def with_hierarchy(self):
+        """Joins street, locality, district, region and country, serializing addresses costs no more queries."""
+        return self.select_related(*HIERARCHY_SELECT_RELATED)
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """Addresses inside the box, indexed geohash prefixes prune rows before coordinates are compared."""
+        return self.filter(bbox_filter(min_lat, min_lon, max_lat, max_lon))
+
+    def nearest(self, latitude, longitude, k=10, max_distance_km=None):
+        """Returns list of k addresses nearest to the point ordered by ``distance`` (km) set on them.
+
+        Searches boxes around the point growing until k candidates are found, candidates are
+        refined with haversine (vectorized when numpy is installed). Addresses without coordinates
+        (0, 0) are never returned, neither is any address for k < 1.
+        """
+        if k < 1:
+            return []
+        limit = min(max_distance_km or HALF_CIRCUMFERENCE_KM, HALF_CIRCUMFERENCE_KM)
+        radius = min(NEAREST_START_RADIUS_KM, limit)
+        while True:
+            candidates = self.filter(bbox_filter(*bbox_around(latitude, longitude, radius)))
+            distances = refine_nearest(latitude, longitude, candidates, k, limit)
+            if len(distances) == k and distances[-1][0] > radius:
+                # the box holds every point closer than radius only, one more search is exact
+                radius = distances[-1][0]
+                continue
+            if len(distances) == k or radius >= limit:
+                break
+            radius = min(radius * 4, limit)
+        addresses = self.in_bulk([pk for _, pk in distances])
+        nearest = []
+        for distance, pk in distances:
+            address = addresses[pk]
+            address.distance = distance
+            nearest.append(address)
+        return nearest
+
+
+class AddressManager(models.Manager.from_queryset(AddressQuerySet)):
+    """Address manager."""
+
+
+class AddressFieldQuerySet(models.QuerySet):
+    """Queryset of models holding AddressField."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Resolves pending address dicts of objs with one batched bulk_save before the INSERT."""
+        from django_address.fields import resolve_pending_addresses  # noqa: WPS433
+
+        objs = list(objs)
+        resolve_pending_addresses(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Resolves pending address dicts of objs with one batched bulk_save before the UPDATE."""
+        from django_address.fields import resolve_pending_addresses  # noqa: WPS433
+
+        objs = list(objs)
+        resolve_pending_addresses(objs)
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    bulk_update.alters_data = True
+
+    def with_address_hierarchy(self, *field_names):
+        """Joins addresses with their hierarchy, all AddressFields of the model are used when no names are given."""
+        from django_address.fields import AddressField  # noqa: WPS433
+
+        if not field_names:
+            field_names = [field.name for field in self.model._meta.fields if isinstance(field, AddressField)]
+        lookups = [
+            "{name}__{related}".format(name=name, related=related)
+            for name in field_names
+            for related in HIERARCHY_SELECT_RELATED
+        ]
+        return self.select_related(*field_names, *lookups)
+
+
+class AddressFieldManager(models.Manager.from_queryset(AddressFieldQuerySet)):
+    """Manager of models holding AddressField."""
@@ -0,0 +1,51 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from django_address.hierarchy import merge_duplicates
+
+
+def merge_duplicate_localities(apps, schema_editor):
+    """Merges localities sharing the natural key, so the unique constraints can be added."""
+    locality_model = apps.get_model("django_address", "Locality")
+    if not locality_model._meta.swapped:
+        merge_duplicates(locality_model, ("region", "district", "name", "postal_code"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='address',
+            name='locality',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='addresses', to=settings.DJANGO_ADDRESS_LOCALITY_MODEL, verbose_name='Locality'),
+        ),
+        migrations.AlterField(
+            model_name='address',
+            name='street',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='addresses', to=settings.DJANGO_ADDRESS_STREET_MODEL, verbose_name='Street'),
+        ),
+        migrations.AlterField(
+            model_name='region',
+            name='country',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='regions', to=settings.DJANGO_ADDRESS_COUNTRY_MODEL, verbose_name='Country'),
+        ),
+        migrations.AlterField(
+            model_name='street',
+            name='locality',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='streets', to=settings.DJANGO_ADDRESS_LOCALITY_MODEL, verbose_name='Locality'),
+        ),
+        migrations.RunPython(merge_duplicate_localities, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='locality',
+            constraint=models.UniqueConstraint(condition=models.Q(('district__isnull', False)), fields=('region', 'district', 'name', 'postal_code'), name='django_address_locality_unique_district'),
+        ),
+        migrations.AddConstraint(
+            model_name='locality',
+            constraint=models.UniqueConstraint(condition=models.Q(('district__isnull', True)), fields=('region', 'name', 'postal_code'), name='django_address_locality_unique_region'),
+        ),
+    ]
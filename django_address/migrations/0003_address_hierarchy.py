@@ -0,0 +1,17 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0002_locality_unique_natural_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='hierarchy',
+            field=models.JSONField(blank=True, default=dict, editable=False, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Hierarchy'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0003_address_hierarchy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='country',
+            name='normalized_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AddField(
+            model_name='district',
+            name='normalized_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AddField(
+            model_name='locality',
+            name='normalized_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AddField(
+            model_name='region',
+            name='normalized_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AddField(
+            model_name='street',
+            name='normalized_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+    ]
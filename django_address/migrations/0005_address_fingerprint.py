@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0004_normalized_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=40, verbose_name='Fingerprint'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0005_address_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='address_hash',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True, verbose_name='Address hash'),
+        ),
+    ]
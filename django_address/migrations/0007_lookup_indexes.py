@@ -0,0 +1,64 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0006_address_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='country',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AlterField(
+            model_name='district',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AlterField(
+            model_name='locality',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AlterField(
+            model_name='region',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AlterField(
+            model_name='street',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=256, verbose_name='Normalized name'),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['route'], name='django_address_address_route'),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['formatted_address'], name='django_address_address_fmt'),
+        ),
+        migrations.AddIndex(
+            model_name='country',
+            index=models.Index(fields=['normalized_name', 'code'], name='django_address_country_lookup'),
+        ),
+        migrations.AddIndex(
+            model_name='district',
+            index=models.Index(fields=['region', 'normalized_name', 'code'], name='django_address_district_lookup'),
+        ),
+        migrations.AddIndex(
+            model_name='locality',
+            index=models.Index(fields=['region', 'normalized_name', 'postal_code'], name='django_address_locality_lookup'),
+        ),
+        migrations.AddIndex(
+            model_name='region',
+            index=models.Index(fields=['country', 'normalized_name', 'code'], name='django_address_region_lookup'),
+        ),
+        migrations.AddIndex(
+            model_name='street',
+            index=models.Index(fields=['locality', 'normalized_name'], name='django_address_street_lookup'),
+        ),
+    ]
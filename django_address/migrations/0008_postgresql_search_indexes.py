@@ -0,0 +1,48 @@
+from django.db import migrations
+
+SEARCH_INDEXES = (
+    ("Address", "route", "django_address_address_route_trgm"),
+    ("Address", "formatted_address", "django_address_address_fmt_trgm"),
+    ("Locality", "name", "django_address_locality_name_trgm"),
+    ("Street", "name", "django_address_street_name_trgm"),
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    """Adds trigram indexes serving admin icontains/istartswith search, PostgreSQL only.
+
+    Django compares UPPER("column"::text) on PostgreSQL, so the indexed expression is the same.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for model_name, field_name, index_name in SEARCH_INDEXES:
+        model = apps.get_model("django_address", model_name)
+        if model._meta.swapped:
+            continue
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)".format(
+                index=quote(index_name),
+                table=quote(model._meta.db_table),
+                column=quote(model._meta.get_field(field_name).column),
+            )
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _, _, index_name in SEARCH_INDEXES:
+        schema_editor.execute("DROP INDEX IF EXISTS {index}".format(index=schema_editor.quote_name(index_name)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0007_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
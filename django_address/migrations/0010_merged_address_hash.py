@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import swapper
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0009_address_geohash'),
+        swapper.dependency('django_address', 'Address'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MergedAddressHash',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address_hash', models.CharField(max_length=64, unique=True, verbose_name='Address hash')),
+                ('address', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='merged_hashes', to=swapper.get_model_name('django_address', 'Address'), verbose_name='Address')),
+            ],
+            options={
+                'verbose_name': 'Merged address hash',
+                'verbose_name_plural': 'Merged address hashes',
+            },
+        ),
+    ]
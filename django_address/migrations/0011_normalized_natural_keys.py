@@ -0,0 +1,76 @@
+from django.db import migrations, models
+
+from django_address.hierarchy import merge_duplicates
+from django_address.normalization import refresh_normalized_names
+
+NATURAL_KEYS = (
+    ("Country", ("normalized_name",)),
+    ("Region", ("normalized_name", "country")),
+    ("District", ("normalized_name", "region")),
+    ("Locality", ("region", "district", "normalized_name", "postal_code")),
+    ("Street", ("locality", "normalized_name")),
+)
+
+
+def merge_normalized_duplicates(apps, schema_editor):
+    """Fills missing normalized names and merges rows sharing the normalized natural key, parents first.
+
+    Fingerprints of addresses are cleared after a merge, dedupe_addresses recomputes them.
+    """
+    merged = 0
+    for model_name, key_fields in NATURAL_KEYS:
+        model = apps.get_model("django_address", model_name)
+        if not model._meta.swapped:
+            refresh_normalized_names(model._base_manager.filter(normalized_name=""))
+            merged += merge_duplicates(model, key_fields)
+    address_model = apps.get_model("django_address", "Address")
+    if merged and not address_model._meta.swapped:
+        address_model._base_manager.update(fingerprint="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_address', '0010_merged_address_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_normalized_duplicates, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='locality',
+            name='django_address_locality_unique_district',
+        ),
+        migrations.RemoveConstraint(
+            model_name='locality',
+            name='django_address_locality_unique_region',
+        ),
+        migrations.AlterField(
+            model_name='country',
+            name='name',
+            field=models.CharField(max_length=50, verbose_name='Name'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='district',
+            unique_together={('normalized_name', 'region')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='region',
+            unique_together={('normalized_name', 'country')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='street',
+            unique_together={('locality', 'normalized_name')},
+        ),
+        migrations.AddConstraint(
+            model_name='country',
+            constraint=models.UniqueConstraint(fields=('normalized_name',), name='django_address_country_unique_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='locality',
+            constraint=models.UniqueConstraint(condition=models.Q(('district__isnull', False)), fields=('region', 'district', 'normalized_name', 'postal_code'), name='django_address_locality_unique_district'),
+        ),
+        migrations.AddConstraint(
+            model_name='locality',
+            constraint=models.UniqueConstraint(condition=models.Q(('district__isnull', True)), fields=('region', 'normalized_name', 'postal_code'), name='django_address_locality_unique_region'),
+        ),
+    ]
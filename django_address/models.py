@@ -1,5 +1,7 @@
+import hashlib
 import json
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.forms.models import model_to_dict
 from django.utils.text import slugify
@@ -7,6 +9,26 @@ from django.utils.translation import gettext_lazy as _
 
 import swapper
 
+from django_address.geo import encode_geohash
+from django_address.managers import AddressManager
+from django_address.normalization import address_fingerprint, address_hash, get_normalizer, normalize
+
+
+def _pk_value(pk):
+    return None if pk is None else str(pk)
+
+
+def _snapshot_pk(hierarchy, level):
+    return _pk_value(hierarchy.get(level, {}).get("id"))
+
+
+def snapshot_is_current(hierarchy, locality_id, street_id):
+    """Returns whether hierarchy snapshot is not empty and of the locality and street an address points to."""
+    return bool(hierarchy) and (
+        _snapshot_pk(hierarchy, "locality") == _pk_value(locality_id)
+        and _snapshot_pk(hierarchy, "street") == _pk_value(street_id)
+    )
+
 
 class GetOrNoneManager(models.Manager):
     """Adds get_or_none method to objects."""
@@ -18,10 +40,29 @@ class GetOrNoneManager(models.Manager):
             return None
 
 
-class AbstractCountryModel(models.Model):
+class NormalizedNameModel(models.Model):
+    """Keeps indexed normalized_name of the name, hierarchy levels are matched on it."""
+
+    normalized_name = models.CharField(_("Normalized name"), max_length=256, blank=True, default="", editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.fill_derived_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "normalized_name"}
+        super().save(*args, **kwargs)
+
+    def fill_derived_fields(self):
+        self.normalized_name = normalize(type(self), self.name)
+
+
+class AbstractCountryModel(NormalizedNameModel):
     """Abstract country model."""
 
-    name = models.CharField(_("Name"), max_length=50, unique=True)
+    name = models.CharField(_("Name"), max_length=50)
     code = models.CharField(_("Code"), max_length=2, blank=True, default="")
 
     objects = GetOrNoneManager()
@@ -29,6 +70,9 @@ class AbstractCountryModel(models.Model):
     class Meta:
         abstract = True
         ordering = ("name",)
+        constraints = [
+            models.UniqueConstraint(fields=("normalized_name",), name="%(app_label)s_%(class)s_unique_name"),
+        ]
         verbose_name = _("Country")
         verbose_name_plural = _("Countries")
 
@@ -39,7 +83,7 @@ class AbstractCountryModel(models.Model):
         return model_to_dict(self, fields=[field.name for field in self._meta.fields])
 
 
-class AbstractAdministrativeAreaLevel1Model(models.Model):
+class AbstractAdministrativeAreaLevel1Model(NormalizedNameModel):
     """Abstract administrative area level 1 model (example: State or Region)."""
 
     name = models.CharField(_("Name"), max_length=150)
@@ -53,7 +97,7 @@ class AbstractAdministrativeAreaLevel1Model(models.Model):
     class Meta:
         abstract = True
         ordering = ("country", "name")
-        unique_together = (("name", "country"),)
+        unique_together = (("normalized_name", "country"),)
 
     def __str__(self):
         country = "{country}".format(country=self.country)
@@ -66,7 +110,7 @@ class AbstractAdministrativeAreaLevel1Model(models.Model):
         return model_to_dict(self, fields=[field.name for field in self._meta.fields])
 
 
-class AbstractAdministrativeAreaLevel2Model(models.Model):
+class AbstractAdministrativeAreaLevel2Model(NormalizedNameModel):
     """Abstract administrative area level 2 model."""
 
     name = models.CharField(_("Name"), max_length=150)
@@ -96,7 +140,7 @@ class AbstractAdministrativeAreaLevel2Model(models.Model):
         return model_to_dict(self, fields=[field.name for field in self._meta.fields])
 
 
-class AbstractLocalityModel(models.Model):
+class AbstractLocalityModel(NormalizedNameModel):
     """Abstract locality model."""
 
     name = models.CharField(_("Name"), max_length=100)
@@ -121,7 +165,7 @@ class AbstractLocalityModel(models.Model):
         return model_to_dict(self, fields=[field.name for field in self._meta.fields])
 
 
-class AbstractStreetModel(models.Model):
+class AbstractStreetModel(NormalizedNameModel):
     """Abstract street model."""
 
     locality = models.ForeignKey(
@@ -134,7 +178,7 @@ class AbstractStreetModel(models.Model):
     class Meta:
         abstract = True
         ordering = ("name",)
-        unique_together = (("locality", "name"),)
+        unique_together = (("locality", "normalized_name"),)
         verbose_name = _("Street")
         verbose_name_plural = _("Streets")
 
@@ -167,8 +211,26 @@ class AbstractAddressModel(models.Model):
     latitude = models.FloatField(_("Latitude"), blank=True, default=0)
     longitude = models.FloatField(_("Longitude"), blank=True, default=0)
     apartment = models.CharField(_("Apartment"), max_length=10, blank=True, default="")
-
-    objects = GetOrNoneManager()
+    hierarchy = models.JSONField(_("Hierarchy"), default=dict, blank=True, editable=False, encoder=DjangoJSONEncoder)
+    fingerprint = models.CharField(
+        _("Fingerprint"), max_length=40, blank=True, default="", editable=False, db_index=True
+    )
+    address_hash = models.CharField(_("Address hash"), max_length=64, null=True, unique=True, editable=False)
+    geohash = models.CharField(_("Geohash"), max_length=12, blank=True, default="", editable=False, db_index=True)
+
+    objects = AddressManager()
+
+    HASH_FIELDS = (
+        "locality",
+        "street",
+        "raw",
+        "route",
+        "street_number",
+        "formatted_address",
+        "latitude",
+        "longitude",
+        "apartment",
+    )
 
     class Meta:
         abstract = True
@@ -179,8 +241,15 @@ class AbstractAddressModel(models.Model):
         if self.formatted_address:
             return self.formatted_address
 
-        locality = "{locality}".format(locality=self.locality)
-        route = self.street.name if self.street else self.route
+        hierarchy = self.current_hierarchy()
+        if self.locality_id and "locality_label" in hierarchy:
+            locality = hierarchy["locality_label"]
+        else:
+            locality = "{locality}".format(locality=self.locality)
+        if self.street_id and "street" in hierarchy:
+            route = hierarchy["street"]["name"]
+        else:
+            route = self.street.name if self.street else self.route
         address = "{route}{street_number}{apartment}".format(
             route=route,
             street_number=", {street_number}".format(street_number=self.street_number) if self.street_number else "",
@@ -193,20 +262,93 @@ class AbstractAddressModel(models.Model):
 
         return self.raw
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._hashed_values = self.hash_values()
+
     def save(self, *args, **kwargs):
+        changed = self.hash_fields_changed()
+        if changed:
+            self.address_hash = None
+        self.fill_derived_fields()
+        if changed or self._state.adding:
+            self.release_taken_hash()
+        return super().save(*args, **kwargs)
+
+    def release_taken_hash(self):
+        """Clears address_hash when another address has the same values, the service resolves them to that one."""
+        if type(self)._default_manager.filter(address_hash=self.address_hash).exclude(pk=self.pk).exists():
+            self.address_hash = None
+
+    def hash_values(self):
+        """Returns {attname: value} of HASH_FIELDS, deferred fields are left out."""
+        attnames = (self._meta.get_field(name).attname for name in self.HASH_FIELDS)
+        return {attname: self.__dict__[attname] for attname in attnames if attname in self.__dict__}
+
+    def hash_fields_changed(self):
+        """Returns whether HASH_FIELDS differ from the values the address was loaded with or derived from."""
+        current = self.hash_values()
+        return any(current.get(attname, value) != value for attname, value in self._hashed_values.items())
+
+    def fill_derived_fields(self):
+        """Computes values stored along with the address, service bulk inserts call it instead of save()."""
+        if not self.address_hash:
+            self.address_hash = self.build_address_hash()
         if not self.route and self.street:
             self.route = str(self.street)
         if not self.locality and self.street:
             self.locality = self.street.locality
+        self.hierarchy = self.build_hierarchy()
+        self.fingerprint = self.build_fingerprint()
+        self.geohash = self.build_geohash()
         if not self.formatted_address:
             self.formatted_address = str(self)
-        return super().save(*args, **kwargs)
+        self._hashed_values = self.hash_values()
+
+    def build_address_hash(self):
+        """Returns hash of HASH_FIELDS values the address is created from, the service looks addresses up by it."""
+        fields = [self._meta.get_field(name) for name in self.HASH_FIELDS]
+        return address_hash([field.to_python(getattr(self, field.attname)) for field in fields])
+
+    def build_geohash(self):
+        """Returns geohash of coordinates, empty for addresses without them (0, 0)."""
+        if not self.latitude and not self.longitude:
+            return ""
+        return encode_geohash(float(self.latitude), float(self.longitude))
+
+    def build_fingerprint(self):
+        """Returns hash of the physical address (locality, street, number and apartment), raw input is ignored."""
+        street = self.street_id or get_normalizer()(self.route)
+        return address_fingerprint(self.locality_id, street, self.street_number, self.apartment)
+
+    def current_hierarchy(self):
+        """Returns hierarchy snapshot, rebuilt from related models when empty or not of current locality and street."""
+        if snapshot_is_current(self.hierarchy, self.locality_id, self.street_id):
+            return self.hierarchy
+        return self.build_hierarchy()
+
+    def build_hierarchy(self):
+        """Returns denormalized snapshot of related models, to_dict() and __str__() read it without queries."""
+        locality = self.locality
+        region = getattr(locality, "region", None)
+        levels = {
+            "country": getattr(region, "country", None),
+            "region": region,
+            "district": getattr(locality, "district", None),
+            "locality": locality,
+            "street": self.street,
+        }
+        hierarchy = {name: instance.to_dict() for name, instance in levels.items() if instance is not None}
+        if locality is not None:
+            hierarchy["locality_label"] = str(locality)
+        return hierarchy
 
     def to_dict(self):
+        hierarchy = self.current_hierarchy()
         return {
             "raw": self.raw,
-            "locality": self.locality.to_dict() if self.locality else "",
-            "street": self.street.to_dict() if self.street else "",
+            "locality": hierarchy.get("locality", ""),
+            "street": hierarchy.get("street", ""),
             "route": self.route,
             "street_number": self.street_number,
             "latitude": self.latitude,
@@ -223,6 +365,7 @@ class Country(AbstractCountryModel):
 
     class Meta(AbstractCountryModel.Meta):
         swappable = swapper.swappable_setting("django_address", "Country")
+        indexes = [models.Index(fields=("normalized_name", "code"), name="django_address_country_lookup")]
 
 
 class Region(AbstractAdministrativeAreaLevel1Model):
@@ -235,6 +378,7 @@ class Region(AbstractAdministrativeAreaLevel1Model):
 
     class Meta(AbstractAdministrativeAreaLevel1Model.Meta):
         swappable = swapper.swappable_setting("django_address", "Region")
+        indexes = [models.Index(fields=("country", "normalized_name", "code"), name="django_address_region_lookup")]
         verbose_name = _("Region")
         verbose_name_plural = _("Regions")
 
@@ -252,7 +396,8 @@ class District(AbstractAdministrativeAreaLevel2Model):
     class Meta(AbstractAdministrativeAreaLevel2Model.Meta):
         swappable = swapper.swappable_setting("django_address", "District")
         ordering = ("region", "name")
-        unique_together = (("name", "region"),)
+        unique_together = (("normalized_name", "region"),)
+        indexes = [models.Index(fields=("region", "normalized_name", "code"), name="django_address_district_lookup")]
         verbose_name = _("District")
         verbose_name_plural = _("Districts")
 
@@ -280,12 +425,44 @@ class Locality(AbstractLocalityModel):
     class Meta(AbstractLocalityModel.Meta):
         swappable = swapper.swappable_setting("django_address", "Locality")
         ordering = ("region", "district", "name")
+        indexes = [
+            models.Index(fields=("region", "normalized_name", "postal_code"), name="django_address_locality_lookup")
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=("region", "district", "normalized_name", "postal_code"),
+                condition=models.Q(district__isnull=False),
+                name="django_address_locality_unique_district",
+            ),
+            models.UniqueConstraint(
+                fields=("region", "normalized_name", "postal_code"),
+                condition=models.Q(district__isnull=True),
+                name="django_address_locality_unique_region",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = self.build_slug()
         super().save(*args, **kwargs)
 
+    def base_slug(self):
+        return slugify(self.name)[: self._meta.get_field("slug").max_length]
+
+    def keyed_slug(self):
+        """Returns base slug suffixed by a hash of the natural key, unique as the natural key is."""
+        key = "|".join(str(value) for value in (self.region_id, self.district_id, self.name, self.postal_code))
+        suffix = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+        max_length = self._meta.get_field("slug").max_length
+        return "{slug}-{suffix}".format(slug=self.base_slug()[: max_length - len(suffix) - 1], suffix=suffix)
+
+    def build_slug(self):
+        """Returns base slug, or keyed slug when another locality (e.g. of another region) has the base one."""
+        slug = self.base_slug()
+        if type(self)._default_manager.filter(slug=slug).exclude(pk=self.pk).exists():
+            return self.keyed_slug()
+        return slug
+
 
 class Street(AbstractStreetModel):
     """Street model."""
@@ -297,6 +474,7 @@ class Street(AbstractStreetModel):
 
     class Meta(AbstractStreetModel.Meta):
         swappable = swapper.swappable_setting("django_address", "Street")
+        indexes = [models.Index(fields=("locality", "normalized_name"), name="django_address_street_lookup")]
 
 
 class Address(AbstractAddressModel):
@@ -319,12 +497,17 @@ class Address(AbstractAddressModel):
 
     class Meta(AbstractAddressModel.Meta):
         swappable = swapper.swappable_setting("django_address", "Address")
+        indexes = [
+            models.Index(fields=("route",), name="django_address_address_route"),
+            models.Index(fields=("formatted_address",), name="django_address_address_fmt"),
+        ]
 
     def to_dict(self):
+        hierarchy = self.current_hierarchy()
         address = {
             "raw": self.raw,
-            "locality": self.locality.to_dict() if self.locality else "",
-            "street": self.street.to_dict() if self.street else "",
+            "locality": hierarchy.get("locality", ""),
+            "street": hierarchy.get("street", ""),
             "route": self.route,
             "street_number": self.street_number,
             "latitude": self.latitude,
@@ -332,13 +515,26 @@ class Address(AbstractAddressModel):
             "formatted_address": self.formatted_address,
         }
 
-        district = self.locality.district if self.locality else None
-        region = self.locality.region if self.locality else None
-        country = region.country if region else None
-        if country:
-            address.update({"country": country.to_dict()})
-        if region:
-            address.update({"region": region.to_dict()})
-        if district:
-            address.update({"district": district.to_dict()})
+        for level in ("country", "region", "district"):
+            if level in hierarchy:
+                address.update({level: hierarchy[level]})
         return address
+
+
+class MergedAddressHash(models.Model):
+    """address_hash of a duplicate merged by dedupe_addresses, the service resolves it to the kept address."""
+
+    address_hash = models.CharField(_("Address hash"), max_length=64, unique=True)
+    address = models.ForeignKey(
+        to=swapper.get_model_name("django_address", "Address"),
+        on_delete=models.CASCADE,
+        verbose_name=_("Address"),
+        related_name="merged_hashes",
+    )
+
+    class Meta:
+        verbose_name = _("Merged address hash")
+        verbose_name_plural = _("Merged address hashes")
+
+    def __str__(self):
+        return self.address_hash
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import unicodedata
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from django_address.batches import update_in_batches
+
+DEFAULT_NORMALIZER = "django_address.normalization.normalize_name"
+
+
+def normalize_name(value):
+    """Default normalizer: accents stripped, casefolded and whitespace collapsed ("  Kïev " -> "kiev")."""
+    value = unicodedata.normalize("NFKD", str(value))
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.casefold().split())
+
+
+def address_fingerprint(locality, street, street_number, apartment):
+    """Returns sha1 of address parts, numbers and apartments ignore case and whitespace ("15 A" == "15a")."""
+    parts = [str(locality or ""), str(street or "")]
+    parts.extend("".join(str(value).casefold().split()) for value in (street_number, apartment))
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()  # noqa: S303
+
+
+def address_hash(values):
+    """Returns sha256 of JSON encoded values, floats keep their repr so equal coordinates give equal hashes."""
+    return hashlib.sha256(json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _load_normalizer(path):
+    return import_string(path)
+
+
+def get_normalizer():
+    return _load_normalizer(getattr(settings, "DJANGO_ADDRESS_NAME_NORMALIZER", DEFAULT_NORMALIZER))
+
+
+def has_normalized_name(model):
+    return any(field.name == "normalized_name" for field in model._meta.concrete_fields)
+
+
+def normalize(model, value):
+    """Returns normalized_name stored by model for name value."""
+    if not value:
+        return ""
+    return get_normalizer()(value)[: model._meta.get_field("normalized_name").max_length]
+
+
+def refresh_normalized_names(queryset, batch_size=1000):
+    """Recomputes normalized_name of rows in pk ordered batches, returns number of updated rows."""
+
+    def update(row):
+        row.normalized_name = normalize(queryset.model, row.name)
+
+    return update_in_batches(queryset, update, ["normalized_name"], batch_size, fields=("name", "normalized_name"))
@@ -0,0 +1,158 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from django_address.service import AbstractAddress, AddressError, get_service_class
+
+_resolver = None
+_resolver_lock = threading.Lock()
+_STOP = object()
+
+
+class BatchResolver:
+    """Resolves addresses submitted by concurrent threads or tasks together with one bulk_save.
+
+    A background thread takes the first waiting request, collects more for ``window`` seconds
+    or until ``max_batch_size`` are waiting and saves them as one batch. If the batch fails,
+    its addresses are saved one by one so an invalid address fails only its own future.
+    Sizes of resolved batches are counted in power of two buckets (``stats()``).
+    """
+
+    def __init__(self, window=0.005, max_batch_size=500, service_class=None):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.service_class = service_class
+        self.histogram = Counter()
+        self.batches = 0
+        self.resolved = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, values):
+        """Queues dict or service instance, returns concurrent.futures.Future of the address model."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Resolver is shut down.")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="django-address-resolver", daemon=True)
+                self._thread.start()
+            self._queue.put((values, future))
+        return future
+
+    def resolve(self, values, timeout=None):
+        return self.submit(values).result(timeout)
+
+    async def aresolve(self, values):
+        return await asyncio.wrap_future(self.submit(values))
+
+    def shutdown(self, wait=True):
+        """Resolves already queued addresses and stops the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if wait and thread is not None:
+            thread.join()
+
+    def stats(self):
+        """Returns {"batches", "resolved", "histogram": {bucket: batches of size <= bucket}}."""
+        with self._lock:
+            histogram = dict(sorted(self.histogram.items()))
+            return {"batches": self.batches, "resolved": self.resolved, "histogram": histogram}
+
+    def _run(self):
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch, stop = self._collect(item)
+                self._resolve_batch(batch)
+        finally:
+            connections.close_all()
+
+    def _collect(self, item):
+        """Returns (batch started by item, whether shutdown was requested)."""
+        batch = [item]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _resolve_batch(self, batch):
+        batch = [(values, future) for values, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        close_old_connections()
+        self._save_batch(self.service_class or get_service_class(), batch)
+        with self._lock:
+            self.batches += 1
+            self.resolved += len(batch)
+            self.histogram[1 << (len(batch) - 1).bit_length()] += 1
+
+    def _save_batch(self, service_class, batch):
+        """Sets results of batch futures, addresses of a batch failing with AddressError are saved one by one."""
+        try:
+            addresses = service_class.bulk_save([values for values, _ in batch])
+        except AddressError:
+            self._resolve_each(service_class, batch)
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+        else:
+            for (_, future), address in zip(batch, addresses):
+                future.set_result(address)
+
+    def _resolve_each(self, service_class, batch):
+        for values, future in batch:
+            self._resolve_one(service_class, values, future)
+
+    def _resolve_one(self, service_class, values, future):
+        try:
+            item = values if isinstance(values, AbstractAddress) else service_class(**values)
+            future.set_result(item.save())
+        except Exception as error:
+            future.set_exception(error)
+
+
+def get_resolver():
+    """Returns process-wide BatchResolver configured by DJANGO_ADDRESS_RESOLVER_* settings."""
+    global _resolver  # noqa: WPS420
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = BatchResolver(
+                    window=getattr(settings, "DJANGO_ADDRESS_RESOLVER_WINDOW", 0.005),
+                    max_batch_size=getattr(settings, "DJANGO_ADDRESS_RESOLVER_BATCH_SIZE", 500),
+                )
+    return _resolver
+
+
+def reset_resolver():
+    """Shuts the process-wide resolver down, queued addresses are still resolved."""
+    global _resolver  # noqa: WPS420
+    with _resolver_lock:
+        resolver, _resolver = _resolver, None
+    if resolver is not None:
+        resolver.shutdown()
@@ -0,0 +1,110 @@
+import json
+from functools import lru_cache
+
+from django_address.models import snapshot_is_current
+
+ADDRESS_FIELDS = ("raw", "route", "street_number", "latitude", "longitude", "formatted_address")
+
+HIERARCHY_PATHS = (
+    ("locality", "locality"),
+    ("street", "street"),
+    ("country", "locality__region__country"),
+    ("region", "locality__region"),
+    ("district", "locality__district"),
+)
+
+SNAPSHOT_FIELDS = ("hierarchy", "locality", "street")
+
+FORMATS = ("json", "ndjson")
+
+
+class AddressRowSerializer:
+    """Builds Address.to_dict() shaped dicts from values_list() rows.
+
+    Like to_dict(), levels are read from the hierarchy snapshot, the joined hierarchy columns are
+    used when the snapshot is empty or of another locality or street than the address points to.
+    """
+
+    def __init__(self, model):
+        self.paths = list(ADDRESS_FIELDS + SNAPSHOT_FIELDS)
+        self.levels = {}
+        for level, path in HIERARCHY_PATHS:
+            level_model = _related_model(model, path)
+            names = [field.name for field in level_model._meta.concrete_fields if field.editable]
+            start = len(self.paths)
+            self.paths.extend("{path}__{name}".format(path=path, name=name) for name in names)
+            self.levels[level] = (names, start, start + names.index(level_model._meta.pk.name))
+
+    def to_dict(self, row):
+        hierarchy = self._hierarchy(row)
+        address = {
+            "raw": row[0],
+            "locality": hierarchy.get("locality", ""),
+            "street": hierarchy.get("street", ""),
+            "route": row[1],
+            "street_number": row[2],
+            "latitude": row[3],
+            "longitude": row[4],
+            "formatted_address": row[5],
+        }
+        for level in ("country", "region", "district"):
+            if level in hierarchy:
+                address[level] = hierarchy[level]
+        return address
+
+    def iterator(self, queryset, chunk_size=2000):
+        """Yields dicts of queryset addresses without instantiating models."""
+        for row in queryset.values_list(*self.paths).iterator(chunk_size=chunk_size):
+            yield self.to_dict(row)
+
+    def _hierarchy(self, row):
+        snapshot, locality_id, street_id = row[len(ADDRESS_FIELDS) : len(ADDRESS_FIELDS) + len(SNAPSHOT_FIELDS)]
+        if snapshot_is_current(snapshot, locality_id, street_id):
+            return snapshot
+        levels = ((level, self._level(row, level)) for level, _ in HIERARCHY_PATHS)
+        return {level: value for level, value in levels if value is not None}
+
+    def _level(self, row, level):
+        names, start, pk_index = self.levels[level]
+        if row[pk_index] is None:
+            return None
+        return dict(zip(names, row[start : start + len(names)]))
+
+
+@lru_cache(maxsize=None)
+def get_row_serializer(model):
+    return AddressRowSerializer(model)
+
+
+def iter_address_dicts(queryset, chunk_size=2000):
+    """Yields Address.to_dict() of every address of queryset using one streamed query."""
+    return get_row_serializer(queryset.model).iterator(queryset, chunk_size=chunk_size)
+
+
+def serialize_addresses(queryset, fmt="json", chunk_size=2000):
+    """Streams queryset addresses as a JSON array or NDJSON, yields chunks of text.
+
+    Output matches json.dumps() of Address.to_dict(), hierarchy snapshot included, but reads plain rows
+    instead of models.
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Unknown format {fmt}, use one of {formats}.".format(fmt=fmt, formats=", ".join(FORMATS)))
+    rows = iter_address_dicts(queryset, chunk_size=chunk_size)
+    if fmt == "ndjson":
+        return ("{row}\n".format(row=json.dumps(row)) for row in rows)
+    return _json_array(rows)
+
+
+def _json_array(rows):
+    yield "["
+    separator = ""
+    for row in rows:
+        yield separator + json.dumps(row)
+        separator = ", "
+    yield "]"
+
+
+def _related_model(model, path):
+    for name in path.split("__"):
+        model = model._meta.get_field(name).related_model
+    return model
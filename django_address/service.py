@@ -1,11 +1,54 @@
 import abc
-from dataclasses import dataclass
+import asyncio
+import weakref
+from dataclasses import dataclass, fields
 from typing import Union
 from uuid import UUID
 
-from django.db import transaction
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.signals import post_save, pre_save
+from django.utils.module_loading import import_string
+from django.utils.text import slugify
 
 import swapper
+from asgiref.sync import sync_to_async
+
+from django_address.autocomplete import get_autocomplete
+from django_address.cache import get_cache, get_shared_cache
+from django_address.normalization import has_normalized_name, normalize
+
+
+HIERARCHY_LEVELS = ("country", "region", "district", "locality", "street")
+
+ADDRESS_LOOKUP_FIELDS = (
+    "locality",
+    "street",
+    "raw",
+    "route",
+    "street_number",
+    "formatted_address",
+    "latitude",
+    "longitude",
+    "apartment",
+)
+
+LEVEL_CODE_FIELDS = {
+    "country": "country_code",
+    "region": "region_code",
+    "district": "district_code",
+    "locality": "postal_code",
+}
+
+BULK_BATCH_SIZE = 2000
+
+DEFAULT_SERVICE_CLASS = "django_address.service.Address"
+
+MODEL_NAMES = ("Country", "Region", "District", "Locality", "Street", "Address")
+
+_service_class = None
+_models = None
 
 
 class AddressError(Exception):
@@ -33,17 +76,18 @@ class AbstractAddress(metaclass=abc.ABCMeta):
     longitude: float = 0
 
     def __post_init__(self):
-        self.Country = swapper.load_model("django_address", "Country", required=True)
-        self.Region = swapper.load_model("django_address", "Region", required=True)
-        self.District = swapper.load_model("django_address", "District", required=True)
-        self.Locality = swapper.load_model("django_address", "Locality", required=True)
-        self.Street = swapper.load_model("django_address", "Street", required=True)
-        self.Address = swapper.load_model("django_address", "Address", required=True)
+        for name, model in get_models().items():
+            setattr(self, name, model)
 
     @abc.abstractmethod
     def save(self, **kwargs):
         raise NotImplementedError
 
+    @classmethod
+    def bulk_save(cls, addresses):
+        """Saves dicts or service instances one by one, returns address models in input order."""
+        return [(item if isinstance(item, AbstractAddress) else cls(**item)).save() for item in addresses]
+
 
 @dataclass
 class Address(AbstractAddress):
@@ -51,10 +95,14 @@ class Address(AbstractAddress):
     def _get_or_create(cls, model, value, create=True, **kwargs):
         if isinstance(value, (int, UUID)):
             return model.objects.get_or_none(pk=value)
-        obj = None
-        if value:
-            obj = model.objects.filter(name=value, **kwargs).first()
-        return model.objects.create(name=value, **kwargs) if obj is None and create else obj
+        lookup = _name_lookup(model, value, kwargs)
+        obj = _find(model, lookup, kwargs) if value else None
+        if obj is None and create:
+            obj = _insert_or_get(model, lookup)
+            cache = get_cache()
+            if cache:
+                _cache_on_commit(cache, model, _lookup_key(model, lookup), obj)
+        return obj
 
     def get_or_create_country(self, create=True):
         if isinstance(self.country, self.Country):
@@ -67,71 +115,631 @@ class Address(AbstractAddress):
         if isinstance(self.region, self.Region):
             return self.region
         if self.region or self.region_code:
-            with transaction.atomic():
-                if not isinstance(self.country, self.Country) and create:
-                    self.country = self.get_or_create_country()
-                return self._get_or_create(
-                    model=self.Region, value=self.region, create=create, code=self.region_code, country=self.country
-                )
+            if not isinstance(self.country, self.Country) and create:
+                self.country = self.get_or_create_country()
+            return self._get_or_create(
+                model=self.Region, value=self.region, create=create, code=self.region_code, country=self.country
+            )
         return None
 
     def get_or_create_district(self, create=True):
         if isinstance(self.district, self.District):
             return self.district
         if self.district or self.district_code:
-            with transaction.atomic():
-                if not isinstance(self.region, self.Region) and create:
-                    self.region = self.get_or_create_region()
-                return self._get_or_create(
-                    model=self.District, value=self.district, create=create, code=self.district_code, region=self.region
-                )
+            if not isinstance(self.region, self.Region) and create:
+                self.region = self.get_or_create_region()
+            return self._get_or_create(
+                model=self.District, value=self.district, create=create, code=self.district_code, region=self.region
+            )
         return None
 
     def get_or_create_locality(self, create=True):
         if isinstance(self.locality, self.Locality):
             return self.locality
         if self.locality or self.postal_code:
-            with transaction.atomic():
-                if not isinstance(self.region, self.Region) and create:
-                    self.region = self.get_or_create_region()
-                if not isinstance(self.district, self.District) and create:
-                    self.district = self.get_or_create_district()
-                return self._get_or_create(
-                    model=self.Locality,
-                    value=self.locality,
-                    create=create,
-                    postal_code=self.postal_code,
-                    region=self.region,
-                    district=self.district,
-                )
+            if not isinstance(self.region, self.Region) and create:
+                self.region = self.get_or_create_region()
+            if not isinstance(self.district, self.District) and create:
+                self.district = self.get_or_create_district()
+            return self._get_or_create(
+                model=self.Locality,
+                value=self.locality,
+                create=create,
+                postal_code=self.postal_code,
+                region=self.region,
+                district=self.district,
+            )
         return None
 
     def get_or_create_street(self, create=True):
         if isinstance(self.street, self.Street):
             return self.street
         if self.street:
-            with transaction.atomic():
-                if not isinstance(self.locality, self.Locality) and create:
-                    self.locality = self.get_or_create_locality()
-                return self._get_or_create(model=self.Street, value=self.street, create=create, locality=self.locality)
+            if not isinstance(self.locality, self.Locality) and create:
+                self.locality = self.get_or_create_locality()
+            return self._get_or_create(model=self.Street, value=self.street, create=create, locality=self.locality)
         return None
 
     def save(self):
-        """Saves address info to django model."""
+        """Saves address info to django model.
+
+        The whole chain is resolved in one transaction, levels don't open savepoints of their own.
+        """
         with transaction.atomic():
             try:
+                shared_cache_state = self._read_shared_cache([self])
                 self.street = self.get_or_create_street()
-                address, _ = self.Address.objects.get_or_create(
-                    locality=self.street.locality,  # noqa
-                    street=self.street,
-                    raw=self.raw,
-                    route=str(self.street),
-                    street_number=self.street_number,
-                    formatted_address=self.formatted_address,
-                    latitude=self.latitude,
-                    longitude=self.longitude,
-                    apartment=self.apartment,
-                )
-                return address
+                self._write_shared_cache(shared_cache_state)
+                lookup = self.address_lookup()
+                address = self.Address.objects.filter(address_hash=lookup["address_hash"]).first()
+                return address or _merged_address(lookup["address_hash"]) or _insert_or_get(self.Address, lookup)
+            except AddressError:
+                raise
+            except Exception as error:
+                raise AddressError from error
+
+    @classmethod
+    def bulk_save(cls, addresses):
+        """Saves many addresses resolving every hierarchy level with batched queries.
+
+        Accepts dicts or service instances and returns address models in input order.
+        """
+        items = [item if isinstance(item, AbstractAddress) else cls(**item) for item in addresses]
+        if not items:
+            return []
+        with transaction.atomic():
+            try:
+                shared_cache_state = cls._read_shared_cache(items)
+                required = [item.required_levels() for item in items]
+                for level in HIERARCHY_LEVELS:
+                    cls._bulk_resolve_level(
+                        [item for item, levels in zip(items, required) if level in levels],
+                        level,
+                        getattr(items[0], level.capitalize()),
+                    )
+                cls._write_shared_cache(shared_cache_state)
+                return cls._bulk_get_or_create_addresses(items)
+            except AddressError:
+                raise
             except Exception as error:
                 raise AddressError from error
+
+    def required_levels(self):
+        """Returns hierarchy levels which save() would resolve for this address."""
+        levels = {"street"}
+        parents = (
+            ("street", ("locality",), ()),
+            ("locality", ("region", "district"), ("postal_code",)),
+            ("district", ("region",), ("district_code",)),
+            ("region", ("country",), ("region_code",)),
+        )
+        for level, level_parents, extra in parents:
+            value = getattr(self, level)
+            if level not in levels or isinstance(value, getattr(self, level.capitalize())):
+                continue
+            if value or any(getattr(self, name) for name in extra):
+                levels.update(level_parents)
+        return levels
+
+    def shared_cache_entries(self):
+        """Returns {natural key chain: models guarding the entry} of levels save() looks up by name."""
+        required = self.required_levels()
+        entries = {}
+        chain = ()
+        guards = ()
+        for level in HIERARCHY_LEVELS:
+            value = getattr(self, level)
+            guards += (getattr(self, level.capitalize()),)
+            if isinstance(value, models.Model):
+                chain += ((level, "pk", value.pk),)
+                continue
+            code = getattr(self, LEVEL_CODE_FIELDS[level]) if level in LEVEL_CODE_FIELDS else ""
+            if isinstance(value, str) and has_normalized_name(guards[-1]):
+                value = normalize(guards[-1], value)
+            chain += ((level, value, code),)
+            if level in required and not isinstance(value, (int, UUID)) and self.level_lookup(level) is not None:
+                entries[chain] = guards
+        return entries
+
+    @classmethod
+    def _read_shared_cache(cls, items):
+        """Takes hierarchy instances of items from the shared cache, one round trip for all of them."""
+        shared = get_shared_cache()
+        if shared is None:
+            return None
+        item_entries = [(item, item.shared_cache_entries()) for item in items]
+        entries = {key: guards for _, keys in item_entries for key, guards in keys.items()}
+        if not entries:
+            return None
+        found, versions = shared.get_many(entries)
+        missing = {}
+        for item, keys in item_entries:
+            for key in keys:
+                level = key[-1][0]
+                if key in found:
+                    setattr(item, level, found[key])
+                else:
+                    missing.setdefault(key, (item, level))
+        return shared, entries, versions, missing
+
+    @classmethod
+    def _write_shared_cache(cls, state):
+        """Stores instances resolved from the database once the transaction is committed."""
+        if state is None:
+            return
+        shared, entries, versions, missing = state
+        instances = {key: getattr(item, level) for key, (item, level) in missing.items()}
+        instances = {key: instance for key, instance in instances.items() if isinstance(instance, models.Model)}
+        if instances:
+            transaction.on_commit(lambda: shared.set_many(entries, instances, versions))
+
+    def level_lookup(self, level):
+        """Returns lookup kwargs (except name) used to find a hierarchy level or None if it is empty."""
+        lookups = {
+            "country": (self.country_code, {"code": self.country_code}),
+            "region": (self.region_code, {"code": self.region_code, "country": self.country}),
+            "district": (self.district_code, {"code": self.district_code, "region": self.region}),
+            "locality": (
+                self.postal_code,
+                {"postal_code": self.postal_code, "region": self.region, "district": self.district},
+            ),
+            "street": ("", {"locality": self.locality}),
+        }
+        extra, lookup = lookups[level]
+        if getattr(self, level) or extra:
+            return lookup
+        return None
+
+    def address_lookup(self):
+        """Returns kwargs of the address model, it is looked up by the address_hash of them."""
+        lookup = {
+            "locality": self.street.locality,  # noqa
+            "street": self.street,
+            "raw": self.raw,
+            "route": str(self.street),
+            "street_number": self.street_number,
+            "formatted_address": self.formatted_address,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "apartment": self.apartment,
+        }
+        lookup["address_hash"] = self.Address(**lookup).build_address_hash()
+        return lookup
+
+    @classmethod
+    def _bulk_resolve_level(cls, items, level, model):
+        pending = [(item, item._pending_level_lookup(level, model)) for item in items]
+        pending = [(item, lookup) for item, lookup in pending if lookup is not False]
+        pks = {getattr(item, level) for item, lookup in pending if lookup is None}
+        by_pk = model.objects.in_bulk(pks) if pks else {}
+        by_key = cls._bulk_get_or_create(model, [lookup for _, lookup in pending if lookup is not None])
+        for item, lookup in pending:
+            if lookup is None:
+                setattr(item, level, by_pk.get(getattr(item, level)))
+            else:
+                setattr(item, level, by_key[_lookup_key(model, lookup)])
+
+    def _pending_level_lookup(self, level, model):
+        """Returns lookup of a level to resolve, None when it is given by pk, False when nothing is to resolve."""
+        value = getattr(self, level)
+        if isinstance(value, model):
+            return False
+        if isinstance(value, (int, UUID)):
+            return None
+        lookup = self.level_lookup(level)
+        if lookup is None:
+            setattr(self, level, None)
+            return False
+        return _name_lookup(model, value, lookup)
+
+    @classmethod
+    def _bulk_get_or_create_addresses(cls, items):
+        streets = [item.street for item in items]
+        if any(street is None for street in streets):
+            raise AddressError("Street is required.")
+
+        model = items[0].Locality
+        localities = {item.locality.pk: item.locality for item in items if isinstance(item.locality, model)}
+        missing = {street.locality_id for street in streets} - set(localities)
+        if missing:
+            localities.update(model.objects.in_bulk(missing))
+        for street in streets:
+            street.locality = localities[street.locality_id]
+
+        model = items[0].Address
+        lookups = [item.address_lookup() for item in items]
+        by_key = cls._bulk_get_or_create(model, lookups)
+        return [by_key[_lookup_key(model, lookup)] for lookup in lookups]
+
+    @classmethod
+    def _bulk_get_or_create(cls, model, lookups):
+        """Returns {natural key: instance} creating missing rows with bulk_create."""
+        unique = {}
+        for lookup in lookups:
+            unique.setdefault(_lookup_key(model, lookup), lookup)
+        cache = get_cache()
+        found = _bulk_find(model, unique, cache)
+        missing = {key: lookup for key, lookup in unique.items() if key not in found}
+        if missing:
+            found.update(_bulk_insert(model, missing, cache))
+        return found
+
+
+@dataclass
+class AsyncAddress(Address):
+    """Address service for async views.
+
+    Django transactions are synchronous and every async ORM call is a thread hop of its own, so
+    the whole save runs in one ``sync_to_async`` hop. Concurrent asave() calls with the same
+    natural key share that hop and get the same address.
+    """
+
+    _inflight = weakref.WeakKeyDictionary()
+
+    async def asave(self):
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        key = self.coalescing_key()
+        task = inflight.get(key)
+        if task is None:
+            task = loop.create_task(sync_to_async(self.save, thread_sensitive=True)())
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def abulk_save(cls, addresses):
+        """bulk_save() in one thread hop, returns address models in input order."""
+        return await sync_to_async(cls.bulk_save, thread_sensitive=True)(addresses)
+
+    def coalescing_key(self):
+        """Returns hashable key of service fields, hierarchy names are compared normalized."""
+        key = []
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, models.Model):
+                value = (value._meta.label, value.pk)
+            elif field.name in HIERARCHY_LEVELS and isinstance(value, str):
+                model = getattr(self, field.name.capitalize())
+                value = normalize(model, value) if has_normalized_name(model) else value
+            key.append(value)
+        return tuple(key)
+
+
+def get_models():
+    """Returns {name: model} of the (swappable) address models, loaded once."""
+    global _models  # noqa: WPS420
+    if _models is None:
+        _models = {name: swapper.load_model("django_address", name, required=True) for name in MODEL_NAMES}
+    return _models
+
+
+def get_service_class():
+    """Returns DJANGO_ADDRESS_SERVICE_CLASS, imported once."""
+    global _service_class  # noqa: WPS420
+    if _service_class is None:
+        _service_class = import_string(getattr(settings, "DJANGO_ADDRESS_SERVICE_CLASS", DEFAULT_SERVICE_CLASS))
+    return _service_class
+
+
+def reset_service_class():
+    global _service_class  # noqa: WPS420
+    _service_class = None
+
+
+def bulk_save(addresses):
+    """Saves addresses in batches with the configured service class."""
+    return get_service_class().bulk_save(addresses)
+
+
+async def abulk_save(addresses):
+    """bulk_save() for async code, runs in one thread hop."""
+    return await sync_to_async(bulk_save, thread_sensitive=True)(addresses)
+
+
+def _name_lookup(model, value, lookup):
+    """Returns lookup kwargs of a hierarchy level, matched on normalized_name when the model has it."""
+    lookup = dict(name=value, **lookup)
+    if has_normalized_name(model):
+        lookup["normalized_name"] = normalize(model, value)
+    return lookup
+
+
+def _lookup_filter(lookup):
+    """Returns Q of lookup kwargs, rows without normalized_name (not backfilled yet) match by exact name."""
+    if "address_hash" in lookup:
+        return models.Q(address_hash=lookup["address_hash"])
+    lookup = dict(lookup)
+    if "normalized_name" not in lookup:
+        return models.Q(**lookup)
+    normalized_name = lookup.pop("normalized_name")
+    name = lookup.pop("name")
+    by_name = models.Q(normalized_name=normalized_name) | models.Q(normalized_name="", name=name)
+    return models.Q(**lookup) & by_name
+
+
+def _set_related(obj, lookup):
+    """Reuses instances of lookup as related objects of obj, saving a query on their access."""
+    for name, value in lookup.items():
+        if isinstance(value, models.Model):
+            setattr(obj, name, value)
+
+
+def _find(model, lookup, related):
+    """Returns row of lookup from the cache or the database, rows read from the database are cached on commit."""
+    cache = get_cache()
+    key = _lookup_key(model, lookup) if cache else None
+    obj = cache.get(model, key) if cache else None
+    if obj is not None:
+        return obj
+    obj = model.objects.filter(_lookup_filter(lookup)).order_by("pk").first()
+    if obj is not None:
+        _set_related(obj, related)
+        if cache:
+            _cache_on_commit(cache, model, key, obj)
+    return obj
+
+
+def _cache_on_commit(cache, model, key, obj):
+    """Caches instance once the transaction is committed.
+
+    A row read inside a transaction may have been created by it, a rolled back pk must not be reused.
+    """
+    transaction.on_commit(lambda: cache.set(model, key, obj))
+
+
+def _key_value(field, value):
+    if field.is_relation:
+        return value.pk if isinstance(value, models.Model) else value
+    return field.to_python(value)
+
+
+def _key_names(lookup):
+    if "address_hash" in lookup:
+        return ["address_hash"]
+    return sorted(name for name in lookup if not (name == "name" and "normalized_name" in lookup))
+
+
+def _lookup_key(model, lookup):
+    """Returns hashable natural key of lookup kwargs.
+
+    Name is replaced by normalized_name and address fields by address_hash when present.
+    """
+    names = _key_names(lookup)
+    return tuple((name, _key_value(model._meta.get_field(name), lookup[name])) for name in names)
+
+
+def _row_value(obj, name):
+    if name == "normalized_name":
+        return obj.normalized_name or normalize(type(obj), obj.name)
+    return getattr(obj, obj._meta.get_field(name).attname)
+
+
+def _row_key(obj, names):
+    return tuple((name, _row_value(obj, name)) for name in names)
+
+
+def _object_lookup(obj, lookup):
+    return {name: getattr(obj, name) for name in lookup}
+
+
+def _bulk_filter(model, lookups):
+    """Finds existing rows for lookups, one IN query per chunk of natural keys.
+
+    Only names, hashes and relations of the keys are sent to the database, remaining fields are matched in python.
+    """
+    if not lookups:
+        return {}
+    names = [name for name, _ in next(iter(lookups))]
+    filter_fields = [
+        model._meta.get_field(name)
+        for name in names
+        if name in {"name", "normalized_name", "address_hash"} or model._meta.get_field(name).is_relation
+    ]
+    params_per_key = len(filter_fields) + int("normalized_name" in names)
+    max_params = connection.features.max_query_params
+    chunk_size = max_params // params_per_key if max_params else BULK_BATCH_SIZE
+    keys = list(lookups)
+    found = {}
+    for start in range(0, len(keys), chunk_size):
+        chunk = set(keys[start : start + chunk_size])
+        queryset = model.objects.filter(_in_filter(filter_fields, chunk, names, lookups)).order_by("pk")
+        for obj in queryset:
+            key = _row_key(obj, names)
+            if key in chunk and key not in found:
+                _set_related(obj, lookups[key])
+                found[key] = obj
+    return found
+
+
+def _bulk_find(model, lookups, cache):
+    """Returns {natural key: instance} of lookups found in the cache or in the database.
+
+    Addresses are also found by hashes of duplicates merged into them.
+    """
+    cached = {}
+    if cache:
+        cached = {key: cache.get(model, key) for key in lookups}
+        cached = {key: obj for key, obj in cached.items() if obj is not None}
+    found = _bulk_filter(model, {key: lookup for key, lookup in lookups.items() if key not in cached})
+    missing = {key: lookup for key, lookup in lookups.items() if key not in cached and key not in found}
+    found.update(_bulk_merged(model, missing))
+    if cache:
+        for key, obj in found.items():
+            _cache_on_commit(cache, model, key, obj)
+    found.update(cached)
+    return found
+
+
+def _merged_address(address_hash):
+    """Returns address a duplicate with address_hash was merged into, None if there was no such duplicate."""
+    merged = apps.get_model("django_address", "MergedAddressHash")
+    row = merged.objects.filter(address_hash=address_hash).select_related("address").first()
+    return row.address if row is not None else None
+
+
+def _bulk_merged(model, lookups):
+    """Returns {natural key: address} of address lookups which hash belongs to a merged duplicate."""
+    hashes = {lookup["address_hash"]: key for key, lookup in lookups.items() if "address_hash" in lookup}
+    if not hashes:
+        return {}
+    merged = apps.get_model("django_address", "MergedAddressHash")
+    rows = merged.objects.filter(address_hash__in=hashes).select_related("address")
+    return {hashes[row.address_hash]: row.address for row in rows}
+
+
+def _bulk_insert(model, lookups, cache):
+    """Creates rows of lookups with bulk_create, rows inserted concurrently are fetched instead."""
+    created = {key: model(**lookup) for key, lookup in lookups.items()}
+    for obj in created.values():
+        _prepare_for_insert(obj)
+    model.objects.bulk_create(
+        created.values(), batch_size=BULK_BATCH_SIZE, ignore_conflicts=connection.features.supports_ignore_conflicts,
+    )
+    saved = {key: obj for key, obj in created.items() if obj.pk is not None}
+    refetch = {key: _object_lookup(obj, lookups[key]) for key, obj in created.items() if obj.pk is None}
+    if refetch:
+        by_final_key = _bulk_filter(model, {_lookup_key(model, lookup): lookup for lookup in refetch.values()})
+        for key, lookup in refetch.items():
+            saved[key] = by_final_key.get(_lookup_key(model, lookup)) or _raise_conflict(model, lookup)
+    if cache:
+        for key, obj in saved.items():
+            _cache_on_commit(cache, model, key, obj)
+    # bulk_create() sends no post_save, the signal handler of single inserts is mirrored here
+    get_autocomplete().invalidate_instances(model, saved.values())
+    return saved
+
+
+def _in_filter(fields, keys, names, lookups):
+    condition = models.Q()
+    for field in fields:
+        index = names.index(field.name)
+        values = {key[index][1] for key in keys}
+        field_condition = models.Q(**{"{name}__in".format(name=field.attname): values - {None}})
+        if None in values:
+            field_condition |= models.Q(**{"{name}__isnull".format(name=field.attname): True})
+        if field.name == "normalized_name":
+            field_condition |= models.Q(normalized_name="", name__in={lookups[key]["name"] for key in keys})
+        condition &= field_condition
+    return condition
+
+
+def _insert_or_get(model, lookup):
+    """Creates row of lookup or returns the row inserted concurrently without raising IntegrityError.
+
+    PostgreSQL and SQLite resolve it with INSERT ... ON CONFLICT (natural key) DO NOTHING RETURNING,
+    so no savepoint is needed, backends supporting ignored conflicts use INSERT IGNORE and other
+    backends fall back to a savepoint around a plain INSERT. A conflicting row not matching lookup
+    (another unique field) raises AddressError. Model save() is not called.
+    """
+    obj = model(**lookup)
+    _prepare_for_insert(obj)
+    pre_save.send(sender=model, instance=obj, raw=False, using=connection.alias, update_fields=None)
+    if connection.vendor in {"postgresql", "sqlite"} and connection.features.can_return_columns_from_insert:
+        obj.pk = _insert_returning_pk(obj)
+    elif connection.features.supports_ignore_conflicts:
+        model.objects.bulk_create([obj], ignore_conflicts=True)
+        obj.pk = None
+    else:
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([obj])
+        except IntegrityError:
+            obj.pk = None
+    if obj.pk is None:
+        return model.objects.filter(_lookup_filter(lookup)).order_by("pk").first() or _raise_conflict(model, lookup)
+    obj._state.adding = False
+    obj._state.db = connection.alias
+    post_save.send(sender=model, instance=obj, created=True, raw=False, using=connection.alias, update_fields=None)
+    return obj
+
+
+def _raise_conflict(model, lookup):
+    raise AddressError(
+        "{model} {lookup} conflicts with an existing row on another unique field.".format(
+            model=model.__name__, lookup={name: str(value) for name, value in lookup.items()}
+        )
+    )
+
+
+def _insert_returning_pk(obj):
+    """Runs INSERT ... ON CONFLICT (natural key) DO NOTHING RETURNING pk, returns None if the natural key exists.
+
+    Violations of other unique constraints are raised as IntegrityError.
+    """
+    meta = obj._meta
+    fields = [field for field in meta.concrete_fields if not (field.primary_key and obj.pk is None)]
+    sql = "INSERT INTO {table} ({columns}) VALUES ({values}) ON CONFLICT {target}DO NOTHING RETURNING {pk}".format(
+        table=connection.ops.quote_name(meta.db_table),
+        columns=", ".join(connection.ops.quote_name(field.column) for field in fields),
+        values=", ".join(["%s"] * len(fields)),
+        target=_conflict_target(obj),
+        pk=connection.ops.quote_name(meta.pk.column),
+    )
+    params = [field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return meta.pk.to_python(row[0]) if row else None
+
+
+def _unique_sets(meta):
+    """Yields (fields, condition) of unique fields, unique_together and UniqueConstraints of meta."""
+    for field in meta.concrete_fields:
+        if field.unique and not field.primary_key:
+            yield [field], None
+    for names in meta.unique_together:
+        yield [meta.get_field(name) for name in names], None
+    for constraint in meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields and not constraint.expressions:
+            yield [meta.get_field(name) for name in constraint.fields], constraint.condition
+
+
+def _condition_sql(obj, condition):
+    """Returns WHERE of a partial index of "<field>__isnull" conditions, None if obj is not covered by it."""
+    if condition is None:
+        return ""
+    if condition.connector != models.Q.AND or condition.negated:
+        return None
+    predicates = []
+    for child in condition.children:
+        name, _, lookup = child[0].partition("__") if isinstance(child, tuple) else ("", "", "")
+        if lookup != "isnull":
+            return None
+        field = obj._meta.get_field(name)
+        if (getattr(obj, field.attname) is None) != bool(child[1]):
+            return None
+        column = connection.ops.quote_name(field.column)
+        predicates.append("{column} IS {null}".format(column=column, null="NULL" if child[1] else "NOT NULL"))
+    return " WHERE " + " AND ".join(predicates)
+
+
+def _conflict_target(obj):
+    """Returns ON CONFLICT target of the natural key constraint covering obj.
+
+    That is the one on normalized_name (hierarchy levels) or address_hash, the one on name for custom
+    models without normalized_name.
+    """
+    covering = []
+    for unique_fields, condition in _unique_sets(obj._meta):
+        where = _condition_sql(obj, condition)
+        if where is not None:
+            covering.append(({field.name for field in unique_fields}, unique_fields, where))
+    for key in ("normalized_name", "address_hash", "name"):
+        for names, unique_fields, where in covering:
+            if key in names:
+                columns = ", ".join(connection.ops.quote_name(field.column) for field in unique_fields)
+                return "({columns}){where} ".format(columns=columns, where=where)
+    return ""
+
+
+def _prepare_for_insert(obj):
+    """Fills values which model save() computes, inserts made by the service don't call it.
+
+    Localities get the keyed slug, unique as their natural key is, so concurrent inserts of same named
+    localities of different regions can't collide on the slug.
+    """
+    if hasattr(obj, "slug") and not obj.slug:
+        obj.slug = obj.keyed_slug() if hasattr(obj, "keyed_slug") else slugify(obj.name)
+    if hasattr(obj, "fill_derived_fields"):
+        obj.fill_derived_fields()
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+import swapper
+
+from django_address.autocomplete import (
+    AUTOCOMPLETE_LEVELS,
+    autocomplete_level,
+    get_autocomplete,
+    reset_autocomplete,
+)
+from django_address.cache import get_cache, get_shared_cache, reset_cache
+from django_address.hierarchy import refresh_hierarchy, related_addresses
+from django_address.resolver import reset_resolver
+from django_address.service import reset_service_class
+
+HIERARCHY_MODELS = ("Country", "Region", "District", "Locality", "Street")
+# foreign key of autocomplete levels to their nearest scope
+SCOPE_PARENTS = {"locality": "region", "street": "locality"}
+
+
+def invalidate_cached_instance(sender, instance, **kwargs):
+    """Drops cached lookups of a saved or deleted hierarchy instance."""
+    cache = get_cache()
+    if cache is not None:
+        cache.invalidate(sender, instance.pk)
+    shared = get_shared_cache()
+    if shared is not None and not kwargs.get("created"):
+        transaction.on_commit(lambda: shared.invalidate(sender))
+
+
+def remember_snapshot(sender, instance, raw=False, **kwargs):
+    """Keeps serialized state of a changed hierarchy instance to detect renames after save."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).first()
+    instance._django_address_previous = previous.to_dict() if previous is not None else None
+
+
+def refresh_address_snapshots(sender, instance, created=False, raw=False, **kwargs):
+    """Rebuilds hierarchy snapshot of addresses below a renamed hierarchy instance once the transaction commits.
+
+    Renaming a country or region rewrites all of its addresses, set DJANGO_ADDRESS_REFRESH_ON_RENAME = False
+    to skip it and run ``backfill_address_hierarchy --all`` from a scheduled job instead.
+    """
+    previous = instance.__dict__.get("_django_address_previous")
+    if created or raw or previous is None or previous == instance.to_dict():
+        return
+    if getattr(settings, "DJANGO_ADDRESS_REFRESH_ON_RENAME", True):
+        transaction.on_commit(lambda: refresh_hierarchy(related_addresses(instance)))
+
+
+def invalidate_autocomplete(sender, instance, created=False, **kwargs):
+    """Drops autocomplete indexes and results of scopes a saved or deleted locality or street is part of.
+
+    A locality or street moved to another region or locality drops every index of its level.
+    """
+    level = autocomplete_level(sender)
+    previous = None if created else instance.__dict__.get("_django_address_previous")
+    parent = SCOPE_PARENTS[level]
+    if previous is not None and previous.get(parent) != getattr(instance, "{name}_id".format(name=parent)):
+        get_autocomplete().invalidate(level)
+    else:
+        get_autocomplete().invalidate_instances(sender, [instance])
+
+
+def reset_cache_on_setting_changed(setting, **kwargs):
+    if setting.startswith("DJANGO_ADDRESS_CACHE"):
+        reset_cache()
+    if setting.startswith("DJANGO_ADDRESS_AUTOCOMPLETE"):
+        reset_autocomplete()
+    if setting == "DJANGO_ADDRESS_SERVICE_CLASS":
+        reset_service_class()
+    if setting.startswith("DJANGO_ADDRESS_RESOLVER"):
+        reset_resolver()
+
+
+def connect_signals():
+    for model_name in HIERARCHY_MODELS:
+        model = swapper.load_model("django_address", model_name, required=True)
+        post_save.connect(invalidate_cached_instance, sender=model, dispatch_uid="django_address_cache_save")
+        post_delete.connect(invalidate_cached_instance, sender=model, dispatch_uid="django_address_cache_delete")
+        pre_save.connect(remember_snapshot, sender=model, dispatch_uid="django_address_snapshot_pre_save")
+        post_save.connect(refresh_address_snapshots, sender=model, dispatch_uid="django_address_snapshot_save")
+    for level in AUTOCOMPLETE_LEVELS:
+        model = swapper.load_model("django_address", level.capitalize(), required=True)
+        post_save.connect(invalidate_autocomplete, sender=model, dispatch_uid="django_address_autocomplete_save")
+        post_delete.connect(invalidate_autocomplete, sender=model, dispatch_uid="django_address_autocomplete_delete")
+    setting_changed.connect(reset_cache_on_setting_changed, dispatch_uid="django_address_cache_setting")
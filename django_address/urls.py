@@ -0,0 +1,9 @@
+from django.urls import path
+
+from django_address import views
+
+app_name = "django_address"
+
+urlpatterns = [
+    path("autocomplete/<slug:level>/", views.autocomplete, name="autocomplete"),
+]
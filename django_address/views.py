@@ -0,0 +1,39 @@
+from django.core.exceptions import ValidationError
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
+
+import swapper
+
+from django_address.autocomplete import AUTOCOMPLETE_LEVELS, SCOPE_LOOKUPS, get_autocomplete
+
+MAX_LIMIT = 50
+
+
+@require_GET
+def autocomplete(request, level):
+    """Returns {"results": [{"id", "name"}]} of localities or streets which name starts with ``q``.
+
+    Results are scoped by ``country``, ``region`` or (for streets) ``locality`` pks, ``limit``
+    defaults to 10.
+    """
+    if level not in AUTOCOMPLETE_LEVELS:
+        raise Http404("Unknown autocomplete level.")
+    prefix = request.GET.get("q", "")
+    try:
+        limit = min(int(request.GET.get("limit", 10)), MAX_LIMIT)
+        scope = _scope(request, level)
+    except (ValueError, ValidationError):
+        return JsonResponse({"error": "Invalid limit or scope."}, status=400)
+    if not prefix.strip() or limit < 1:
+        return JsonResponse({"results": []})
+    return JsonResponse({"results": get_autocomplete().search(level, prefix, scope=scope, limit=limit)})
+
+
+def _scope(request, level):
+    """Returns {scope lookup: pk} of the level given in the query string."""
+    scope = {}
+    for name in SCOPE_LOOKUPS[level]:
+        if request.GET.get(name):
+            model = swapper.load_model("django_address", name.capitalize(), required=True)
+            scope[name] = model._meta.pk.to_python(request.GET[name])
+    return scope
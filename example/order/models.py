@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from django_address.fields import AddressField
+from django_address.managers import AddressFieldManager
 
 
 class Order(models.Model):
@@ -10,6 +11,8 @@ class Order(models.Model):
     price = models.DecimalField(_("Price"), max_digits=20, decimal_places=2)
     delivery_address = AddressField(verbose_name=_("Delivery address"), on_delete=models.PROTECT, null=True)
 
+    objects = AddressFieldManager()
+
     class Meta:
         verbose_name = _("Order")
         verbose_name_plural = _("orders")
@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+
+set -e
+set -x
+
+pipenv run python benchmarks/suite.py --migrate ${@}
\ No newline at end of file
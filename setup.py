@@ -2,11 +2,12 @@ from setuptools import find_packages, setup
 
 from django_address import __version__ as version
 
-requirements = ["Django>=2.2", "requests", "typing-extensions", "psycopg2-binary", "environs", "structlog", "swapper"]
+requirements = ["Django>=3.1", "requests", "typing-extensions", "psycopg2-binary", "environs", "structlog", "swapper"]
 
 extras_require = {
     "test": ["pytest-cov", "pytest-django", "pytest"],
     "lint": ["flake8", "wemake-python-styleguide", "isort"],
+    "numpy": ["numpy"],
 }
 
 extras_require["dev"] = extras_require["test"] + extras_require["lint"]  # noqa: W504  # noqa: W504
@@ -26,6 +27,7 @@ setup(
     url="https://github.com/onufrienkovi/django-address-app",
     extras_require=extras_require,
     packages=find_packages(exclude=["tests", "docs", "scripts", "example"]),
+    include_package_data=True,
     install_requires=requirements,
     python_requires=">=3.7",
     classifiers=[
@@ -0,0 +1,21 @@
+def make_address(index=1, streets=7, **values):
+    """Returns service kwargs of address number index in Kiev, values override the defaults.
+
+    Addresses share ``streets`` streets named "Street <index % streets>".
+    """
+    street = values.get("street", "Street {number}".format(number=index % streets))
+    address = {
+        "raw": "Khreschatyk st, {index}".format(index=index),
+        "country": "Ukraine",
+        "country_code": "UA",
+        "region": "Kyiv City",
+        "locality": "Kiev",
+        "street": street,
+        "street_number": str(index),
+        "postal_code": "02000",
+        "latitude": 50.4474875,
+        "longitude": 30.524732,
+        "formatted_address": "{street}, {index}".format(street=street, index=index),
+    }
+    address.update(values)
+    return address
@@ -1,7 +1,9 @@
 import json
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from example.order.models import Order
 
@@ -139,3 +141,95 @@ class AddressFieldTestCase(TestCase):
     def test_validate_value_address(self):
         order = Order.objects.create(price="250", delivery_address=self.order1.delivery_address)
         self.assertEqual(order.delivery_address, self.order1.delivery_address)
+
+
+class DeferredAddressTestCase(TestCase):
+    def setUp(self):
+        self.value = {
+            "raw": "Khreschatyk st, 15",
+            "country": "Ukraine",
+            "region": "Kyiv City",
+            "locality": "Kiev",
+            "street": "Khreschatyk street",
+            "street_number": "15",
+            "formatted_address": "Khreschatyk St, 15, Kyiv, Ukraine",
+        }
+
+    def test_assignment_does_not_write(self):
+        with self.assertNumQueries(0):
+            order = Order(price="100", delivery_address=self.value)
+            order.full_clean()
+        self.assertIsNone(order.delivery_address_id)
+        self.assertEqual(Address.objects.count(), 0)
+
+    def test_resolved_on_save(self):
+        order = Order(price="100", delivery_address=self.value)
+        order.save()
+        self.assertIsNotNone(order.delivery_address_id)
+        self.assertEqual(Order.objects.get().delivery_address.raw, self.value["raw"])
+
+    def test_resolved_on_access(self):
+        order = Order(price="100", delivery_address=self.value)
+        self.assertEqual(order.delivery_address.raw, self.value["raw"])
+        self.assertEqual(order.delivery_address_id, order.delivery_address.pk)
+
+    def test_reassignment_drops_pending_value(self):
+        order = Order(price="100", delivery_address=self.value)
+        order.delivery_address = None
+        order.save()
+        self.assertIsNone(order.delivery_address)
+        self.assertEqual(Address.objects.count(), 0)
+
+    def test_invalid_value_raises_on_save(self):
+        order = Order(price="100", delivery_address={})
+        with self.assertRaises(ValidationError):
+            order.save()
+        self.assertEqual(Order.objects.count(), 0)
+
+
+class BulkAddressFieldTestCase(TestCase):
+    def make_value(self, index, locality="Kiev"):
+        return {
+            "raw": "{locality} st, {index}".format(locality=locality, index=index),
+            "country": "Ukraine",
+            "region": "Kyiv City",
+            "locality": locality,
+            "street": "Street {street}".format(street=index % 5),
+            "street_number": str(index),
+            "formatted_address": "{locality} {index}".format(locality=locality, index=index),
+        }
+
+    def test_bulk_create_resolves_pending_addresses(self):
+        values = [self.make_value(index % 8) for index in range(10)]
+        orders = Order.objects.bulk_create([Order(price="100", delivery_address=value) for value in values])
+        self.assertEqual(Address.objects.count(), 8)
+        self.assertEqual(Order.objects.filter(delivery_address__isnull=True).count(), 0)
+        self.assertEqual([order.delivery_address.raw for order in orders], [value["raw"] for value in values])
+
+    def test_bulk_create_query_count_does_not_depend_on_size(self):
+        Order.objects.bulk_create([Order(price="1", delivery_address=self.make_value(0))])
+        with CaptureQueriesContext(connection) as small:
+            Order.objects.bulk_create(
+                [Order(price="1", delivery_address=self.make_value(index, "Kherson")) for index in range(10)]
+            )
+        # 40 addresses still fit in one INSERT under the SQLite parameter limit
+        with CaptureQueriesContext(connection) as large:
+            Order.objects.bulk_create(
+                [Order(price="1", delivery_address=self.make_value(index, "Odesa")) for index in range(40)]
+            )
+        self.assertEqual(len(small), len(large))
+
+    def test_bulk_update_resolves_pending_addresses(self):
+        orders = Order.objects.bulk_create([Order(price="1") for _ in range(3)])
+        for index, order in enumerate(orders):
+            order.delivery_address = self.make_value(index)
+        Order.objects.bulk_update(orders, ["delivery_address"])
+        self.assertEqual(
+            sorted(Order.objects.values_list("delivery_address__raw", flat=True)),
+            sorted(self.make_value(index)["raw"] for index in range(3)),
+        )
+
+    def test_bulk_create_invalid_value(self):
+        with self.assertRaises(ValidationError):
+            Order.objects.bulk_create([Order(price="1", delivery_address={})])
+        self.assertEqual(Order.objects.count(), 0)
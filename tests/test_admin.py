@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tests.factories import make_address
+
+from django_address.admin import EstimatedCountPaginator, estimated_count
+from django_address.models import Address, Street
+from django_address.service import bulk_save
+
+
+class AdminTestCase(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+    def changelist_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_street_changelist_queries_do_not_depend_on_rows(self):
+        bulk_save([make_address(index, district="Pecherskyi") for index in range(2)])
+        small, _ = self.changelist_queries("/admin/django_address/street/")
+        localities = ["Locality {index}".format(index=index) for index in range(20)]
+        bulk_save([make_address(index, district="Pecherskyi", locality=name) for index, name in enumerate(localities)])
+        large, _ = self.changelist_queries("/admin/django_address/street/")
+        self.assertEqual(small, large)
+
+    def test_locality_filter(self):
+        kiev, kherson = bulk_save([make_address(1), make_address(2, locality="Kherson")])
+        _, response = self.changelist_queries("/admin/django_address/address/", {"locality": kherson.locality_id})
+        self.assertEqual(list(response.context["cl"].result_list), [kherson])
+        _, response = self.changelist_queries("/admin/django_address/address/", {"locality": " kiev"})
+        self.assertEqual(list(response.context["cl"].result_list), [kiev])
+        self.assertContains(response, 'name="locality"')
+        self.assertNotContains(response, "Kherson</a>")
+
+    def test_add_duplicate_address(self):
+        address = bulk_save([make_address(1)])[0]
+        fields = ("raw", "route", "street_number", "formatted_address", "latitude", "longitude", "apartment")
+        data = {name: getattr(address, name) for name in fields}
+        data.update(locality=address.locality_id, street=address.street_id)
+        response = self.client.post("/admin/django_address/address/add/", data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Address.objects.filter(address_hash=address.address_hash).get(), address)
+        self.assertEqual(Address.objects.count(), 2)
+
+    def test_autocomplete_widgets(self):
+        address = bulk_save([make_address(1)])[0]
+        _, response = self.changelist_queries("/admin/django_address/address/{pk}/change/".format(pk=address.pk))
+        self.assertContains(response, "admin-autocomplete")
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    def test_exact_count_outside_postgresql(self):
+        bulk_save([make_address(index) for index in range(3)])
+        self.assertIsNone(estimated_count(Street.objects.all()))
+        self.assertEqual(EstimatedCountPaginator(Address.objects.order_by("pk"), 2).count, 3)
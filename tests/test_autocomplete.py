@@ -0,0 +1,93 @@
+from django.test import TestCase, override_settings
+
+from tests.factories import make_address
+
+from django_address.autocomplete import PrefixIndex, get_autocomplete
+from django_address.models import Street
+from django_address.service import bulk_save
+
+
+class PrefixIndexTestCase(TestCase):
+    def test_search(self):
+        index = PrefixIndex([("", 3, "Khreschatyk"), ("kherson", 1, "Kherson"), ("kyiv", 2, "Kyiv")])
+        self.assertEqual(index.search("kh"), [(1, "Kherson"), (3, "Khreschatyk")])
+        self.assertEqual(index.search("kh", limit=1), [(1, "Kherson")])
+        self.assertEqual(index.search("l"), [])
+        self.assertEqual(len(index), 3)
+
+
+class AutocompleteViewTestCase(TestCase):
+    def setUp(self):
+        get_autocomplete().clear()
+        self.addresses = bulk_save(
+            [
+                make_address(locality="Kiev", street="Khreschatyk street"),
+                make_address(locality="Kiev", street="Kharkivske highway"),
+                make_address(locality="Kherson", street="Kherson street", region="Kherson region"),
+                make_address(locality="Kherson", street="Ushakova Avenue", region="Kherson region"),
+            ]
+        )
+
+    def search(self, level, **params):
+        response = self.client.get("/address/autocomplete/{level}/".format(level=level), params)
+        self.assertEqual(response.status_code, 200)
+        return [result["name"] for result in response.json()["results"]]
+
+    def test_streets(self):
+        self.assertEqual(self.search("street", q="KH"), ["Kharkivske highway", "Kherson street", "Khreschatyk street"])
+        self.assertEqual(self.search("street", q=" khé", limit=1), ["Kherson street"])
+
+    def test_scope(self):
+        kherson = self.addresses[2].locality
+        self.assertEqual(self.search("street", q="kh", locality=kherson.pk), ["Kherson street"])
+        self.assertEqual(self.search("street", q="kh", region=kherson.region_id), ["Kherson street"])
+        self.assertEqual(self.search("locality", q="k", country=kherson.region.country_id), ["Kherson", "Kiev"])
+
+    def test_cached_results(self):
+        self.search("street", q="kh")
+        with self.assertNumQueries(0):
+            self.search("street", q="kh")
+            self.search("street", q="khr")
+
+    def test_invalidated_on_save(self):
+        self.assertEqual(self.search("street", q="kha"), ["Kharkivske highway"])
+        Street.objects.create(name="Khanska street", locality=self.addresses[0].locality)
+        self.assertEqual(self.search("street", q="kha"), ["Khanska street", "Kharkivske highway"])
+
+    def test_invalidation_is_scoped(self):
+        kiev, kherson = self.addresses[0].locality, self.addresses[2].locality
+        self.search("street", q="kh", locality=kiev.pk)
+        self.search("street", q="kh", locality=kherson.pk)
+        Street.objects.create(name="Khanska street", locality=kiev)
+        self.assertEqual(
+            [dict(key[1]) for key in get_autocomplete()._indexes], [{"locality": kherson.pk}],
+        )
+        self.assertEqual(self.search("street", q="kha", locality=kiev.pk), ["Khanska street", "Kharkivske highway"])
+
+    def test_invalidated_on_bulk_save(self):
+        self.assertEqual(self.search("street", q="kha"), ["Kharkivske highway"])
+        self.assertEqual(self.search("locality", q="ki"), ["Kiev"])
+        bulk_save([make_address(street="Khanska street"), make_address(locality="Kitsman", street="Shevchenka street")])
+        self.assertEqual(self.search("street", q="kha"), ["Khanska street", "Kharkivske highway"])
+        self.assertEqual(self.search("locality", q="ki"), ["Kiev", "Kitsman"])
+
+    def test_invalidated_on_move_and_delete(self):
+        kiev, kherson = self.addresses[0].locality, self.addresses[2].locality
+        self.assertEqual(self.search("street", q="kh", locality=kiev.pk), ["Kharkivske highway", "Khreschatyk street"])
+        street = Street.objects.get(name="Kharkivske highway")
+        street.locality = kherson
+        street.save()
+        self.assertEqual(self.search("street", q="kh", locality=kiev.pk), ["Khreschatyk street"])
+        Street.objects.get(name="Khreschatyk street").delete()
+        self.assertEqual(self.search("street", q="kh", locality=kiev.pk), [])
+
+    @override_settings(DJANGO_ADDRESS_AUTOCOMPLETE_MAX_SCOPES=1)
+    def test_bounded_indexes(self):
+        self.search("street", q="kh")
+        self.search("locality", q="kh")
+        self.assertEqual(len(get_autocomplete()._indexes), 1)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.search("street", q=""), [])
+        self.assertEqual(self.client.get("/address/autocomplete/street/", {"q": "k", "region": "x"}).status_code, 400)
+        self.assertEqual(self.client.get("/address/autocomplete/address/", {"q": "k"}).status_code, 404)
@@ -0,0 +1,27 @@
+from django.test import TestCase
+
+from django_address.batches import pk_batches, update_in_batches
+from django_address.models import Country
+
+
+class BatchesTestCase(TestCase):
+    def setUp(self):
+        for index in range(5):
+            Country.objects.create(name="Country {0}".format(index), code="C{0}".format(index))
+
+    def test_pk_batches(self):
+        batches = list(pk_batches(Country.objects.all(), batch_size=2, fields=("name",)))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        pks = [country.pk for batch in batches for country in batch]
+        self.assertEqual(pks, sorted(Country.objects.values_list("pk", flat=True)))
+        self.assertEqual(batches[0][0].get_deferred_fields(), {"code", "normalized_name"})
+
+    def test_updated_rows_leave_filter(self):
+        def update(country):
+            country.code = ""
+
+        # select and update of 3 batches, empty select ending the loop
+        with self.assertNumQueries(3 * 2 + 1):
+            updated = update_in_batches(Country.objects.exclude(code=""), update, ["code"], batch_size=2)
+        self.assertEqual(updated, 5)
+        self.assertFalse(Country.objects.exclude(code="").exists())
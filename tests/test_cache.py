@@ -0,0 +1,147 @@
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from django_address.cache import LRUCache, get_cache, get_shared_cache
+from django_address.models import Country, Street
+from django_address.service import Address as AddressService, bulk_save
+
+
+class LRUCacheTestCase(TestCase):
+    def setUp(self):
+        self.ua = Country.objects.create(name="Ukraine", code="UA")
+        self.fr = Country.objects.create(name="France", code="FR")
+
+    def test_get_set(self):
+        cache = LRUCache(max_size=10)
+        self.assertIsNone(cache.get(Country, ("Ukraine",)))
+        cache.set(Country, ("Ukraine",), self.ua)
+        self.assertEqual(cache.get(Country, ("Ukraine",)), self.ua)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_eviction(self):
+        cache = LRUCache(max_size=1)
+        cache.set(Country, ("Ukraine",), self.ua)
+        cache.set(Country, ("France",), self.fr)
+        self.assertIsNone(cache.get(Country, ("Ukraine",)))
+        self.assertEqual(cache.get(Country, ("France",)), self.fr)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_timeout(self):
+        cache = LRUCache(timeout=-1)
+        cache.set(Country, ("Ukraine",), self.ua)
+        self.assertIsNone(cache.get(Country, ("Ukraine",)))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_invalidate(self):
+        cache = LRUCache()
+        cache.set(Country, ("Ukraine",), self.ua)
+        cache.set(Country, ("UA",), self.ua)
+        cache.invalidate(Country, self.ua.pk)
+        self.assertIsNone(cache.get(Country, ("Ukraine",)))
+        self.assertIsNone(cache.get(Country, ("UA",)))
+
+
+@override_settings(DJANGO_ADDRESS_CACHE_CLASS="django_address.cache.LRUCache")
+class ServiceCacheTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.address = {
+            "raw": "Khreschatyk st, 15",
+            "country": "Ukraine",
+            "country_code": "UA",
+            "region": "Kyiv City",
+            "locality": "Kiev",
+            "street": "Khreschatyk street",
+            "street_number": "15",
+            "formatted_address": "Khreschatyk St, 15, Kyiv, Ukraine",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            AddressService(**self.address).save()
+
+    def test_cache_disabled_by_default(self):
+        with self.settings(DJANGO_ADDRESS_CACHE_CLASS=None):
+            self.assertIsNone(get_cache())
+
+    def test_warm_save_uses_cache(self):
+        hits = get_cache().hits
+        with CaptureQueriesContext(connection) as queries:
+            AddressService(**self.address).save()
+        selects = [query["sql"] for query in queries if query["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+        self.assertIn("django_address_address", selects[0])
+        self.assertEqual(get_cache().hits - hits, 4)
+
+    def test_rolled_back_rows_are_not_cached(self):
+        values = [dict(self.address, locality="Odesa", street_number=str(number)) for number in (1, 2)]
+        size = get_cache().stats()["size"]
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    for value in values:
+                        AddressService(**value).save()
+                    raise RuntimeError
+        self.assertEqual(get_cache().stats()["size"], size)
+        address = AddressService(**values[0]).save()
+        self.assertEqual(address.locality.name, "Odesa")
+        self.assertTrue(Street.objects.filter(pk=address.street_id).exists())
+
+    def test_invalidated_on_rename(self):
+        street = Street.objects.get(name="Khreschatyk street")
+        street.name = "Khreschatyk avenue"
+        street.save()
+        address = AddressService(**self.address).save()
+        self.assertNotEqual(address.street, street)
+        self.assertEqual(address.street.name, "Khreschatyk street")
+
+
+@override_settings(DJANGO_ADDRESS_CACHE_ALIAS="default")
+class SharedCacheTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.address = {
+            "raw": "Khreschatyk st, 15",
+            "country": "Ukraine",
+            "country_code": "UA",
+            "region": "Kyiv City",
+            "locality": "Kiev",
+            "street": "Khreschatyk street",
+            "street_number": "15",
+            "formatted_address": "Khreschatyk St, 15, Kyiv, Ukraine",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.saved = AddressService(**self.address).save()
+
+    def test_warm_save_reads_chain_from_cache(self):
+        with CaptureQueriesContext(connection) as queries:
+            address = AddressService(**self.address).save()
+        selects = [query["sql"] for query in queries if query["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+        self.assertIn("django_address_address", selects[0])
+        self.assertEqual(address, self.saved)
+
+    def test_bulk_save_reads_chain_from_cache(self):
+        value = dict(self.address, raw="Khreschatyk st, 16", street_number="16")
+        with CaptureQueriesContext(connection) as queries:
+            address = bulk_save([value])[0]
+        selects = [query["sql"] for query in queries if query["sql"].startswith("SELECT")]
+        self.assertEqual([sql for sql in selects if "django_address_address" not in sql], [])
+        self.assertEqual(address.street, self.saved.street)
+
+    def test_rename_bumps_version(self):
+        street = Street.objects.get(name="Khreschatyk street")
+        with self.captureOnCommitCallbacks(execute=True):
+            street.name = "Khreschatyk avenue"
+            street.save()
+        address = AddressService(**self.address).save()
+        self.assertNotEqual(address.street, street)
+        self.assertEqual(address.street.name, "Khreschatyk street")
+
+    def test_missing_version_invalidates_entries(self):
+        shared = get_shared_cache()
+        caches["default"].delete(shared.version_key(Street))
+        entries = AddressService(**self.address).shared_cache_entries()
+        found, _ = shared.get_many(entries)
+        self.assertEqual(len(found), len(entries) - 1)
@@ -0,0 +1,236 @@
+import csv
+import gzip
+import json
+import multiprocessing.dummy
+import os
+import queue
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase
+
+from django_address.exporter import read_columnar
+from django_address.importer import AddressImporter, ParallelAddressImporter, partition, save_chunk
+from django_address.models import Address, Locality, Street
+from django_address.service import AddressError
+
+CSV = """raw,country,country_code,region,locality,street,street_number,latitude,unknown
+"Khreschatyk st, 15",Ukraine,UA,Kyiv City,Kiev,Khreschatyk street,15,50.4474875,x
+"Khreschatyk st, 16",Ukraine,UA,Kyiv City,Kiev,Khreschatyk street,16,,x
+"Ushakova st, 50",Ukraine,UA,Kherson region,Kherson,Ushakova Avenue,50,46.6490074,x
+"""
+
+
+class ImportAddressesTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as input_file:
+            input_file.write(content)
+        return path
+
+    def test_import_csv(self):
+        out = StringIO()
+        call_command("import_addresses", self.write("addresses.csv", CSV), chunk_size=2, stdout=out)
+        self.assertIn("Imported 3 addresses.", out.getvalue())
+        self.assertIn("2 rows processed", out.getvalue())
+        self.assertEqual(Locality.objects.count(), 2)
+        self.assertEqual(Street.objects.count(), 2)
+        self.assertEqual(Address.objects.get(street_number="15").latitude, 50.4474875)
+        self.assertEqual(Address.objects.get(street_number="16").latitude, 0)
+
+    def test_import_ndjson(self):
+        rows = [
+            {"raw": "Khreschatyk st, 15", "country": "Ukraine", "region": "Kyiv City", "locality": "Kiev"},
+            {"raw": "Khreschatyk st, 16", "country": "Ukraine", "region": "Kyiv City", "locality": "Kiev"},
+        ]
+        for row in rows:
+            row.update(street="Khreschatyk street", latitude=50.4)
+        path = self.write("addresses.ndjson", "\n".join(json.dumps(row) for row in rows))
+        call_command("import_addresses", path, stdout=StringIO())
+        self.assertEqual(Address.objects.count(), 2)
+
+    def test_resume_from_checkpoint(self):
+        checkpoint = self.write("checkpoint", "2")
+        call_command(
+            "import_addresses", self.write("addresses.csv", CSV), checkpoint=checkpoint, resume=True, stdout=StringIO()
+        )
+        self.assertEqual(list(Address.objects.values_list("street_number", flat=True)), ["50"])
+        with open(checkpoint, encoding="utf-8") as checkpoint_file:
+            self.assertEqual(checkpoint_file.read(), "3")
+
+    def test_resume_requires_checkpoint(self):
+        with self.assertRaises(CommandError):
+            call_command("import_addresses", self.write("addresses.csv", CSV), resume=True)
+
+    def test_failed_chunk(self):
+        path = self.write("addresses.csv", CSV + '"No street",Ukraine,UA,Kyiv City,Kiev,,1,,x\n')
+        with self.assertRaisesMessage(CommandError, "Chunk after row 2 failed"):
+            call_command("import_addresses", path, chunk_size=2, stdout=StringIO())
+
+    def test_malformed_coordinate(self):
+        path = self.write("addresses.csv", CSV + '"Bad",Ukraine,UA,Kyiv City,Kiev,Khreschatyk street,1,50.4a,x\n')
+        with self.assertRaisesMessage(CommandError, "Row 4 has malformed latitude '50.4a'."):
+            call_command("import_addresses", path, chunk_size=2, stdout=StringIO())
+        # the chunk before the malformed row is committed
+        self.assertEqual(Address.objects.count(), 2)
+
+
+class KilledProcess(multiprocessing.dummy.Process):
+    """Worker killed before it reports its exit."""
+
+    def __init__(self, target, args):
+        super().__init__(target=lambda tasks, results: None, args=args)
+
+    @property
+    def exitcode(self):
+        return None if self.is_alive() else -9
+
+
+class ParallelImportTestCase(TransactionTestCase):
+    def rows(self):
+        for index in range(60):
+            yield {
+                "raw": "Street {index}".format(index=index),
+                "country": "Country {index}".format(index=index % 2),
+                "region": "Region {index}".format(index=index % 5),
+                "locality": "Locality {index}".format(index=index % 10),
+                "street": "Street {index}".format(index=index % 11),
+                "street_number": str(index),
+            }
+
+    def snapshot(self):
+        return sorted(
+            Address.objects.values_list(
+                "locality__region__country__name", "locality__region__name", "locality__name", "street__name", "raw"
+            )
+        )
+
+    def test_partition_is_stable(self):
+        values = {"country": "Ukraine", "region": "Kyiv City", "locality": "Kiev"}
+        self.assertEqual(partition(values, 4), partition(dict(values, locality="Other"), 4))
+        self.assertIn(partition(values, 4), range(4))
+        partitions = {partition(row, 3) for row in self.rows()}
+        self.assertGreater(len(partitions), 1)
+
+    def test_partition_normalizes_names(self):
+        values = {"country": "Ukraine", "region": "Kyiv City"}
+        for workers in range(2, 10):
+            self.assertEqual(
+                partition(values, workers), partition({"country": "ukraine", "region": "kyiv  city "}, workers)
+            )
+
+    def test_same_locality_in_two_partitions(self):
+        rows = [
+            {"country": "Ukraine", "region": region, "locality": "Kiev", "street": "Street 1", "street_number": "1"}
+            for region in ("Kyiv City", "Odesa region")
+        ]
+        self.assertNotEqual(partition(rows[0], 2), partition(rows[1], 2))
+        importer = ParallelAddressImporter(workers=2, context=multiprocessing.dummy)
+        self.assertEqual(importer.run(rows), 2)
+        slugs = Locality.objects.values_list("slug", flat=True)
+        self.assertEqual(len(set(slugs)), 2)
+
+    def test_same_rows_as_serial(self):
+        AddressImporter(chunk_size=7).run(self.rows())
+        expected = self.snapshot()
+        Address.objects.all().delete()
+        Street.objects.all().delete()
+        Locality.objects.all().delete()
+
+        # SQLite allows a single writer, chunks of workers locking each other out are retried
+        importer = ParallelAddressImporter(workers=3, chunk_size=7, context=multiprocessing.dummy)
+        self.assertEqual(importer.run(self.rows()), 60)
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_exit_drained_while_sending(self):
+        importer = ParallelAddressImporter(workers=2)
+        importer._results = queue.Queue()
+        importer._results.put(("done", 3))
+        importer._results.put(("exit", None))
+        importer.running = 2
+        importer._drain()
+        self.assertEqual((importer.imported, importer.running), (3, 1))
+
+    def test_locked_chunk_retried(self):
+        service_class = mock.Mock()
+        service_class.bulk_save.side_effect = [self.locked_error(), ["address"]]
+        with mock.patch("django_address.importer.time.sleep"):
+            self.assertEqual(save_chunk(service_class, [{}]), ["address"])
+        self.assertEqual(service_class.bulk_save.call_count, 2)
+
+    def locked_error(self):
+        try:
+            raise AddressError from OperationalError("database is locked")
+        except AddressError as error:
+            return error
+
+    def test_killed_worker(self):
+        context = mock.Mock(Queue=multiprocessing.dummy.Queue, Process=KilledProcess)
+        importer = ParallelAddressImporter(workers=2, chunk_size=7, context=context)
+        with self.assertRaisesRegex(AddressError, "exited with code -9"):
+            importer.run(self.rows())
+
+    def test_malformed_coordinate(self):
+        rows = list(self.rows())
+        rows[30]["latitude"] = "north"
+        importer = ParallelAddressImporter(workers=2, chunk_size=7, context=multiprocessing.dummy)
+        with self.assertRaisesMessage(AddressError, "Row 31 has malformed latitude 'north'."):
+            importer.run(rows)
+
+    def test_worker_error(self):
+        rows = list(self.rows())
+        rows[3]["street"] = ""
+        importer = ParallelAddressImporter(workers=1, chunk_size=7, context=multiprocessing.dummy)
+        with self.assertRaises(AddressError):
+            importer.run(rows)
+
+
+class ExportAddressesTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        AddressImporter().run(csv.DictReader(StringIO(CSV)))
+
+    def export(self, name, **options):
+        path = os.path.join(self.directory.name, name)
+        out = StringIO()
+        call_command("export_addresses", path, stdout=out, **options)
+        return path, out.getvalue()
+
+    def test_export_ndjson(self):
+        path, out = self.export("addresses.ndjson")
+        self.assertIn("Exported 3 addresses.", out)
+        with open(path, encoding="utf-8") as export_file:
+            rows = [json.loads(line) for line in export_file]
+        self.assertEqual([row["street_number"] for row in rows], ["15", "16", "50"])
+        self.assertEqual(rows[0]["country"], "Ukraine")
+        self.assertEqual(rows[0]["region"], "Kyiv City")
+        self.assertEqual(rows[0]["street"], "Khreschatyk street")
+        self.assertIsNone(rows[0]["district"])
+
+    def test_export_csv_gzip_with_filter(self):
+        path, out = self.export("addresses.csv.gz", region="Kherson region")
+        self.assertIn("Exported 1 addresses.", out)
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as export_file:
+            rows = list(csv.DictReader(export_file))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["locality"], "Kherson")
+
+    def test_export_columnar(self):
+        path, _ = self.export("addresses.dac", gzip=True, country="UA")
+        with gzip.open(path, "rb") as export_file:
+            rows = list(read_columnar(export_file))
+        self.assertEqual([row["latitude"] for row in rows], [50.4474875, 0, 46.6490074])
+        self.assertEqual(rows[2]["street"], "Ushakova Avenue")
+        self.assertEqual(rows[0]["id"], Address.objects.get(street_number="15").pk)
+
+    def test_export_single_query(self):
+        with self.assertNumQueries(1):
+            self.export("addresses.ndjson", format="csv", chunk_size=1)
@@ -0,0 +1,73 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from example.order.models import Order
+from tests.factories import make_address
+
+from django_address.dedup import address_relations, merge_addresses
+from django_address.models import Address, MergedAddressHash
+from django_address.service import Address as AddressService, bulk_save
+
+
+class DedupeTestCase(TestCase):
+    def setUp(self):
+        self.first, self.second, self.third, self.other = bulk_save(
+            [
+                make_address(15),
+                make_address(15, raw="Khreschatyk 15, Kyiv", street_number="15 ", latitude=50.44),
+                make_address(15, raw="khreschatyk street 15"),
+                make_address(15, raw="Khreschatyk st, 15a", street_number="15a"),
+            ]
+        )
+
+    def test_fingerprint(self):
+        self.assertEqual(self.first.fingerprint, self.second.fingerprint)
+        self.assertEqual(self.first.fingerprint, self.third.fingerprint)
+        self.assertNotEqual(self.first.fingerprint, self.other.fingerprint)
+        self.assertEqual(Address.objects.get(pk=self.first.pk).fingerprint, self.first.fingerprint)
+
+    def test_relations_include_address_fields(self):
+        self.assertIn((Order, Order._meta.get_field("delivery_address")), address_relations(Address))
+
+    def test_merge_repoints_references(self):
+        orders = [Order.objects.create(price=1, delivery_address=address) for address in (self.second, self.third)]
+        # savepoint, update of merged hashes and orders, select of duplicate hashes, insert of merged hashes,
+        # delete collector select and cascades, delete of addresses, release
+        with self.assertNumQueries(10):
+            merge_addresses({self.second.pk: self.first.pk, self.third.pk: self.first.pk})
+        for order in orders:
+            order.refresh_from_db()
+            self.assertEqual(order.delivery_address_id, self.first.pk)
+
+    def test_merged_duplicate_is_not_recreated(self):
+        merge_addresses({self.second.pk: self.first.pk})
+        value = make_address(15, raw="Khreschatyk 15, Kyiv", street_number="15 ", latitude=50.44)
+        self.assertEqual(AddressService(**value).save(), self.first)
+        self.assertEqual(bulk_save([value, make_address(15)]), [self.first, self.first])
+        self.assertFalse(Address.objects.filter(pk=self.second.pk).exists())
+        self.assertEqual(Address.objects.count(), 3)
+
+    def test_merged_hashes_follow_kept_address(self):
+        merge_addresses({self.second.pk: self.third.pk})
+        merge_addresses({self.third.pk: self.first.pk})
+        self.assertEqual(
+            set(MergedAddressHash.objects.values_list("address_hash", "address")),
+            {(self.second.address_hash, self.first.pk), (self.third.address_hash, self.first.pk)},
+        )
+
+    def test_command(self):
+        order = Order.objects.create(price=1, delivery_address=self.third)
+        Address.objects.filter(pk=self.second.pk).update(fingerprint="")
+        out = StringIO()
+        call_command("dedupe_addresses", dry_run=True, stdout=out)
+        self.assertIn("Fingerprinted 1 addresses.", out.getvalue())
+        self.assertIn("Found 2 duplicate addresses.", out.getvalue())
+        self.assertEqual(Address.objects.count(), 4)
+
+        call_command("dedupe_addresses", batch_size=1, stdout=out)
+        self.assertIn("Merged 2 duplicate addresses.", out.getvalue())
+        self.assertEqual(set(Address.objects.values_list("pk", flat=True)), {self.first.pk, self.other.pk})
+        order.refresh_from_db()
+        self.assertEqual(order.delivery_address_id, self.first.pk)
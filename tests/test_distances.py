@@ -0,0 +1,72 @@
+import random
+from unittest import skipIf
+
+from django.test import TestCase
+
+from tests.factories import make_address
+
+from django_address import distances
+from django_address.geo import haversine
+from django_address.models import Address
+from django_address.service import bulk_save
+
+
+class RefineNearestTestCase(TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.points = [(rng.uniform(50.3, 50.6), rng.uniform(30.3, 30.7)) for _ in range(60)]
+        bulk_save(
+            [
+                make_address(index, streets=1, latitude=lat, longitude=lon)
+                for index, (lat, lon) in enumerate(self.points)
+            ]
+        )
+
+    def brute_force(self, k, max_distance_km=None):
+        rows = sorted(
+            (haversine(50.45, 30.52, lat, lon), pk)
+            for pk, lat, lon in Address.objects.values_list("pk", "latitude", "longitude")
+        )
+        return [pk for distance, pk in rows if max_distance_km is None or distance <= max_distance_km][:k]
+
+    def test_refine_nearest(self):
+        nearest = distances.refine_nearest(50.45, 30.52, Address.objects.all(), 5)
+        self.assertEqual([pk for _, pk in nearest], self.brute_force(5))
+        self.assertEqual([distance for distance, _ in nearest], sorted(distance for distance, _ in nearest))
+
+    def test_refine_nearest_max_distance(self):
+        nearest = distances.refine_nearest(50.45, 30.52, Address.objects.all(), 50, max_distance_km=5)
+        self.assertEqual([pk for _, pk in nearest], self.brute_force(50, max_distance_km=5))
+
+    @skipIf(distances.np is None, "numpy is not installed")
+    def test_load_coordinates(self):
+        coordinates = distances.load_coordinates(Address.objects.order_by("pk"), chunk_size=7)
+        self.assertEqual(len(coordinates.pks), len(self.points))
+        self.assertEqual(coordinates.pks.dtype, distances.np.int64)
+        by_pk = dict(zip(coordinates.pks.tolist(), zip(coordinates.latitudes, coordinates.longitudes)))
+        for pk, lat, lon in Address.objects.values_list("pk", "latitude", "longitude"):
+            self.assertEqual(by_pk[pk], (lat, lon))
+
+
+@skipIf(distances.np is None, "numpy is not installed")
+class VectorizedDistanceTestCase(TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.first = [(rng.uniform(-80, 80), rng.uniform(-180, 180)) for _ in range(13)]
+        self.second = [(rng.uniform(-80, 80), rng.uniform(-180, 180)) for _ in range(17)]
+
+    def test_haversine_to_many(self):
+        lats, lons = zip(*self.second)
+        result = distances.haversine_to_many(10.0, 20.0, distances.np.array(lats), distances.np.array(lons))
+        for value, (lat, lon) in zip(result, self.second):
+            self.assertAlmostEqual(value, haversine(10.0, 20.0, lat, lon), places=6)
+
+    def test_pairwise_haversine_blocks(self):
+        lats1, lons1 = zip(*self.first)
+        lats2, lons2 = zip(*self.second)
+        matrix = distances.pairwise_haversine(lats1, lons1, lats2, lons2, block_cells=40)
+        self.assertEqual(matrix.shape, (13, 17))
+        self.assertEqual(len(list(distances.iter_pairwise_haversine(lats1, lons1, lats2, lons2, 40))), 7)
+        for row, (lat1, lon1) in enumerate(self.first):
+            for column, (lat2, lon2) in enumerate(self.second):
+                self.assertAlmostEqual(matrix[row, column], haversine(lat1, lon1, lat2, lon2), places=6)
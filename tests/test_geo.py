@@ -0,0 +1,88 @@
+import random
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from tests.factories import make_address
+
+from django_address.geo import bbox_around, cover_bbox, encode_geohash, haversine
+from django_address.models import Address
+from django_address.service import bulk_save
+
+
+class GeohashTestCase(TestCase):
+    def test_encode(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, precision=11), "u4pruydqqvj")
+        self.assertEqual(encode_geohash(-25.382708, -49.265506, precision=8), "6gkzwgjz")
+
+    def test_cover_bbox(self):
+        cells = cover_bbox(50.40, 30.45, 50.50, 30.60, max_cells=32)
+        self.assertLessEqual(len(cells), 32)
+        self.assertTrue(any(encode_geohash(50.45, 30.52).startswith(cell) for cell in cells))
+
+    def test_bbox_around_contains_circle(self):
+        min_lat, min_lon, max_lat, max_lon = bbox_around(50.45, 30.52, 10)
+        self.assertAlmostEqual(haversine(50.45, 30.52, max_lat, 30.52), 10, places=3)
+        self.assertGreaterEqual(haversine(50.45, 30.52, 50.45, max_lon), 10)
+        self.assertGreater(bbox_around(10, 179.99, 10)[1], bbox_around(10, 179.99, 10)[3])
+
+
+class SpatialQueryTestCase(TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.points = [(rng.uniform(50.3, 50.6), rng.uniform(30.3, 30.7)) for _ in range(150)]
+        self.points += [(rng.uniform(-60, 60), rng.uniform(-180, 180)) for _ in range(50)]
+        self.points.append((10.0, 179.99))
+        bulk_save(
+            [
+                make_address(index, streets=13, latitude=lat, longitude=lon)
+                for index, (lat, lon) in enumerate(self.points)
+            ]
+        )
+        bulk_save([make_address(1000, streets=13, latitude=0, longitude=0)])
+
+    def brute_force(self, latitude, longitude, k):
+        distances = sorted(
+            (haversine(latitude, longitude, lat, lon), pk)
+            for pk, lat, lon in Address.objects.exclude(geohash="").values_list("pk", "latitude", "longitude")
+        )
+        return [pk for _, pk in distances[:k]]
+
+    def test_geohash_maintained(self):
+        address = Address.objects.get(street_number="0")
+        self.assertEqual(address.geohash, encode_geohash(*self.points[0]))
+        self.assertEqual(Address.objects.get(street_number="1000").geohash, "")
+
+    def test_within_bbox(self):
+        found = set(Address.objects.within_bbox(50.4, 30.4, 50.5, 30.6).values_list("street_number", flat=True))
+        expected = {
+            str(index) for index, (lat, lon) in enumerate(self.points) if 50.4 <= lat <= 50.5 and 30.4 <= lon <= 30.6
+        }
+        self.assertTrue(expected)
+        self.assertEqual(found, expected)
+
+    def test_within_bbox_across_antimeridian(self):
+        found = Address.objects.within_bbox(9, 179, 11, -179).values_list("street_number", flat=True)
+        self.assertIn(str(len(self.points) - 1), found)
+
+    def test_nearest_without_k(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(Address.objects.nearest(50.45, 30.52, k=0), [])
+
+    def test_nearest_matches_brute_force(self):
+        for latitude, longitude in ((50.45, 30.52), (0, 0), (10.01, -179.99)):
+            nearest = Address.objects.nearest(latitude, longitude, k=5)
+            self.assertEqual([address.pk for address in nearest], self.brute_force(latitude, longitude, 5))
+            distances = [address.distance for address in nearest]
+            self.assertEqual(distances, sorted(distances))
+
+    def test_nearest_max_distance(self):
+        nearest = Address.objects.nearest(10.0, 179.99, k=5, max_distance_km=100)
+        self.assertEqual([address.street_number for address in nearest], [str(len(self.points) - 1)])
+
+    def test_backfill_command(self):
+        Address.objects.update(geohash="")
+        out = StringIO()
+        call_command("backfill_address_geohash", batch_size=50, stdout=out)
+        self.assertIn("Updated {count} addresses.".format(count=len(self.points)), out.getvalue())
@@ -0,0 +1,124 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from django_address.models import Address, Country, Locality, Street
+from django_address.service import Address as AddressService
+
+
+class HierarchySnapshotTestCase(TestCase):
+    def setUp(self):
+        self.address = AddressService(
+            raw="Khreschatyk st, 15",
+            country="Ukraine",
+            country_code="UA",
+            region="Kyiv City",
+            locality="Kiev",
+            street="Khreschatyk street",
+            street_number="15",
+            postal_code="02000",
+        ).save()
+
+    def test_to_dict_without_queries(self):
+        address = Address.objects.get(pk=self.address.pk)
+        with self.assertNumQueries(0):
+            value = address.to_dict()
+            address.to_json()
+        self.assertEqual(value["country"]["name"], "Ukraine")
+        self.assertEqual(value["region"]["name"], "Kyiv City")
+        self.assertEqual(value["locality"]["name"], "Kiev")
+        self.assertEqual(value["street"]["name"], "Khreschatyk street")
+        self.assertNotIn("district", value)
+
+    def test_str_without_queries(self):
+        address = Address.objects.get(pk=self.address.pk)
+        address.formatted_address = ""
+        with self.assertNumQueries(0):
+            self.assertEqual(str(address), "Khreschatyk street, 15, Kiev")
+
+    def test_to_dict_matches_related_models(self):
+        address = Address.objects.get(pk=self.address.pk)
+        self.assertEqual(address.to_dict(), Address.objects.get(pk=self.address.pk).to_dict())
+        address.hierarchy = {}
+        self.assertEqual(address.to_dict(), Address.objects.get(pk=self.address.pk).to_dict())
+
+    def test_refreshed_on_rename(self):
+        country = Country.objects.get(name="Ukraine")
+        country.name = "Ukraina"
+        with self.captureOnCommitCallbacks(execute=True):
+            country.save()
+        address = Address.objects.get(pk=self.address.pk)
+        self.assertEqual(address.to_dict()["country"]["name"], "Ukraina")
+
+    def test_locality_label_refreshed_on_rename(self):
+        locality = Locality.objects.get(name="Kiev")
+        locality.name = "Kyiv"
+        with self.captureOnCommitCallbacks(execute=True):
+            locality.save()
+        address = Address.objects.get(pk=self.address.pk)
+        self.assertEqual(address.hierarchy["locality_label"], "Kyiv")
+
+    @override_settings(DJANGO_ADDRESS_REFRESH_ON_RENAME=False)
+    def test_refresh_on_rename_disabled(self):
+        country = Country.objects.get(name="Ukraine")
+        country.name = "Ukraina"
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            country.save()
+        self.assertEqual(len(callbacks), 0)
+        call_command("backfill_address_hierarchy", all=True, stdout=StringIO())
+        address = Address.objects.get(pk=self.address.pk)
+        self.assertEqual(address.hierarchy["country"]["name"], "Ukraina")
+
+    def test_stale_snapshot_of_other_locality(self):
+        address = Address.objects.get(pk=self.address.pk)
+        odesa = Locality.objects.create(name="Odesa", region=address.locality.region)
+        address.locality = odesa
+        address.street = Street.objects.create(name="Derybasivska street", locality=odesa)
+        address.formatted_address = ""
+        self.assertEqual(address.to_dict()["locality"]["name"], "Odesa")
+        self.assertEqual(address.to_dict()["street"]["name"], "Derybasivska street")
+        self.assertEqual(str(address), "Derybasivska street, 15, Odesa")
+
+    def test_backfill_command(self):
+        Address.objects.update(hierarchy={})
+        out = StringIO()
+        call_command("backfill_address_hierarchy", batch_size=1, stdout=out)
+        self.assertIn("Updated 1 addresses.", out.getvalue())
+        address = Address.objects.get(pk=self.address.pk)
+        self.assertEqual(address.hierarchy["street"]["name"], "Khreschatyk street")
+
+
+class MergeDuplicateLocalitiesMigrationTestCase(TransactionTestCase):
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate([("django_address", "0001_initial")])
+        self.executor.loader.build_graph()
+        self.apps = self.executor.loader.project_state([("django_address", "0001_initial")]).apps
+
+    def tearDown(self):
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_merged_before_constraints(self):
+        country = self.apps.get_model("django_address", "Country").objects.create(name="Ukraine")
+        region = self.apps.get_model("django_address", "Region").objects.create(name="Kyiv City", country=country)
+        locality_model = self.apps.get_model("django_address", "Locality")
+        street_model = self.apps.get_model("django_address", "Street")
+        address_model = self.apps.get_model("django_address", "Address")
+        kept, duplicate = [locality_model.objects.create(name="Kiev", slug=slug, region=region) for slug in "ab"]
+        for locality in (kept, duplicate):
+            street = street_model.objects.create(name="Khreschatyk street", locality=locality)
+            address_model.objects.create(raw="Khreschatyk st, 15", locality=locality, street=street)
+        street_model.objects.create(name="Bankova street", locality=duplicate)
+
+        self.executor.loader.build_graph()
+        self.executor.migrate([("django_address", "0002_locality_unique_natural_key")])
+
+        self.assertEqual(list(locality_model.objects.values_list("pk", flat=True)), [kept.pk])
+        streets = dict(street_model.objects.values_list("name", "locality"))
+        self.assertEqual(streets, {"Khreschatyk street": kept.pk, "Bankova street": kept.pk})
+        kept_street = street_model.objects.get(name="Khreschatyk street").pk
+        self.assertEqual(list(address_model.objects.values_list("locality", "street")), [(kept.pk, kept_street)] * 2)
@@ -0,0 +1,43 @@
+from django.test import TestCase
+
+from example.order.models import Order
+
+from django_address.models import Address
+
+
+class WithHierarchyTestCase(TestCase):
+    def create_orders(self, count):
+        for index in range(count):
+            Order.objects.create(
+                price="100",
+                delivery_address={
+                    "raw": "Street {index}, 1".format(index=index),
+                    "country": "Ukraine",
+                    "country_code": "UA",
+                    "region": "Region {index}".format(index=index),
+                    "locality": "Locality {index}".format(index=index),
+                    "street": "Street {index}".format(index=index),
+                    "street_number": "1",
+                },
+            )
+        # serialize from related models, not from the snapshot
+        Address.objects.update(hierarchy={})
+
+    def test_address_queryset(self):
+        self.create_orders(3)
+        with self.assertNumQueries(1):
+            values = [address.to_dict() for address in Address.objects.with_hierarchy()]
+        self.assertEqual(len(values), 3)
+        self.assertEqual(values[0]["country"]["name"], "Ukraine")
+
+    def test_address_field_queryset(self):
+        self.create_orders(2)
+        with self.assertNumQueries(1):
+            [order.delivery_address.to_dict() for order in Order.objects.with_address_hierarchy("delivery_address")]
+        self.create_orders(5)
+        with self.assertNumQueries(1):
+            values = [order.delivery_address.to_dict() for order in Order.objects.with_address_hierarchy()]
+        self.assertEqual(len(values), 7)
+
+    def test_get_or_none(self):
+        self.assertIsNone(Address.objects.get_or_none(pk=1))
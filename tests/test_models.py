@@ -65,6 +65,14 @@ class ModelsTestCase(TestCase):
         with self.assertRaises(IntegrityError):
             Locality.objects.create(name="Kherson", region=self.ua_ks)
 
+    def test_localities_natural_key(self):
+        with self.assertRaises(IntegrityError):
+            Locality.objects.create(name="Bayeux", slug="bayeux-2", region=self.fr_nor, district=self.fr_nor_bessin)
+
+    def test_localities_natural_key_without_district(self):
+        with self.assertRaises(IntegrityError):
+            Locality.objects.create(name="Kiev", slug="kiev-2", region=self.ua_kv)
+
     def test_streets(self):
         streets = Street.objects.all()
         self.assertEqual(streets.count(), 3)
@@ -0,0 +1,113 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from tests.factories import make_address
+
+from django_address import service
+from django_address.models import Country, Locality, Region, Street
+from django_address.normalization import normalize_name
+from django_address.service import Address as AddressService, _insert_or_get, _name_lookup, bulk_save
+
+
+def upper_name(value):
+    return value.upper()
+
+
+class NormalizedNameTestCase(TestCase):
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("  Kïev \t City "), "kiev city")
+        self.assertEqual(normalize_name("STRASSE"), normalize_name("straße"))
+
+    def test_filled_on_save(self):
+        country = Country.objects.create(name="Ukraïne")
+        self.assertEqual(country.normalized_name, "ukraine")
+        country.name = "Ukraina "
+        country.save(update_fields=["name"])
+        country.refresh_from_db()
+        self.assertEqual(country.normalized_name, "ukraina")
+
+    def test_save_matches_normalized_name(self):
+        first = AddressService(**make_address(1)).save()
+        second = AddressService(**make_address(1, locality=" kiev ", street="STREET  1")).save()
+        self.assertEqual(first.locality, second.locality)
+        self.assertEqual(first.street, second.street)
+        self.assertEqual(Locality.objects.count(), 1)
+        self.assertEqual(Street.objects.count(), 1)
+
+    def test_bulk_save_matches_normalized_name(self):
+        addresses = bulk_save([make_address(1), make_address(1, locality="kiev"), make_address(1, locality="Kíev ")])
+        self.assertEqual(len({address.locality_id for address in addresses}), 1)
+        self.assertEqual(Locality.objects.get().name, "Kiev")
+
+    def test_matches_rows_without_normalized_name(self):
+        address = AddressService(**make_address(1)).save()
+        Locality.objects.update(normalized_name="")
+        self.assertEqual(AddressService(**make_address(1)).save(), address)
+        self.assertEqual(bulk_save([make_address(1)]), [address])
+
+    def test_concurrent_insert_of_other_spelling(self):
+        country = Country.objects.create(name="Ukraine")
+        insert = service._insert_returning_pk
+        concurrent = {}
+
+        def insert_after_other_spelling(obj):
+            # " kyiv city" is committed between the select and the insert of "Kyiv City"
+            if not concurrent:
+                concurrent["region"] = None
+                lookup = _name_lookup(Region, " kyiv city", {"code": "", "country": country})
+                concurrent["region"] = _insert_or_get(Region, lookup)
+            return insert(obj)
+
+        with mock.patch.object(service, "_insert_returning_pk", side_effect=insert_after_other_spelling):
+            region = _insert_or_get(Region, _name_lookup(Region, "Kyiv City", {"code": "", "country": country}))
+        self.assertEqual(region, concurrent["region"])
+        self.assertEqual(Region.objects.count(), 1)
+
+    @override_settings(DJANGO_ADDRESS_NAME_NORMALIZER="tests.test_normalization.upper_name")
+    def test_custom_normalizer(self):
+        region = Region.objects.create(name="Kyiv City", country=Country.objects.create(name="Ukraine"))
+        self.assertEqual(region.normalized_name, "KYIV CITY")
+
+    def test_backfill_command(self):
+        AddressService(**make_address(1)).save()
+        Locality.objects.update(normalized_name="")
+        out = StringIO()
+        call_command("backfill_normalized_names", batch_size=1, stdout=out)
+        self.assertIn("Updated 1 Localities.", out.getvalue())
+        self.assertIn("Updated 0 Countries.", out.getvalue())
+        self.assertEqual(Locality.objects.get().normalized_name, "kiev")
+
+
+class MergeNormalizedDuplicatesMigrationTestCase(TransactionTestCase):
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate([("django_address", "0010_merged_address_hash")])
+        self.executor.loader.build_graph()
+        self.apps = self.executor.loader.project_state([("django_address", "0010_merged_address_hash")]).apps
+
+    def tearDown(self):
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_merged_before_constraints(self):
+        country = self.apps.get_model("django_address", "Country").objects.create(name="Ukraine")
+        region_model = self.apps.get_model("django_address", "Region")
+        locality_model = self.apps.get_model("django_address", "Locality")
+        # rows created before normalized_name, only the raw names differ
+        kept, duplicate = [
+            region_model.objects.create(name=name, country=country) for name in ("Kyiv City", "kyiv city")
+        ]
+        for slug, region in (("kiev", kept), ("kiev-2", duplicate)):
+            locality_model.objects.create(name="Kiev", slug=slug, region=region)
+        locality_model.objects.create(name=" KIEV", slug="kiev-3", region=kept)
+
+        self.executor.loader.build_graph()
+        self.executor.migrate([("django_address", "0011_normalized_natural_keys")])
+
+        self.assertEqual(list(region_model.objects.values_list("pk", "normalized_name")), [(kept.pk, "kyiv city")])
+        self.assertEqual(list(locality_model.objects.values_list("slug", "region")), [("kiev", kept.pk)])
@@ -0,0 +1,61 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TransactionTestCase
+
+from tests.factories import make_address
+
+from django_address.models import Address
+from django_address.resolver import BatchResolver
+from django_address.service import AddressError
+
+
+class BatchResolverTestCase(TransactionTestCase):
+    def setUp(self):
+        self.resolver = BatchResolver(window=0.2, max_batch_size=8)
+        self.addCleanup(self.resolver.shutdown)
+
+    def test_concurrent_requests_are_batched(self):
+        futures = [self.resolver.submit(make_address(index, streets=3)) for index in range(20)]
+        addresses = [future.result(timeout=5) for future in futures]
+        self.assertEqual(
+            [address.raw for address in addresses], [make_address(index, streets=3)["raw"] for index in range(20)]
+        )
+        self.assertEqual(Address.objects.count(), 20)
+        stats = self.resolver.stats()
+        self.assertEqual(stats["resolved"], 20)
+        self.assertEqual(stats["histogram"], {4: 1, 8: 2})
+
+    def test_threads(self):
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            addresses = list(
+                executor.map(lambda index: self.resolver.resolve(make_address(index, streets=3), 5), range(6))
+            )
+        self.assertEqual(len({address.pk for address in addresses}), 6)
+        self.assertLess(self.resolver.stats()["batches"], 6)
+
+    def test_invalid_address_fails_its_own_future(self):
+        invalid = make_address(1, streets=3)
+        invalid["street"] = ""
+        futures = [
+            self.resolver.submit(value) for value in (make_address(0, streets=3), invalid, make_address(2, streets=3))
+        ]
+        self.assertEqual(futures[0].result(timeout=5).street_number, "0")
+        with self.assertRaises(AddressError):
+            futures[1].result(timeout=5)
+        self.assertEqual(futures[2].result(timeout=5).street_number, "2")
+
+    def test_aresolve(self):
+        async def resolve():
+            return await asyncio.gather(*(self.resolver.aresolve(make_address(index, streets=3)) for index in range(3)))
+
+        addresses = asyncio.run(resolve())
+        self.assertEqual(len(addresses), 3)
+        self.assertEqual(self.resolver.stats()["batches"], 1)
+
+    def test_shutdown(self):
+        future = self.resolver.submit(make_address(0, streets=3))
+        self.resolver.shutdown()
+        self.assertTrue(future.done())
+        with self.assertRaises(RuntimeError):
+            self.resolver.submit(make_address(1, streets=3))
@@ -0,0 +1,72 @@
+import json
+
+from django.test import TestCase, override_settings
+
+from django_address.models import Address, Region
+from django_address.serializers import serialize_addresses
+from django_address.service import bulk_save
+
+
+class SerializeAddressesTestCase(TestCase):
+    def setUp(self):
+        bulk_save(
+            [
+                {
+                    "raw": "Khreschatyk st, 15",
+                    "country": "Ukraine",
+                    "country_code": "UA",
+                    "region": "Kyiv City",
+                    "district": "Pecherskyi",
+                    "locality": "Kiev",
+                    "street": "Khreschatyk street",
+                    "street_number": "15",
+                    "postal_code": "02000",
+                    "latitude": 50.4474875,
+                    "longitude": 30.524732,
+                },
+                {
+                    "raw": "Ushakova st, 50",
+                    "country": "Ukraine",
+                    "country_code": "UA",
+                    "region": "Kherson region",
+                    "locality": "Kherson",
+                    "street": "Ushakova Avenue",
+                    "street_number": "50",
+                },
+            ]
+        )
+        self.queryset = Address.objects.order_by("pk")
+
+    def test_json(self):
+        expected = json.dumps([address.to_dict() for address in self.queryset])
+        with self.assertNumQueries(1):
+            value = "".join(serialize_addresses(self.queryset))
+        self.assertEqual(value, expected)
+
+    def test_ndjson(self):
+        expected = "".join(json.dumps(address.to_dict()) + "\n" for address in self.queryset)
+        self.assertEqual("".join(serialize_addresses(self.queryset, fmt="ndjson")), expected)
+
+    @override_settings(DJANGO_ADDRESS_REFRESH_ON_RENAME=False)
+    def test_stale_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            region = Region.objects.get(name="Kyiv City")
+            region.name = "Kyiv"
+            region.save()
+        value = json.loads("".join(serialize_addresses(self.queryset)))
+        self.assertEqual(value[0]["region"]["name"], "Kyiv City")
+        self.assertEqual(value, [address.to_dict() for address in self.queryset])
+
+    def test_empty_snapshot(self):
+        Address.objects.update(hierarchy={})
+        expected = json.dumps([address.to_dict() for address in self.queryset])
+        with self.assertNumQueries(1):
+            value = "".join(serialize_addresses(self.queryset))
+        self.assertEqual(value, expected)
+
+    def test_empty(self):
+        self.assertEqual("".join(serialize_addresses(Address.objects.none())), "[]")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            serialize_addresses(self.queryset, fmt="xml")
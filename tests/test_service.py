@@ -0,0 +1,273 @@
+import asyncio
+from dataclasses import dataclass, fields
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tests.factories import make_address
+
+from django_address import service
+from django_address.models import Address, Country, Locality, Region, Street
+from django_address.service import (
+    Address as AddressService,
+    AbstractAddress,
+    AddressError,
+    AsyncAddress,
+    _insert_or_get,
+    abulk_save,
+    bulk_save,
+)
+
+
+@dataclass
+class PerItemService(AbstractAddress):
+    def save(self):
+        return AddressService(**{field.name: getattr(self, field.name) for field in fields(self)}).save()
+
+
+class BulkSaveTestCase(TestCase):
+    def test_bulk_save_returns_addresses_in_input_order(self):
+        values = [make_address(index) for index in range(20)]
+        addresses = AddressService.bulk_save(values)
+        self.assertEqual([address.raw for address in addresses], [value["raw"] for value in values])
+        self.assertEqual(Country.objects.count(), 1)
+        self.assertEqual(Region.objects.count(), 1)
+        self.assertEqual(Locality.objects.count(), 1)
+        self.assertEqual(Street.objects.count(), 7)
+        self.assertEqual(Address.objects.count(), 20)
+
+    def test_bulk_save_matches_save(self):
+        existing = AddressService(**make_address(1)).save()
+        addresses = bulk_save([make_address(1), AddressService(**make_address(2)), make_address(1)])
+        self.assertEqual(addresses[0], existing)
+        self.assertEqual(addresses[2], existing)
+        self.assertEqual(addresses[1].street.locality, existing.locality)
+        self.assertEqual(addresses[1].route, "Street 2")
+        self.assertEqual(Address.objects.count(), 2)
+
+    def test_bulk_save_accepts_instances_and_pks(self):
+        existing = AddressService(**make_address(1)).save()
+        value = make_address(3)
+        value.update(locality=existing.locality, street=existing.street.pk)
+        address = bulk_save([value])[0]
+        self.assertEqual(address.street, existing.street)
+        self.assertEqual(Street.objects.count(), 1)
+
+    def test_bulk_save_query_count_does_not_depend_on_size(self):
+        bulk_save([make_address(0)])
+        with CaptureQueriesContext(connection) as small:
+            bulk_save([make_address(index, locality="Kherson") for index in range(10)])
+        with CaptureQueriesContext(connection) as large:
+            bulk_save([make_address(index, locality="Odesa") for index in range(50)])
+        self.assertEqual(len(small), len(large))
+
+    def test_bulk_save_requires_street(self):
+        value = make_address(1)
+        value["street"] = ""
+        with self.assertRaises(AddressError):
+            bulk_save([value])
+
+    def test_bulk_save_empty(self):
+        self.assertEqual(bulk_save([]), [])
+
+    @override_settings(DJANGO_ADDRESS_SERVICE_CLASS="tests.test_service.PerItemService")
+    def test_default_bulk_save_saves_one_by_one(self):
+        addresses = bulk_save([make_address(1), PerItemService(**make_address(2)), make_address(1)])
+        self.assertEqual([address.street_number for address in addresses], ["1", "2", "1"])
+        self.assertEqual(addresses[0], addresses[2])
+        self.assertEqual(Address.objects.count(), 2)
+
+
+class SaveQueriesTestCase(TestCase):
+    def test_cold_save(self):
+        # savepoint, select and insert for country, region, locality, street and address,
+        # merged address hash check, release
+        with self.assertNumQueries(13):
+            AddressService(**make_address(1)).save()
+
+    def test_warm_save(self):
+        AddressService(**make_address(1)).save()
+        # savepoint, select of country, region, locality, street and address, release
+        with self.assertNumQueries(7):
+            AddressService(**make_address(1)).save()
+
+    def test_single_savepoint(self):
+        with CaptureQueriesContext(connection) as queries:
+            AddressService(**make_address(1)).save()
+        savepoints = [query["sql"] for query in queries if query["sql"].startswith("SAVEPOINT")]
+        self.assertEqual(len(savepoints), 1)
+
+    def test_bulk_save_single_savepoint(self):
+        with CaptureQueriesContext(connection) as queries:
+            bulk_save([make_address(index) for index in range(10)])
+        savepoints = [query["sql"] for query in queries if query["sql"].startswith("SAVEPOINT")]
+        self.assertEqual(len(savepoints), 1)
+
+
+class InsertOrGetTestCase(TestCase):
+    def setUp(self):
+        self.ua = Country.objects.create(name="Ukraine", code="UA")
+        self.kyiv = Region.objects.create(name="Kyiv City", country=self.ua)
+
+    def test_creates_missing_row(self):
+        region = _insert_or_get(Region, {"name": "Kherson region", "code": "KS", "country": self.ua})
+        self.assertIsNotNone(region.pk)
+        self.assertEqual(Region.objects.get(name="Kherson region"), region)
+
+    def test_returns_concurrently_inserted_row(self):
+        region = _insert_or_get(Region, {"name": "Kyiv City", "code": "", "country": self.ua})
+        self.assertEqual(region, self.kyiv)
+        self.assertEqual(Region.objects.count(), 1)
+
+    def test_locality_with_same_natural_key(self):
+        lookup = {"name": "Kiev", "postal_code": "02000", "region": self.kyiv, "district": None}
+        locality = _insert_or_get(Locality, lookup)
+        self.assertEqual(locality.slug, Locality(**lookup).keyed_slug())
+        self.assertEqual(_insert_or_get(Locality, lookup), locality)
+        self.assertEqual(Locality.objects.count(), 1)
+
+    def test_same_named_localities_of_other_regions(self):
+        odesa = Region.objects.create(name="Odesa region", country=self.ua)
+        first = _insert_or_get(Locality, {"name": "Kiev", "postal_code": "", "region": self.kyiv, "district": None})
+        second = _insert_or_get(Locality, {"name": "Kiev", "postal_code": "", "region": odesa, "district": None})
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(first.slug, second.slug)
+        self.assertTrue(second.slug.startswith("kiev-"))
+
+    def test_concurrent_same_named_localities_of_other_regions(self):
+        odesa = Region.objects.create(name="Odesa region", country=self.ua)
+        insert = service._insert_returning_pk
+        concurrent = {}
+
+        def insert_after_other_region(obj):
+            # the other region's locality is committed between the slug choice and the insert
+            if obj.region == self.kyiv and not concurrent:
+                concurrent["odesa"] = None
+                lookup = {"name": "Kiev", "postal_code": "", "region": odesa, "district": None}
+                concurrent["odesa"] = _insert_or_get(Locality, lookup)
+            return insert(obj)
+
+        with mock.patch.object(service, "_insert_returning_pk", side_effect=insert_after_other_region):
+            locality = _insert_or_get(
+                Locality, {"name": "Kiev", "postal_code": "", "region": self.kyiv, "district": None}
+            )
+        self.assertEqual(locality.region, self.kyiv)
+        self.assertNotEqual(locality.slug, concurrent["odesa"].slug)
+        self.assertEqual(Locality.objects.filter(name="Kiev").count(), 2)
+
+    def test_conflict_on_other_unique_field(self):
+        # country name is unique, the lookup matches by name and code
+        with self.assertRaisesRegex(AddressError, "conflicts with an existing row"):
+            _insert_or_get(Country, {"name": "Ukraine", "code": "UK"})
+
+    def test_bulk_save_same_named_localities(self):
+        addresses = bulk_save([make_address(1), make_address(2, region="Odesa region")])
+        self.assertNotEqual(addresses[0].locality, addresses[1].locality)
+        self.assertEqual(len({address.locality.slug for address in addresses}), 2)
+
+    def test_bulk_save_conflict_on_other_unique_field(self):
+        value = make_address(1)
+        value["country_code"] = "UK"
+        with self.assertRaisesRegex(AddressError, "conflicts with an existing row"):
+            bulk_save([value])
+
+
+class AddressHashTestCase(TestCase):
+    def test_save_looks_up_by_hash(self):
+        address = AddressService(**make_address(1)).save()
+        self.assertEqual(len(address.address_hash), 64)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(AddressService(**make_address(1)).save(), address)
+        self.assertIn('"address_hash" =', queries[-2]["sql"])
+
+    def test_save_without_formatted_address(self):
+        value = make_address(1)
+        value["formatted_address"] = ""
+        address = AddressService(**value).save()
+        self.assertEqual(address.formatted_address, "Street 1, 1, Kiev")
+        self.assertEqual(AddressService(**value).save(), address)
+        self.assertEqual(bulk_save([value]), [address])
+        self.assertEqual(Address.objects.count(), 1)
+
+    def test_hash_depends_on_every_field(self):
+        first = AddressService(**make_address(1)).save()
+        value = make_address(1)
+        value["latitude"] = 50.4474876
+        self.assertNotEqual(AddressService(**value).save(), first)
+
+    def test_edited_address_is_not_found_by_old_hash(self):
+        address = AddressService(**make_address(15)).save()
+        address.street_number = "17"
+        address.save()
+        self.assertEqual(address.address_hash, Address.objects.get(pk=address.pk).build_address_hash())
+        self.assertNotEqual(AddressService(**make_address(15)).save(), address)
+        loaded = Address.objects.get(pk=address.pk)
+        loaded.street_number = "15"
+        loaded.save()
+        # the values are the ones of the address saved above, the hash stays with it
+        self.assertIsNone(loaded.address_hash)
+
+    def test_save_without_changes_keeps_hash(self):
+        value = make_address(1)
+        value["formatted_address"] = ""
+        address = AddressService(**value).save()
+        Address.objects.get(pk=address.pk).save()
+        address.save()
+        self.assertEqual(AddressService(**value).save(), address)
+
+    def test_create_duplicate_directly(self):
+        address = AddressService(**make_address(1)).save()
+        values = {name: getattr(address, name) for name in Address.HASH_FIELDS}
+        duplicate = Address.objects.create(**values)
+        # the hash stays with the first address, dedupe_addresses merges the duplicate
+        self.assertIsNone(duplicate.address_hash)
+        self.assertEqual(AddressService(**make_address(1)).save(), address)
+
+    def test_backfill_command(self):
+        first, second = bulk_save([make_address(1), make_address(2)])
+        Address.objects.update(address_hash=None)
+        # bulk_create() doesn't fill the hash as save() does
+        values = {name: getattr(first, name) for name in Address.HASH_FIELDS}
+        duplicate = Address.objects.bulk_create([Address(**values)])[0]
+        out = StringIO()
+        call_command("backfill_address_hash", batch_size=1, stdout=out)
+        self.assertIn("Updated 2 addresses.", out.getvalue())
+        self.assertIn("Skipped 1 exact duplicates", out.getvalue())
+        self.assertEqual(Address.objects.get(pk=second.pk).address_hash, second.address_hash)
+        self.assertIsNone(Address.objects.get(pk=duplicate.pk).address_hash)
+
+
+class AsyncAddressTestCase(TestCase):
+    async def test_asave(self):
+        address = await AsyncAddress(**make_address(1)).asave()
+        self.assertEqual(address, await Address.objects.aget(raw=make_address(1)["raw"]))
+        self.assertEqual(await AsyncAddress(**make_address(1)).asave(), address)
+
+    async def test_concurrent_asave_is_coalesced(self):
+        value = make_address(1)
+        spelled = dict(value, locality="  KIEV ")
+        with mock.patch.object(AsyncAddress, "save", autospec=True, side_effect=AddressService.save) as save:
+            addresses = await asyncio.gather(
+                *(AsyncAddress(**item).asave() for item in (value, spelled, value, make_address(2)))
+            )
+        self.assertEqual(save.call_count, 2)
+        self.assertEqual(addresses[0], addresses[1])
+        self.assertEqual(addresses[0], addresses[2])
+        self.assertNotEqual(addresses[0], addresses[3])
+        self.assertEqual(await Address.objects.acount(), 2)
+
+    async def test_asave_error(self):
+        value = make_address(1)
+        value["street"] = ""
+        with self.assertRaises(AddressError):
+            await asyncio.gather(AsyncAddress(**value).asave(), AsyncAddress(**value).asave())
+
+    async def test_abulk_save(self):
+        values = [make_address(index) for index in range(5)]
+        addresses = await AsyncAddress.abulk_save(values)
+        self.assertEqual([address.raw for address in addresses], [value["raw"] for value in values])
+        self.assertEqual(await abulk_save(values), addresses)
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from django.urls import include, path
+
+import django_address.admin  # noqa: F401  # example.order admin can't be autodiscovered outside the example project
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("address/", include("django_address.urls")),
+]